@@ -0,0 +1,185 @@
+from jsonfuzzer.core.fuzzer import Fuzzer, FuzzCase, payload_fingerprint
+from jsonfuzzer.parser.path_finder import PathFinder
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+import hashlib
+import json
+import logging
+import os
+
+# Templates of one shape handed to a worker at a time, so a shape shared by thousands
+# of captured requests is still spread over the whole pool
+TEMPLATES_PER_TASK = 64
+
+logger = logging.getLogger(__name__)
+
+_Template = Tuple[str, Union[Dict[str, Any], List[Any]]]
+
+
+class TemplateCase(NamedTuple):
+    source: str
+    case: FuzzCase
+
+
+class BatchCampaign:
+    """
+    Fuzzes many templates at once, e.g. JSON bodies captured from proxy logs
+
+    Templates are grouped by structural shape, the keys and list lengths with every
+    primitive ignored, and each shape is mapped by PathFinder only once since all of
+    its templates share the same parameter paths. Groups are then split into tasks of
+    TEMPLATES_PER_TASK templates that run across a process pool. Every case is tagged
+    with the source of its template, the file name or file:line for NDJSON.
+
+    With workers set to 0 everything runs in the current process.
+    """
+
+    def __init__(
+        self,
+        modes: Optional[List[str]] = None,
+        value_to_inject: Any = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        self.modes = modes
+        self.value_to_inject = value_to_inject
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.PATH_FINDER = PathFinder()
+        self.shapes: Dict[str, List[List[Union[str, int]]]] = {}
+
+    def run(self, templates: Iterable[_Template]) -> Iterator[TemplateCase]:
+        """
+        Generates the cases of every template
+
+        Cases of one template come out in order, but templates finish in whatever
+        order the workers get to them.
+
+        :param templates: (source, structure) pairs, e.g. from load_templates
+        :type templates: Iterable[Tuple[str, Union[Dict[str, Any], List[Any]]]]
+        :return: Iterator over the cases tagged with their source
+        :rtype: Iterator[TemplateCase]
+        """
+        tasks = []
+        for shape, group in self._group(templates).items():
+            for start in range(0, len(group), TEMPLATES_PER_TASK):
+                tasks.append(
+                    (
+                        self.shapes[shape],
+                        group[start : start + TEMPLATES_PER_TASK],
+                        self.modes,
+                        self.value_to_inject,
+                    )
+                )
+
+        if self.workers == 0:
+            for task in tasks:
+                yield from _fuzz_templates(*task)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(_fuzz_templates, *task) for task in tasks]
+            for future in as_completed(futures):
+                yield from future.result()
+
+    def _group(self, templates: Iterable[_Template]) -> Dict[str, List[_Template]]:
+        groups: Dict[str, List[_Template]] = {}
+
+        for source, structure in templates:
+            shape = shape_key(structure)
+            if shape not in self.shapes:
+                self.shapes[shape] = self.PATH_FINDER.map_structure(structure=structure)
+            groups.setdefault(shape, []).append((source, structure))
+
+        return groups
+
+
+def shape_key(structure: Union[Dict[str, Any], List[Any]]) -> str:
+    return hashlib.blake2b(
+        payload_fingerprint(_shape(structure)).encode(), digest_size=16
+    ).hexdigest()
+
+
+def load_templates(location: str) -> Iterator[_Template]:
+    """
+    Lazily reads templates from a directory of JSON files or from an NDJSON file
+
+    Files or lines that aren't a JSON object or array are logged and skipped.
+
+    :param location: Directory with one template per .json file, or an NDJSON file
+    :type location: str
+    :return: Iterator over (source, structure) pairs
+    :rtype: Iterator[Tuple[str, Union[Dict[str, Any], List[Any]]]]
+    """
+    if os.path.isdir(location):
+        for name in sorted(os.listdir(location)):
+            if not name.endswith(".json"):
+                continue
+
+            with open(os.path.join(location, name), "rb") as template_file:
+                structure = _parse(name, template_file.read())
+            if structure is not None:
+                yield name, structure
+        return
+
+    with open(location, "rb") as ndjson_file:
+        for line_number, line in enumerate(ndjson_file, start=1):
+            if not line.strip():
+                continue
+
+            source = f"{os.path.basename(location)}:{line_number}"
+            structure = _parse(source, line)
+            if structure is not None:
+                yield source, structure
+
+
+def _parse(source: str, data: bytes) -> Optional[Union[Dict[str, Any], List[Any]]]:
+    try:
+        structure = json.loads(data)
+    except ValueError as error:
+        logger.warning("Skipping %s, invalid JSON: %s", source, error)
+        return None
+
+    if not isinstance(structure, (dict, list)):
+        logger.warning("Skipping %s, not a JSON object or array", source)
+        return None
+
+    return structure
+
+
+def _shape(structure: Any) -> Any:
+    if isinstance(structure, dict):
+        return {key: _shape(value) for key, value in structure.items()}
+    if isinstance(structure, list):
+        return [_shape(value) for value in structure]
+
+    return None
+
+
+def _fuzz_templates(
+    paramater_paths: List[List[Union[str, int]]],
+    templates: List[_Template],
+    modes: Optional[List[str]],
+    value_to_inject: Any,
+) -> List[TemplateCase]:
+    fuzzer = Fuzzer()
+
+    return [
+        TemplateCase(source=source, case=case)
+        for source, structure in templates
+        for case in fuzzer.generate_cases(
+            structure=structure,
+            paramater_paths=paramater_paths,
+            modes=modes,
+            value_to_inject=value_to_inject,
+        )
+    ]
@@ -0,0 +1,242 @@
+from jsonfuzzer.harness.ring import attach_shared_memory
+
+from multiprocessing import shared_memory
+from typing import Any, Iterator, List, NamedTuple, Optional, Tuple
+import contextlib
+import hashlib
+import math
+import multiprocessing
+import os
+import struct
+
+ERROR_RATE = 0.001
+INITIAL_CAPACITY = 100_000
+MAX_BYTES = 64 * 1024 * 1024
+
+# Each slice holds GROWTH times the items of the one before it, with TIGHTENING times
+# its false positive rate so the rates of all slices add up to at most error_rate
+GROWTH = 2
+TIGHTENING = 0.5
+
+# Index of the slice being filled, items added to it
+_HEADER = struct.Struct("<QQ")
+_HASHES = struct.Struct("<QQ")
+
+
+class _Slice(NamedTuple):
+    offset: int
+    bits: int
+    hashes: int
+    capacity: int
+
+
+class ScalableBloomFilter:
+    """
+    Probabilistic set of payload fingerprints with a fixed memory cap
+
+    A scalable Bloom filter: when a slice has taken its capacity a larger one with a
+    tighter false positive rate takes over, so the overall rate stays below error_rate
+    however many fingerprints are added. Every slice that fits in max_bytes is laid
+    out up front but only allocated once it is needed, so memory grows with the number
+    of fingerprints and never past max_bytes. Once the last slice is full the filter is
+    saturated and keeps adding to it, with a false positive rate that slowly rises.
+    A false positive drops a payload that was never sent, nothing is sent twice.
+
+    With shared set the bits live in shared memory behind a lock, so the filter can be
+    passed to worker processes as an argument to dedup across all of them. The shared
+    memory is sized for every slice up front, but the pages of a slice are only backed
+    by memory once it is written to. The creating process unlinks it on close.
+    """
+
+    def __init__(
+        self,
+        error_rate: float = ERROR_RATE,
+        initial_capacity: int = INITIAL_CAPACITY,
+        max_bytes: int = MAX_BYTES,
+        shared: bool = False,
+        context: Optional[Any] = None,
+    ) -> None:
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.error_rate = error_rate
+        self.slices = _layout(error_rate, initial_capacity, max_bytes)
+        self.size = self.slices[-1].offset + self.slices[-1].bits // 8
+        self.shared = shared
+
+        if shared:
+            context = context or multiprocessing.get_context()
+            self._memory = shared_memory.SharedMemory(create=True, size=self.size)
+            self._lock = context.Lock()
+            self._views()
+        else:
+            self._memory = None
+            self._lock = contextlib.nullcontext()
+            self._header = bytearray(_HEADER.size)
+            self._bits: List[Any] = []
+        # Forked children inherit the attribute, so compare pids rather than a flag
+        self._owner_pid = os.getpid()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        if self.shared:
+            state["_memory"] = self._memory.name
+            state["_header"] = None
+            state["_bits"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if self.shared:
+            self._memory = attach_shared_memory(state["_memory"])
+            self._views()
+
+    def __enter__(self) -> "ScalableBloomFilter":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __contains__(self, fingerprint: str) -> bool:
+        hashes = _hashes(fingerprint)
+        with self._lock:
+            active, _ = _HEADER.unpack_from(self._header, 0)
+            return self._contains(hashes, active)
+
+    def __len__(self) -> int:
+        """
+        Approximate number of fingerprints added, false positives are never counted
+        """
+        with self._lock:
+            active, count = _HEADER.unpack_from(self._header, 0)
+        return sum(bloom_slice.capacity for bloom_slice in self.slices[:active]) + count
+
+    @property
+    def saturated(self) -> bool:
+        active, count = _HEADER.unpack_from(self._header, 0)
+        return active == len(self.slices) - 1 and count >= self.slices[-1].capacity
+
+    @property
+    def allocated(self) -> int:
+        """
+        Bytes of bits allocated so far, the slices up to the one being filled
+        """
+        active, _ = _HEADER.unpack_from(self._header, 0)
+        return sum(bloom_slice.bits // 8 for bloom_slice in self.slices[: active + 1])
+
+    def add(self, fingerprint: str) -> bool:
+        """
+        Adds a fingerprint unless it was probably added before
+
+        :param fingerprint: Fingerprint of a payload, e.g. from payload_fingerprint
+        :type fingerprint: str
+        :return: True if the fingerprint is new, False if it was probably seen already
+        :rtype: bool
+        """
+        hashes = _hashes(fingerprint)
+
+        with self._lock:
+            active, count = _HEADER.unpack_from(self._header, 0)
+            if self._contains(hashes, active):
+                return False
+
+            if count >= self.slices[active].capacity and active + 1 < len(self.slices):
+                active, count = active + 1, 0
+
+            bits = self._slice_bits(active)
+            for bit in _bits(hashes, self.slices[active]):
+                bits[bit >> 3] |= 1 << (bit & 7)
+            _HEADER.pack_into(self._header, 0, active, count + 1)
+
+        return True
+
+    def close(self) -> None:
+        """
+        Detaches from the shared memory, the creating process also unlinks it
+        """
+        if self._memory is None:
+            return
+
+        # Views into the shared memory have to go before it can be closed
+        for view in [self._header] + self._bits:
+            view.release()
+        self._header = None
+        self._bits = []
+
+        self._memory.close()
+        if os.getpid() == self._owner_pid:
+            self._memory.unlink()
+        self._memory = None
+
+    def _views(self) -> None:
+        self._header = self._memory.buf[: _HEADER.size]
+        self._bits = []
+
+    def _slice_bits(self, index: int) -> Any:
+        # Slices are allocated, or mapped from the shared memory, on first use
+        while len(self._bits) <= index:
+            bloom_slice = self.slices[len(self._bits)]
+            if self._memory is None:
+                self._bits.append(bytearray(bloom_slice.bits // 8))
+            else:
+                self._bits.append(
+                    self._memory.buf[
+                        bloom_slice.offset : bloom_slice.offset + bloom_slice.bits // 8
+                    ]
+                )
+
+        return self._bits[index]
+
+    def _contains(self, hashes: Tuple[int, int], active: int) -> bool:
+        for index, bloom_slice in enumerate(self.slices[: active + 1]):
+            bits = self._slice_bits(index)
+            if all(
+                bits[bit >> 3] & (1 << (bit & 7)) for bit in _bits(hashes, bloom_slice)
+            ):
+                return True
+
+        return False
+
+
+def _layout(error_rate: float, initial_capacity: int, max_bytes: int) -> List[_Slice]:
+    slices = []
+    offset = _HEADER.size
+
+    while True:
+        index = len(slices)
+        capacity = initial_capacity * GROWTH**index
+        probability = error_rate * (1 - TIGHTENING) * TIGHTENING**index
+
+        bits = math.ceil(capacity * -math.log(probability) / math.log(2) ** 2)
+        size = (bits + 7) // 8
+        if offset + size > max_bytes:
+            break
+
+        hashes = max(1, math.ceil(-math.log2(probability)))
+        slices.append(
+            _Slice(offset=offset, bits=size * 8, hashes=hashes, capacity=capacity)
+        )
+        offset += size
+
+    if not slices:
+        raise ValueError(
+            f"max_bytes of {max_bytes} can't hold {initial_capacity} fingerprints "
+            f"at an error_rate of {error_rate}"
+        )
+
+    return slices
+
+
+def _hashes(fingerprint: str) -> Tuple[int, int]:
+    digest = hashlib.blake2b(fingerprint.encode(), digest_size=_HASHES.size).digest()
+    first, second = _HASHES.unpack(digest)
+    return first, second | 1  # A zero step would set the same bit k times
+
+
+def _bits(hashes: Tuple[int, int], bloom_slice: _Slice) -> Iterator[int]:
+    # Double hashing, k indexes from two hashes
+    first, second = hashes
+    return (
+        (first + index * second) % bloom_slice.bits
+        for index in range(bloom_slice.hashes)
+    )
@@ -1,13 +1,76 @@
+from jsonfuzzer.core.mutator import Mutator
+from jsonfuzzer.parser.embedded import EMBEDDED_JSON
 from jsonfuzzer.parser.injector import Injector
+from jsonfuzzer.parser.marker_finder import MarkerFinder
 from jsonfuzzer.parser.path_finder import PathFinder
 
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+import json
+
+MODE_PARAMETER = "parameter"
+MODE_STRUCTURE = "structure"
+MODE_MISSING_ATTRIBUTE = "missing_attribute"
+MODE_MUTATION = "mutation"
+MODE_TYPE_CONFUSION = "type_confusion"
+MODE_KEY_NAME = "key_name"
+MODE_UNEXPECTED_ATTRIBUTE = "unexpected_attribute"
+MODE_MARKER = "marker"
+
+MODES = (
+    MODE_PARAMETER,
+    MODE_STRUCTURE,
+    MODE_MISSING_ATTRIBUTE,
+    MODE_MUTATION,
+    MODE_TYPE_CONFUSION,
+    MODE_KEY_NAME,
+    MODE_UNEXPECTED_ATTRIBUTE,
+    MODE_MARKER,
+)
+
+# Modes that inject an externally supplied value_to_inject
+VALUE_MODES = (MODE_PARAMETER, MODE_STRUCTURE, MODE_MARKER)
+
+# Factories for a representative value of each JSON type, called per payload so
+# injected arrays / objects are never shared between payloads
+TYPE_CONFUSION_FACTORIES = (str, int, float, bool, type(None), list, dict)
+
+UNEXPECTED_ATTRIBUTES = {
+    "__proto__": {"polluted": True},
+    "constructor": {"prototype": {"polluted": True}},
+    "isAdmin": True,
+    "role": "admin",
+    "debug": True,
+}
+
+
+class FuzzCase(NamedTuple):
+    """
+    A single generated payload tagged with where it came from
+
+    variant is the position of the payload in generate_payloads_for_path for the
+    same mode and path, which is enough to regenerate it from the template. Cases
+    injecting a value taken from a named corpus also record the corpus and the
+    position of the value in it.
+    """
+
+    mode: str
+    path: List[Union[str, int]]
+    variant: int
+    payload: Any
+    corpus: Optional[str] = None
+    corpus_index: Optional[int] = None
 
 
 class Fuzzer:
     def __init__(self) -> None:
         self.INJECTOR = Injector()
         self.PATH_FINDER = PathFinder()
+        self.MUTATOR = Mutator()
+        self.MARKER_FINDER = MarkerFinder()
+        # Last marked template seen by the marker mode, its stripped copy and markers
+        self._marked: Optional[
+            Tuple[Any, Any, Dict[Tuple[Union[str, int], ...], Any]]
+        ] = None
 
     def generate_structure_parameter_permutations_for_payload(
         self,
@@ -34,8 +97,10 @@ class Fuzzer:
         structure: Union[Dict[str, Any], List[Any]],
         paramater_paths: List[List[Union[str, int]]],
         value_to_inject: Any,
+        dedup: Optional[Any] = None,
     ) -> List[Union[Dict[str, Any], List[Any]]]:
         structure_fuzz_list = []
+        seen = set()
 
         for param_path in paramater_paths:
             structural_payloads = self.INJECTOR.generate_structure_payloads_by_path(
@@ -45,7 +110,7 @@ class Fuzzer:
             structure_fuzz_list.extend(
                 structure_payload
                 for structure_payload in structural_payloads
-                if structure_payload not in structure_fuzz_list
+                if _is_new(structure_payload, seen, dedup)
             )
 
         return structure_fuzz_list
@@ -54,8 +119,10 @@ class Fuzzer:
         self,
         structure: Union[Dict[str, Any], List[Any]],
         paramater_paths: List[List[Union[str, int]]],
+        dedup: Optional[Any] = None,
     ) -> List[Union[Dict[str, Any], List[Any]]]:
         structure_fuzz_list = []
+        seen = set()
 
         for param_path in paramater_paths:
             missing_attribute_payloads = self.INJECTOR.generate_missing_attribute_permutations_for_structure_by_path(
@@ -64,7 +131,452 @@ class Fuzzer:
             structure_fuzz_list.extend(
                 structure_payload
                 for structure_payload in missing_attribute_payloads
-                if structure_payload not in structure_fuzz_list
+                if _is_new(structure_payload, seen, dedup)
+            )
+
+        return structure_fuzz_list
+
+    def generate_structure_mutation_permutations(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        paramater_paths: List[List[Union[str, int]]],
+    ) -> List[Union[Dict[str, Any], List[Any]]]:
+        structure_fuzz_list = []
+
+        for batch in self.MUTATOR.generate_mutation_batches(
+            structure=structure, paramater_paths=paramater_paths
+        ):
+            structure_fuzz_list.extend(
+                self.INJECTOR.modify_attribute_in_structure_by_path(
+                    structure=structure, path=param_path, value_to_inject=mutation
+                )
+                for param_path, mutation in batch
+            )
+
+        return structure_fuzz_list
+
+    def generate_structure_type_confusion_permutations(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        paramater_paths: List[List[Union[str, int]]],
+    ) -> List[Union[Dict[str, Any], List[Any]]]:
+        structure_fuzz_list = []
+
+        for param_path in paramater_paths:
+            structure_fuzz_list.extend(
+                self._type_confusion_payloads_for_path(
+                    structure=structure, path=param_path
+                )
+            )
+
+        return structure_fuzz_list
+
+    def generate_key_name_permutations(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        paramater_paths: List[List[Union[str, int]]],
+    ) -> List[Union[Dict[str, Any], List[Any]]]:
+        structure_fuzz_list = []
+        visited = set()
+
+        for param_path in paramater_paths:
+            structure_fuzz_list.extend(
+                self._key_name_payloads_for_path(
+                    structure=structure, path=param_path, visited=visited
+                )
+            )
+
+        return structure_fuzz_list
+
+    def generate_unexpected_attribute_permutations(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        paramater_paths: List[List[Union[str, int]]],
+        attributes: Dict[str, Any] = None,
+    ) -> List[Union[Dict[str, Any], List[Any]]]:
+        structure_fuzz_list = []
+        visited = set()
+
+        for param_path in paramater_paths:
+            structure_fuzz_list.extend(
+                self._unexpected_attribute_payloads_for_path(
+                    structure=structure,
+                    path=param_path,
+                    attributes=attributes,
+                    visited=visited,
+                )
+            )
+
+        return structure_fuzz_list
+
+    def generate_payloads_for_path(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        mode: str,
+        path: List[Union[str, int]],
+        value_to_inject: Any = None,
+    ) -> List[Union[Dict[str, Any], List[Any]]]:
+        """
+        Generates every payload a single mode produces for a single parameter path
+
+        The output is deterministic and not deduplicated against other paths, so the
+        position of a payload in the list identifies it for a given template.
+
+        :param structure: The complex dict / list based structure to fuzz
+        :type structure: Union[Dict[str, Any], List[Any]]
+        :param mode: One of MODES
+        :type mode: str
+        :param path: List of keys to get to a primitive in the structure
+        :type path: List[Union[str, int]]
+        :param value_to_inject: Value for the modes in VALUE_MODES, defaults to None
+        :type value_to_inject: Any, optional
+        :return: List of payloads for the path
+        :rtype: List[Union[Dict[str, Any], List[Any]]]
+        """
+        if mode == MODE_PARAMETER:
+            return [
+                self.INJECTOR.modify_attribute_in_structure_by_path(
+                    structure=structure, path=path, value_to_inject=value_to_inject
+                )
+            ]
+        if mode == MODE_STRUCTURE:
+            return self.INJECTOR.generate_structure_payloads_by_path(
+                structure=structure, path=path, value_to_inject=value_to_inject
+            )
+        if mode == MODE_MISSING_ATTRIBUTE:
+            return self.INJECTOR.generate_missing_attribute_permutations_for_structure_by_path(
+                structure=structure, path=path
+            )
+        if mode == MODE_MUTATION:
+            return self.INJECTOR.generate_value_payloads_by_path(
+                structure=structure,
+                path=path,
+                values_to_inject=self.MUTATOR.mutate_value(
+                    self.INJECTOR.get_attribute_in_structure_by_path(
+                        structure=structure, path=path
+                    )
+                ),
+            )
+        if mode == MODE_TYPE_CONFUSION:
+            return self._type_confusion_payloads_for_path(
+                structure=structure, path=path
+            )
+        if mode == MODE_KEY_NAME:
+            return self._key_name_payloads_for_path(structure=structure, path=path)
+        if mode == MODE_UNEXPECTED_ATTRIBUTE:
+            return self._unexpected_attribute_payloads_for_path(
+                structure=structure, path=path
+            )
+
+        if mode == MODE_MARKER:
+            return self._marker_payloads_for_path(
+                structure=structure, path=path, value_to_inject=value_to_inject
+            )
+
+        raise ValueError(f"Unknown fuzzing mode: {mode}")
+
+    def count_payloads_for_path(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        mode: str,
+        path: List[Union[str, int]],
+    ) -> int:
+        """
+        Counts the payloads generate_payloads_for_path returns without building them
+
+        Modes in VALUE_MODES generate the same number of payloads for any value.
+
+        :param structure: The complex dict / list based structure to fuzz
+        :type structure: Union[Dict[str, Any], List[Any]]
+        :param mode: One of MODES
+        :type mode: str
+        :param path: List of keys to get to a primitive in the structure
+        :type path: List[Union[str, int]]
+        :return: Number of payloads for the path
+        :rtype: int
+        """
+        if mode == MODE_PARAMETER:
+            return 1
+        if mode == MODE_STRUCTURE:
+            return max(len(path) - 1, 0)
+        if mode == MODE_MISSING_ATTRIBUTE:
+            return sum(1 for key in path if key != EMBEDDED_JSON)
+        if mode == MODE_MUTATION:
+            return len(
+                self.MUTATOR.mutate_value(
+                    self.INJECTOR.get_attribute_in_structure_by_path(
+                        structure=structure, path=path
+                    )
+                )
+            )
+        if mode == MODE_TYPE_CONFUSION:
+            original = self.INJECTOR.get_attribute_in_structure_by_path(
+                structure=structure, path=path
+            )
+            return sum(
+                1
+                for factory in TYPE_CONFUSION_FACTORIES
+                if type(original) is not factory
+            )
+        if mode == MODE_KEY_NAME:
+            return sum(
+                len(
+                    self._key_name_variants(
+                        structure=structure, key_path=path[: index + 1]
+                    )
+                )
+                for index, key in enumerate(path)
+                if isinstance(key, str) and key != EMBEDDED_JSON
+            )
+        if mode == MODE_UNEXPECTED_ATTRIBUTE:
+            return len(UNEXPECTED_ATTRIBUTES) * sum(
+                1 for key in path if isinstance(key, str) and key != EMBEDDED_JSON
+            )
+
+        if mode == MODE_MARKER:
+            return int(
+                self._marker_for_path(structure=structure, path=path) is not None
+            )
+
+        raise ValueError(f"Unknown fuzzing mode: {mode}")
+
+    def generate_cases(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        paramater_paths: List[List[Union[str, int]]],
+        modes: List[str] = None,
+        value_to_inject: Any = None,
+        dedup: Optional[Any] = None,
+    ) -> Iterator[FuzzCase]:
+        """
+        Lazily generates cases for several modes, tagged with the mode and path
+
+        Payloads already emitted by any of the requested modes are skipped. By default
+        every fingerprint is kept in a set for the length of the run, for runs of
+        millions of cases pass a ScalableBloomFilter as dedup instead, which has a
+        fixed memory cap and can be shared by runs in other processes.
+
+        :param structure: The complex dict / list based structure to fuzz
+        :type structure: Union[Dict[str, Any], List[Any]]
+        :param paramater_paths: List of paths to each primitive in the structure
+        :type paramater_paths: List[List[Union[str, int]]]
+        :param modes: Modes to run in order, defaults to every mode that can run given
+            value_to_inject
+        :type modes: List[str], optional
+        :param value_to_inject: Value for the modes in VALUE_MODES, defaults to None
+        :type value_to_inject: Any, optional
+        :param dedup: Filter whose add returns False for fingerprints already seen,
+            defaults to None for an exact set local to this run
+        :type dedup: Optional[Any], optional
+        :return: Iterator over the generated cases
+        :rtype: Iterator[FuzzCase]
+        """
+        if modes is None:
+            modes = [
+                mode
+                for mode in MODES
+                if value_to_inject is not None or mode not in VALUE_MODES
+            ]
+
+        for mode in modes:
+            if mode in VALUE_MODES and value_to_inject is None:
+                raise ValueError(f"Mode {mode} requires a value_to_inject")
+
+        seen = set()
+
+        for mode in modes:
+            for param_path in paramater_paths:
+                payloads = self.generate_payloads_for_path(
+                    structure=structure,
+                    mode=mode,
+                    path=param_path,
+                    value_to_inject=value_to_inject,
+                )
+
+                for variant, payload in enumerate(payloads):
+                    if not _is_new(payload, seen, dedup):
+                        continue
+
+                    yield FuzzCase(
+                        mode=mode, path=param_path, variant=variant, payload=payload
+                    )
+
+    def _type_confusion_payloads_for_path(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        path: List[Union[str, int]],
+    ) -> List[Union[Dict[str, Any], List[Any]]]:
+        original = self.INJECTOR.get_attribute_in_structure_by_path(
+            structure=structure, path=path
+        )
+
+        return self.INJECTOR.generate_value_payloads_by_path(
+            structure=structure,
+            path=path,
+            values_to_inject=[
+                factory()
+                for factory in TYPE_CONFUSION_FACTORIES
+                if type(original) is not factory  # Skip the original type
+            ],
+        )
+
+    def _marker_payloads_for_path(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        path: List[Union[str, int]],
+        value_to_inject: Any,
+    ) -> List[Union[Dict[str, Any], List[Any]]]:
+        marked = self._marker_for_path(structure=structure, path=path)
+        if marked is None:
+            return []
+
+        stripped, marker = marked
+        return self.INJECTOR.generate_value_payloads_by_path(
+            structure=stripped,
+            path=path,
+            values_to_inject=[marker.render(value_to_inject)],
+        )
+
+    def _marker_for_path(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        path: List[Union[str, int]],
+    ) -> Optional[Tuple[Union[Dict[str, Any], List[Any]], Any]]:
+        # Paths that aren't marked are skipped before the template is looked at
+        if not self.MARKER_FINDER.is_marked(
+            self.INJECTOR.get_attribute_in_structure_by_path(
+                structure=structure, path=path
+            )
+        ):
+            return None
+
+        # Consecutive calls are for the same template, only find its markers once.
+        # Templates sharing this Fuzzer may run concurrently, so the cache is read once
+        # and only the local copy is used after that.
+        marked = self._marked
+        if marked is None or marked[0] is not structure:
+            stripped, markers = self.MARKER_FINDER.find_markers(structure=structure)
+            marked = (
+                structure,
+                stripped,
+                {tuple(marker.path): marker for marker in markers},
+            )
+            self._marked = marked
+
+        _, stripped, markers = marked
+        # A string holding a marked embedded document is not itself a marker
+        marker = markers.get(tuple(path))
+        if marker is None:
+            return None
+
+        return stripped, marker
+
+    def _key_name_payloads_for_path(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        path: List[Union[str, int]],
+        visited: Set[Tuple[Union[str, int], ...]] = None,
+    ) -> List[Union[Dict[str, Any], List[Any]]]:
+        structure_fuzz_list = []
+
+        for index, key in enumerate(path):
+            key_path = path[: index + 1]
+
+            # Only dictionary keys can be renamed, and siblings share their parents
+            if not isinstance(key, str) or key == EMBEDDED_JSON:
+                continue
+            if visited is not None:
+                if tuple(key_path) in visited:
+                    continue
+                visited.add(tuple(key_path))
+
+            structure_fuzz_list.extend(
+                self.INJECTOR.rename_key_in_structure_by_path(
+                    structure=structure,
+                    path=key_path,
+                    new_key=new_key,
+                    keep_original=keep_original,
+                )
+                for new_key, keep_original in self._key_name_variants(
+                    structure=structure, key_path=key_path
+                )
+            )
+
+        return structure_fuzz_list
+
+    def _key_name_variants(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        key_path: List[Union[str, int]],
+    ) -> List[Tuple[str, bool]]:
+        key = key_path[-1]
+        siblings = self.INJECTOR.get_attribute_in_structure_by_path(
+            structure=structure, path=key_path[:-1]
+        )
+
+        variants = []
+        for new_key in self.MUTATOR.mutate_key(key):
+            # Renaming onto an existing sibling would drop it rather than fuzz the key
+            if new_key in siblings:
+                continue
+
+            variants.append((new_key, False))
+
+            # A dict can't hold a duplicate key, so send variants that normalise
+            # back to the original key alongside it instead
+            if new_key.strip().lower() == key.lower():
+                variants.append((new_key, True))
+
+        return variants
+
+    def _unexpected_attribute_payloads_for_path(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        path: List[Union[str, int]],
+        attributes: Dict[str, Any] = None,
+        visited: Set[Tuple[Union[str, int], ...]] = None,
+    ) -> List[Union[Dict[str, Any], List[Any]]]:
+        if attributes is None:
+            attributes = UNEXPECTED_ATTRIBUTES
+
+        structure_fuzz_list = []
+
+        for index in range(len(path)):
+            container_path = path[:index]
+
+            # Only objects get extra attributes, the path type says if it is a dict
+            if not isinstance(path[index], str) or path[index] == EMBEDDED_JSON:
+                continue
+            if visited is not None:
+                if tuple(container_path) in visited:
+                    continue
+                visited.add(tuple(container_path))
+
+            structure_fuzz_list.extend(
+                self.INJECTOR.add_attribute_in_structure_by_path(
+                    structure=structure,
+                    path=container_path,
+                    key=key,
+                    value_to_inject=value,
+                )
+                for key, value in attributes.items()
             )
 
         return structure_fuzz_list
+
+
+def payload_fingerprint(payload: Any) -> str:
+    # Canonical form of a payload, key order is ignored just like dict equality
+    return json.dumps(payload, sort_keys=True, default=repr)
+
+
+def _is_new(payload: Any, seen: Set[str], dedup: Optional[Any]) -> bool:
+    # Fingerprints go to dedup when given, else to an exact set local to the caller
+    fingerprint = payload_fingerprint(payload)
+    if dedup is not None:
+        return dedup.add(fingerprint)
+    if fingerprint in seen:
+        return False
+
+    seen.add(fingerprint)
+    return True
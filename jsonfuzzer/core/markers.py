@@ -0,0 +1,84 @@
+from jsonfuzzer.core.fuzzer import FuzzCase, MODE_MARKER
+from jsonfuzzer.parser.injector import Injector
+from jsonfuzzer.parser.marker_finder import Marker, MarkerFinder
+
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+# Values rendered and injected per call, so a large Corpus is never loaded at once
+VALUES_PER_BATCH = 256
+
+
+class MarkedTemplate:
+    """
+    A template with its insertion points marked Burp style, e.g. {"user": "§admin§"}
+
+    Markers are found while mapping the template and kept in an index by name, and the
+    payloads are built from the template with them stripped, so {"user": "§admin§"} is
+    sent as {"user": "admin"}. generate_cases only injects at the marked paths and
+    only copies the containers along each path, the rest of the template is shared
+    between cases. Pass paramater_paths and structure to Fuzzer.generate_cases to run
+    the other modes on the marked paths only.
+
+    Cases are MODE_MARKER cases of the marked template, so logging them with
+    CaseLogWriter for template and replaying them with the same corpora rebuilds the
+    exact payloads, text around the markers included.
+    """
+
+    def __init__(self, template: Union[Dict[str, Any], List[Any]]) -> None:
+        self.template = template
+        self.INJECTOR = Injector()
+        self.MARKER_FINDER = MarkerFinder()
+
+        self.structure, self.markers = self.MARKER_FINDER.find_markers(
+            structure=template
+        )
+        self.index: Dict[str, List[Marker]] = {}
+        for marker in self.markers:
+            self.index.setdefault(marker.name, []).append(marker)
+
+    @property
+    def paramater_paths(self) -> List[List[Union[str, int]]]:
+        return [marker.path for marker in self.markers]
+
+    def generate_cases(
+        self,
+        corpora: Dict[str, Sequence[Any]],
+        names: Optional[List[str]] = None,
+    ) -> Iterator[FuzzCase]:
+        """
+        Lazily injects every corpus entry at every marker, one marker at a time
+
+        :param corpora: Values to inject keyed by corpus name, e.g. lists or Corpus
+        :type corpora: Dict[str, Sequence[Any]]
+        :param names: Only inject at markers with these names, defaults to None for all
+        :type names: Optional[List[str]], optional
+        :return: Iterator over the cases tagged with their corpus and entry
+        :rtype: Iterator[FuzzCase]
+        """
+        if names is None:
+            markers = self.markers
+        else:
+            markers = [marker for name in names for marker in self.index.get(name, [])]
+
+        for marker in markers:
+            for corpus_name, values in corpora.items():
+                for start in range(0, len(values), VALUES_PER_BATCH):
+                    end = min(start + VALUES_PER_BATCH, len(values))
+                    payloads = self.INJECTOR.generate_value_payloads_by_path(
+                        structure=self.structure,
+                        path=marker.path,
+                        values_to_inject=[
+                            marker.render(values[position])
+                            for position in range(start, end)
+                        ],
+                    )
+
+                    for position, payload in enumerate(payloads, start=start):
+                        yield FuzzCase(
+                            mode=MODE_MARKER,
+                            path=marker.path,
+                            variant=0,
+                            payload=payload,
+                            corpus=corpus_name,
+                            corpus_index=position,
+                        )
@@ -0,0 +1,175 @@
+from jsonfuzzer.parser.injector import Injector
+
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+import os
+
+
+class Minimizer:
+    """
+    Shrinks a payload while a bug still reproduces
+
+    Containers are visited breadth first, so reductions closest to the root and the
+    biggest savings come first, and each container, list or string is reduced the
+    ddmin way: chunks of its items are removed, starting with halves, and the chunk
+    size is halved whenever no chunk can be removed. After a removal the sweep resumes
+    at the same position rather than starting over. Passes repeat until nothing more
+    can be removed.
+
+    Chunk removals are tested in parallel batches and the first one in sweep order that
+    still reproduces is kept, so the result does not depend on scheduling. Candidates
+    only copy the containers along the path to the reduced value and share the rest
+    with the current structure, so the predicate must not modify its argument.
+
+    The predicate runs on the executor, by default a thread pool. Predicates that do
+    their work in other processes, such as a Harness, parallelise well on threads,
+    CPU bound in-process predicates should be given a process pool instead.
+    """
+
+    def __init__(
+        self,
+        predicate: Callable[[Any], bool],
+        workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        self.predicate = predicate
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = executor
+        self.INJECTOR = Injector()
+
+    def minimize(
+        self, structure: Union[Dict[str, Any], List[Any]]
+    ) -> Union[Dict[str, Any], List[Any]]:
+        """
+        Returns the smallest reproducing structure found
+
+        :param structure: A structure the predicate returns True for
+        :type structure: Union[Dict[str, Any], List[Any]]
+        :return: A reduced structure the predicate still returns True for
+        :rtype: Union[Dict[str, Any], List[Any]]
+        """
+        if not self.predicate(structure):
+            raise ValueError("The structure does not reproduce the bug")
+
+        executor = self.executor or ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            current = structure
+            while True:
+                reduced = self._reduce_pass(executor, current)
+                if reduced is current:
+                    return current
+                current = reduced
+        finally:
+            if self.executor is None:
+                executor.shutdown()
+
+    def _reduce_pass(
+        self, executor: Executor, structure: Union[Dict[str, Any], List[Any]]
+    ) -> Union[Dict[str, Any], List[Any]]:
+        # Children are queued once their container is reduced, so their paths stay valid
+        queue = [[]]
+        for path in queue:
+            structure = self._reduce_at(executor, structure, path)
+
+            value = self.INJECTOR.get_attribute_in_structure_by_path(
+                structure=structure, path=path
+            )
+            if isinstance(value, dict):
+                queue.extend(path + [key] for key in value)
+            elif isinstance(value, list):
+                queue.extend(path + [index] for index in range(len(value)))
+
+        return structure
+
+    def _reduce_at(
+        self,
+        executor: Executor,
+        structure: Union[Dict[str, Any], List[Any]],
+        path: List[Union[str, int]],
+    ) -> Union[Dict[str, Any], List[Any]]:
+        value = self.INJECTOR.get_attribute_in_structure_by_path(
+            structure=structure, path=path
+        )
+        if not isinstance(value, (dict, list, str)) or not value:
+            return structure
+
+        chunk = (len(value) + 1) // 2
+        while True:
+            start = 0
+            while start < len(value):
+                found = self._first_reproducing(
+                    executor, self._candidates(structure, path, value, start, chunk)
+                )
+                if found is None:
+                    break
+
+                # Resume at the chunk that moved into the place of the removed one
+                start, structure, value = found
+
+            if chunk == 1:
+                return structure
+            chunk = (chunk + 1) // 2
+
+    def _candidates(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        path: List[Union[str, int]],
+        value: Union[Dict[str, Any], List[Any], str],
+        start: int,
+        chunk: int,
+    ) -> Iterator[Tuple[int, Union[Dict[str, Any], List[Any]], Any]]:
+        for offset in range(start, len(value), chunk):
+            reduced = _without(value, offset, offset + chunk)
+            if not path:
+                yield offset, reduced, reduced
+                continue
+
+            root, parent = self.INJECTOR.copy_path_in_structure(
+                structure=structure, path=path
+            )
+            parent[path[-1]] = reduced
+            yield offset, root, reduced
+
+    def _first_reproducing(
+        self,
+        executor: Executor,
+        candidates: Iterator[Tuple[int, Union[Dict[str, Any], List[Any]], Any]],
+    ) -> Optional[Tuple[int, Union[Dict[str, Any], List[Any]], Any]]:
+        batch = []
+
+        for candidate in candidates:
+            batch.append(candidate)
+            if len(batch) < self.workers:
+                continue
+
+            found = self._first_in_batch(executor, batch)
+            if found is not None:
+                return found
+            batch = []
+
+        return self._first_in_batch(executor, batch)
+
+    def _first_in_batch(
+        self,
+        executor: Executor,
+        batch: List[Tuple[int, Union[Dict[str, Any], List[Any]], Any]],
+    ) -> Optional[Tuple[int, Union[Dict[str, Any], List[Any]], Any]]:
+        results = executor.map(self.predicate, [root for _, root, _ in batch])
+        for candidate, reproduces in zip(batch, results):
+            if reproduces:
+                return candidate
+
+        return None
+
+
+def _without(
+    value: Union[Dict[str, Any], List[Any], str], start: int, end: int
+) -> Union[Dict[str, Any], List[Any], str]:
+    if isinstance(value, dict):
+        return {
+            key: child
+            for index, (key, child) in enumerate(value.items())
+            if not start <= index < end
+        }
+
+    return value[:start] + value[end:]
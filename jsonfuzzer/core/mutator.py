@@ -0,0 +1,235 @@
+from jsonfuzzer.parser.injector import Injector
+
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+BATCH_SIZE = 1024
+
+INT_BOUNDARIES = (
+    0,
+    1,
+    -1,
+    2**7 - 1,
+    -(2**7),
+    2**8 - 1,
+    2**8,
+    2**15 - 1,
+    -(2**15),
+    2**16 - 1,
+    2**16,
+    2**31 - 1,
+    -(2**31),
+    2**32 - 1,
+    2**32,
+    2**53,
+    2**53 + 1,
+    2**63 - 1,
+    -(2**63),
+    2**64 - 1,
+    2**64,
+)
+
+FLOAT_BOUNDARIES = (
+    0.0,
+    -0.0,
+    5e-324,
+    2.2250738585072014e-308,
+    1.7976931348623157e308,
+    -1.7976931348623157e308,
+    float("inf"),
+    float("-inf"),
+    float("nan"),
+)
+
+# Bit positions flipped in integers, chosen to cross each common integer width
+INT_BIT_FLIPS = (0, 1, 7, 8, 15, 16, 31, 32, 63)
+
+# Bits flipped in single characters, the low bit and the ASCII case bit
+CHAR_BIT_FLIPS = (0x01, 0x20)
+
+FULLWIDTH = str.maketrans({chr(c): chr(c + 0xFEE0) for c in range(0x21, 0x7F)})
+
+HOMOGLYPHS = str.maketrans(
+    {
+        "a": "\u0430",
+        "c": "\u0441",
+        "e": "\u0435",
+        "i": "\u0456",
+        "o": "\u043e",
+        "p": "\u0440",
+        "x": "\u0445",
+        "y": "\u0443",
+        "A": "\u0391",
+        "B": "\u0392",
+        "E": "\u0395",
+        "O": "\u039f",
+    }
+)
+
+# Unicode characters wrapped around / inserted into strings to exercise normalisation
+COMBINING_ACUTE = "\u0301"
+ZERO_WIDTH_SPACE = "\u200b"
+RIGHT_TO_LEFT_OVERRIDE = "\u202e"
+
+STRING_REPEAT = 256
+
+# Keys that pollute object prototypes when merged naively by JavaScript backends
+PROTOTYPE_POLLUTION_KEYS = ("__proto__", "constructor", "prototype")
+
+
+class Mutator:
+    """
+    Derives fuzz values from the original value of a primitive
+
+    Every mutation is driven by the module level tables so generating a value is a
+    handful of cheap operations, no per value tables are built.
+    """
+
+    def __init__(self) -> None:
+        self.INJECTOR = Injector()
+        self._mutators = {
+            bool: self._mutate_bool,
+            int: self._mutate_int,
+            float: self._mutate_float,
+            str: self._mutate_str,
+        }
+
+    def mutate_value(self, value: Any) -> List[Any]:
+        """
+        Generates values derived from an original primitive
+
+        Integers get neighbours, bit flips and boundary values, floats get neighbours
+        and IEEE 754 boundaries, strings get truncations, case changes, Unicode variants
+        and character bit flips. The original value and duplicates are never returned.
+
+        :param value: The original primitive value
+        :type value: Any
+        :return: List of derived values, empty when the type has no mutations
+        :rtype: List[Any]
+        """
+        mutator = self._mutators.get(type(value))
+        if mutator is None:
+            return []
+
+        mutations = []
+        seen = {_dedup_key(value)}
+        for mutation in mutator(value):
+            key = _dedup_key(mutation)
+            if key not in seen:
+                seen.add(key)
+                mutations.append(mutation)
+
+        return mutations
+
+    def mutate_key(self, key: str) -> List[str]:
+        """
+        Generates dictionary key names derived from an original key
+
+        :param key: The original dictionary key
+        :type key: str
+        :return: List of renamed keys, never including the original key
+        :rtype: List[str]
+        """
+        candidates = [
+            key.upper(),
+            key.lower(),
+            key.swapcase(),
+            key.translate(FULLWIDTH),
+            key + " ",
+            " " + key,
+            key + "\u0000",
+            "",
+        ]
+        candidates.extend(PROTOTYPE_POLLUTION_KEYS)
+
+        mutations = []
+        for candidate in candidates:
+            if candidate != key and candidate not in mutations:
+                mutations.append(candidate)
+
+        return mutations
+
+    def generate_mutation_batches(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        paramater_paths: List[List[Union[str, int]]],
+        batch_size: int = BATCH_SIZE,
+    ) -> Iterator[List[Tuple[List[Union[str, int]], Any]]]:
+        """
+        Lazily generates batches of (path, mutated value) pairs for every parameter path
+
+        :param structure: The complex dict / list based structure the paths were mapped from
+        :type structure: Union[Dict[str, Any], List[Any]]
+        :param paramater_paths: List of paths to each primitive in the structure
+        :type paramater_paths: List[List[Union[str, int]]]
+        :param batch_size: Maximum number of pairs per batch, defaults to BATCH_SIZE
+        :type batch_size: int, optional
+        :return: Iterator over lists of (path, mutated value) pairs
+        :rtype: Iterator[List[Tuple[List[Union[str, int]], Any]]]
+        """
+        batch = []
+
+        for param_path in paramater_paths:
+            original = self.INJECTOR.get_attribute_in_structure_by_path(
+                structure=structure, path=param_path
+            )
+            for mutation in self.mutate_value(original):
+                batch.append((param_path, mutation))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+
+        if batch:
+            yield batch
+
+    def _mutate_bool(self, value: bool) -> List[Any]:
+        return [not value, int(value), str(value).lower()]
+
+    def _mutate_int(self, value: int) -> List[Any]:
+        mutations = [value + 1, value - 1, -value]
+        mutations.extend(value ^ (1 << bit) for bit in INT_BIT_FLIPS)
+        mutations.extend(INT_BOUNDARIES)
+        mutations.append(float(value))
+        mutations.append(str(value))
+        return mutations
+
+    def _mutate_float(self, value: float) -> List[Any]:
+        mutations = [value + 1, value - 1, -value, value * 2**64, value / 2**64]
+        mutations.extend(FLOAT_BOUNDARIES)
+        if value == value and abs(value) != float("inf"):
+            mutations.append(int(value))
+        mutations.append(repr(value))
+        return mutations
+
+    def _mutate_str(self, value: str) -> List[Any]:
+        mutations = [
+            "",
+            value[:1],
+            value[: len(value) // 2],
+            value[:-1],
+            value * STRING_REPEAT,
+            value.upper(),
+            value.lower(),
+            value.swapcase(),
+            value.translate(FULLWIDTH),
+            value.translate(HOMOGLYPHS),
+            value + COMBINING_ACUTE,
+            value[:1] + ZERO_WIDTH_SPACE + value[1:],
+            RIGHT_TO_LEFT_OVERRIDE + value,
+        ]
+
+        if value:
+            # Flip bits in the first, middle and last characters
+            for position in sorted({0, len(value) // 2, len(value) - 1}):
+                for bit in CHAR_BIT_FLIPS:
+                    flipped = chr(ord(value[position]) ^ bit)
+                    mutations.append(value[:position] + flipped + value[position + 1 :])
+
+        return mutations
+
+
+def _dedup_key(value: Any) -> Tuple[type, Any]:
+    # -0.0 == 0.0 and nan != nan, the repr of a float tells them apart and matches nan
+    if isinstance(value, float):
+        return float, repr(value)
+
+    return type(value), value
@@ -0,0 +1,448 @@
+from jsonfuzzer.core.fuzzer import (
+    MODE_KEY_NAME,
+    MODE_MISSING_ATTRIBUTE,
+    MODE_MUTATION,
+    MODE_PARAMETER,
+    MODE_STRUCTURE,
+    MODE_TYPE_CONFUSION,
+    MODE_UNEXPECTED_ATTRIBUTE,
+    MODES,
+    VALUE_MODES,
+    Fuzzer,
+    FuzzCase,
+    payload_fingerprint,
+)
+
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+import time
+
+# Relative share of the budget each mode gets, favouring modes whose few cases per
+# path tend to surface the most issues per request
+MODE_WEIGHTS = {
+    MODE_PARAMETER: 3.0,
+    MODE_TYPE_CONFUSION: 2.0,
+    MODE_MISSING_ATTRIBUTE: 2.0,
+    MODE_MUTATION: 1.5,
+    MODE_STRUCTURE: 1.0,
+    MODE_KEY_NAME: 1.0,
+    MODE_UNEXPECTED_ATTRIBUTE: 1.0,
+}
+
+# Seconds assumed per case until the cost of a mode has been measured
+DEFAULT_CASE_COST = 0.01
+
+# Cases handed out between two plans
+REPLAN_INTERVAL = 100
+
+# Weight of the newest measurement in the moving average of the cost per case
+COST_SMOOTHING = 0.2
+
+_Unit = Tuple[str, Optional[str], Tuple[Union[str, int], ...]]
+
+
+class PlanItem(NamedTuple):
+    mode: str
+    corpus: Optional[str]
+    path: List[Union[str, int]]
+    cases: int
+
+
+class Planner:
+    """
+    Splits a request and / or time budget across modes, corpora and paths
+
+    Each mode gets a share of the budget in proportion to its weight, spent on as many
+    cases as that share buys at the measured cost per case of the mode. A mode with
+    fewer cases than its share buys hands the rest back to the other modes. Within a
+    mode the cases are spread evenly over every path, and for VALUE_MODES over every
+    path of every corpus, taking the first variants of each path first.
+
+    Costs are measured from the results passed to observe or observe_result, e.g. as
+    the on_result hook of a Harness, and scaled by the wall clock time per busy second
+    observed so far to account for cases running in parallel. cases re-plans the
+    remaining budget every replan_interval cases, so the plan follows the throughput
+    that is actually achieved.
+    """
+
+    def __init__(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        paramater_paths: List[List[Union[str, int]]],
+        modes: Optional[Sequence[str]] = None,
+        corpora: Optional[Dict[str, Sequence[Any]]] = None,
+        max_cases: Optional[int] = None,
+        max_seconds: Optional[float] = None,
+        weights: Optional[Dict[str, float]] = None,
+        replan_interval: int = REPLAN_INTERVAL,
+    ) -> None:
+        self.corpora = corpora or {}
+        if modes is None:
+            modes = [mode for mode in MODES if self.corpora or mode not in VALUE_MODES]
+
+        for mode in modes:
+            if mode in VALUE_MODES and not self.corpora:
+                raise ValueError(f"Mode {mode} requires at least one corpus")
+
+        self.structure = structure
+        self.modes = list(modes)
+        self.max_cases = max_cases
+        self.max_seconds = max_seconds
+        self.weights = MODE_WEIGHTS if weights is None else weights
+        self.replan_interval = replan_interval
+        self.FUZZER = Fuzzer()
+
+        self._paths: Dict[_Unit, List[Union[str, int]]] = {}
+        self._totals: Dict[_Unit, int] = {}
+        self._progress: Dict[_Unit, int] = {}
+        self._payloads: Dict[_Unit, List[Any]] = {}
+        self._value_payloads: Dict[_Unit, Tuple[int, List[Any]]] = {}
+        self._variants: Dict[Tuple[str, Tuple[Union[str, int], ...]], int] = {}
+        self._costs: Dict[str, float] = {}
+        self._busy = 0.0
+        self._started: Optional[float] = None
+        self._emitted = 0
+        self._seen = set()
+
+        # Only counts are needed to plan, payloads are generated once a unit is due
+        for mode in self.modes:
+            for param_path in paramater_paths:
+                variants = self.FUZZER.count_payloads_for_path(
+                    structure=structure, mode=mode, path=param_path
+                )
+                if mode not in VALUE_MODES:
+                    self._add_unit(
+                        (mode, None, tuple(param_path)), param_path, variants
+                    )
+                    continue
+
+                self._variants[mode, tuple(param_path)] = variants
+                for corpus_name, corpus in self.corpora.items():
+                    unit = (mode, corpus_name, tuple(param_path))
+                    self._add_unit(unit, param_path, len(corpus) * variants)
+
+    @property
+    def emitted(self) -> int:
+        return self._emitted
+
+    def elapsed(self) -> float:
+        """
+        :return: Seconds since the first case was handed out
+        :rtype: float
+        """
+        if self._started is None:
+            return 0.0
+
+        return time.monotonic() - self._started
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Returns the number of cases each mode has left, before deduplication
+
+        :return: Remaining cases keyed by mode
+        :rtype: Dict[str, int]
+        """
+        counts = {mode: 0 for mode in self.modes}
+        for unit in self._totals:
+            counts[unit[0]] += self._remaining(unit)
+
+        return counts
+
+    def observe(self, mode: str, seconds: float, cases: int = 1) -> None:
+        """
+        Records how long cases of a mode took
+
+        :param mode: Mode the cases were generated by
+        :type mode: str
+        :param seconds: Time taken by all of the cases together
+        :type seconds: float
+        :param cases: Number of cases measured, defaults to 1
+        :type cases: int, optional
+        """
+        self._busy += seconds
+
+        cost = seconds / cases
+        previous = self._costs.get(mode)
+        self._costs[mode] = (
+            cost if previous is None else previous + COST_SMOOTHING * (cost - previous)
+        )
+
+    def observe_result(self, result: Any) -> None:
+        """
+        Records the duration of a HarnessResult, for use as the on_result hook
+
+        :param result: Result of running a case
+        :type result: HarnessResult
+        """
+        mode = getattr(result.case, "mode", None)
+        if mode is None:
+            self._busy += result.duration
+            return
+
+        self.observe(mode=mode, seconds=result.duration)
+
+    def case_cost(self, mode: str) -> float:
+        """
+        Estimates the wall clock seconds a case of a mode takes out of the budget
+
+        Modes without measurements are assumed to cost the average of the measured
+        modes, or DEFAULT_CASE_COST before anything was measured.
+
+        :param mode: One of the planned modes
+        :type mode: str
+        :return: Estimated seconds per case
+        :rtype: float
+        """
+        cost = self._costs.get(mode)
+        if cost is None:
+            cost = (
+                sum(self._costs.values()) / len(self._costs)
+                if self._costs
+                else DEFAULT_CASE_COST
+            )
+
+        elapsed = self.elapsed()
+        if self._busy > 0 and elapsed > 0:
+            cost *= elapsed / self._busy
+
+        return cost
+
+    def plan(self) -> List[PlanItem]:
+        """
+        Splits the remaining budget over the cases that are left
+
+        :return: Number of cases to run for each mode, corpus and path
+        :rtype: List[PlanItem]
+        """
+        return [
+            PlanItem(mode=unit[0], corpus=unit[1], path=self._paths[unit], cases=count)
+            for unit, count in self._allocate().items()
+            if count
+        ]
+
+    def cases(self) -> Iterator[FuzzCase]:
+        """
+        Lazily generates cases following the plan until the budget runs out
+
+        Modes take turns and each mode visits its paths breadth first, so stopping
+        early still covers every mode and path. Payloads already emitted are skipped
+        without counting against the budget.
+
+        :return: Iterator over the planned cases
+        :rtype: Iterator[FuzzCase]
+        """
+        if self._started is None:
+            self._started = time.monotonic()
+
+        while True:
+            allocation = self._allocate()
+            if not any(allocation.values()):
+                return
+
+            emitted = 0
+            for unit in self._interleave(allocation):
+                if self._exhausted():
+                    return
+
+                case = self._next_case(unit)
+                if case is None:
+                    continue
+
+                self._emitted += 1
+                emitted += 1
+                yield case
+
+                if emitted >= self.replan_interval:
+                    break
+
+    def _add_unit(self, unit: _Unit, path: List[Union[str, int]], total: int) -> None:
+        self._paths[unit] = path
+        self._totals[unit] = total
+        self._progress[unit] = 0
+
+    def _remaining(self, unit: _Unit) -> int:
+        return self._totals[unit] - self._progress[unit]
+
+    def _exhausted(self) -> bool:
+        if self.max_cases is not None and self._emitted >= self.max_cases:
+            return True
+
+        return self.max_seconds is not None and self.elapsed() >= self.max_seconds
+
+    def _allocate(self) -> Dict[_Unit, int]:
+        available = self.counts()
+
+        if self.max_cases is None and self.max_seconds is None:
+            mode_cases = available
+        else:
+            # Fraction of the whole remaining budget a single case of each mode uses
+            fractions = {}
+            for mode in self.modes:
+                fraction = 0.0
+                if self.max_cases is not None:
+                    remaining_cases = self.max_cases - self._emitted
+                    fraction = 1 / remaining_cases if remaining_cases > 0 else None
+                if self.max_seconds is not None and fraction is not None:
+                    remaining_seconds = self.max_seconds - self.elapsed()
+                    fraction = (
+                        max(fraction, self.case_cost(mode) / remaining_seconds)
+                        if remaining_seconds > 0
+                        else None
+                    )
+                fractions[mode] = fraction
+
+            mode_cases = _water_fill(
+                weights={mode: self.weights.get(mode, 1.0) for mode in self.modes},
+                capacities=available,
+                costs=fractions,
+                budget=1.0,
+            )
+
+        allocation = {}
+        for mode in self.modes:
+            units = [unit for unit in self._totals if unit[0] == mode]
+            capacities = {unit: self._remaining(unit) for unit in units}
+
+            unit_cases = _water_fill(
+                weights={unit: 1.0 for unit in units},
+                capacities=capacities,
+                costs={unit: 1.0 for unit in units},
+                budget=mode_cases.get(mode, 0),
+            )
+
+            allocation.update(unit_cases)
+
+        return allocation
+
+    def _interleave(self, allocation: Dict[_Unit, int]) -> Iterator[_Unit]:
+        modes = sorted(self.modes, key=lambda mode: -self.weights.get(mode, 1.0))
+        queues = [
+            _breadth_first(
+                [(unit, count) for unit, count in allocation.items() if unit[0] == mode]
+            )
+            for mode in modes
+        ]
+
+        while queues:
+            for queue in list(queues):
+                unit = next(queue, None)
+                if unit is None:
+                    queues.remove(queue)
+                else:
+                    yield unit
+
+    def _next_case(self, unit: _Unit) -> Optional[FuzzCase]:
+        mode, corpus_name, _ = unit
+        ordinal = self._progress[unit]
+        self._progress[unit] += 1
+
+        if corpus_name is None:
+            variant, corpus_index = ordinal, None
+            payloads = self._payloads.get(unit)
+            if payloads is None:
+                payloads = self._payloads[unit] = (
+                    self.FUZZER.generate_payloads_for_path(
+                        structure=self.structure, mode=mode, path=self._paths[unit]
+                    )
+                )
+            payload = payloads[variant]
+            if not self._remaining(unit):
+                del self._payloads[unit]
+        else:
+            corpus_index, variant = divmod(ordinal, self._variants[mode, unit[2]])
+            cached_index, payloads = self._value_payloads.get(unit, (None, None))
+            if cached_index != corpus_index:
+                payloads = self.FUZZER.generate_payloads_for_path(
+                    structure=self.structure,
+                    mode=mode,
+                    path=self._paths[unit],
+                    value_to_inject=self.corpora[corpus_name][corpus_index],
+                )
+                self._value_payloads[unit] = (corpus_index, payloads)
+            payload = payloads[variant]
+            if not self._remaining(unit):
+                del self._value_payloads[unit]
+
+        fingerprint = payload_fingerprint(payload)
+        if fingerprint in self._seen:
+            return None
+        self._seen.add(fingerprint)
+
+        return FuzzCase(
+            mode=mode,
+            path=self._paths[unit],
+            variant=variant,
+            payload=payload,
+            corpus=corpus_name,
+            corpus_index=corpus_index,
+        )
+
+
+def _water_fill(
+    weights: Dict[Hashable, float],
+    capacities: Dict[Hashable, int],
+    costs: Dict[Hashable, Optional[float]],
+    budget: float,
+) -> Dict[Hashable, int]:
+    # Shares the budget by weight, keys that can't use their whole share are capped
+    # and their unused share goes back to the remaining keys
+    allocation = {}
+    active = {
+        key
+        for key, capacity in capacities.items()
+        if capacity > 0 and weights.get(key, 0) > 0 and costs.get(key) is not None
+    }
+
+    while active and budget > 0:
+        total_weight = sum(weights[key] for key in active)
+        shares = {
+            key: (
+                weights[key] / total_weight * budget / costs[key]
+                if costs[key] > 0
+                else float("inf")
+            )
+            for key in active
+        }
+
+        capped = {key for key in active if shares[key] >= capacities[key]}
+        if not capped:
+            for key in active:
+                # Tolerate float error so an exact share isn't rounded down a case
+                allocation[key] = int(shares[key] + 1e-9)
+                budget -= allocation[key] * costs[key]
+
+            # Rounding down leaves part of the budget unspent, hand it out a case at
+            # a time to the largest fractional parts for as long as it pays for them,
+            # ties go in key order so the plan is the same on every run
+            for key in sorted(
+                (key for key in capacities if key in active),
+                key=lambda key: allocation[key] - shares[key],
+            ):
+                if costs[key] <= budget + 1e-9:
+                    allocation[key] += 1
+                    budget -= costs[key]
+            break
+
+        for key in capped:
+            allocation[key] = capacities[key]
+            budget -= capacities[key] * costs[key]
+        active -= capped
+
+    return allocation
+
+
+def _breadth_first(counts: List[Tuple[_Unit, int]]) -> Iterator[_Unit]:
+    for round_index in range(max((count for _, count in counts), default=0)):
+        for unit, count in counts:
+            if count > round_index:
+                yield unit
@@ -0,0 +1,182 @@
+from typing import Any, Dict, Iterator, List, NamedTuple, Sequence, Tuple, Union
+import random
+
+
+class ScheduledItem(NamedTuple):
+    path: List[Union[str, int]]
+    payload_class: str
+    index: int
+    value_to_inject: Any
+
+
+class Scheduler:
+    """
+    Orders the (path, payload) stream by observed anomaly rates
+
+    Paths and payload classes are arms of two Beta-Bernoulli bandits. Each draw
+    Thompson samples a path among those with payloads left, then a payload class among
+    those with payloads left for that path, and hands out the next payload of that
+    class. Rewards from triage raise or lower the odds of both arms being drawn again.
+    All randomness comes from a seeded generator, so the same seed and the same reward
+    sequence produce the same order.
+
+    Paths with payloads left are grouped by posterior and kept up to date as rewards
+    come in and paths run out. Arms sharing a posterior are interchangeable, so a draw
+    samples the best score of each group and then a member of the winning group,
+    costing one sample per distinct posterior rather than one per path.
+    """
+
+    def __init__(
+        self,
+        paramater_paths: List[List[Union[str, int]]],
+        payloads: Dict[str, Sequence[Any]],
+        seed: int = 0,
+    ) -> None:
+        self.paramater_paths = paramater_paths
+        self.payloads = payloads
+        self._random = random.Random(seed)
+
+        # Beta(1, 1) priors, every arm starts out equally likely
+        self._path_arms = {tuple(path): [1.0, 1.0] for path in paramater_paths}
+        self._class_arms = {payload_class: [1.0, 1.0] for payload_class in payloads}
+
+        self._next_index = {
+            (tuple(path), payload_class): 0
+            for path in paramater_paths
+            for payload_class, values in payloads.items()
+            if len(values)
+        }
+        self._paths = {tuple(path): path for path in paramater_paths}
+
+        # Classes with payloads left per path, kept up to date as pairs run out so
+        # drawing never has to scan _next_index
+        self._active: Dict[Tuple[Union[str, int], ...], List[str]] = {}
+        for path_key, payload_class in self._next_index:
+            self._active.setdefault(path_key, []).append(payload_class)
+
+        # Active paths by posterior, with the position of each path in its group
+        self._groups: Dict[Tuple[float, float], List[Any]] = {}
+        self._positions: Dict[Any, int] = {}
+        for path_key in self._active:
+            self._group_add(path_key)
+
+    def __iter__(self) -> Iterator[ScheduledItem]:
+        return self
+
+    def __next__(self) -> ScheduledItem:
+        if not self._active:
+            raise StopIteration
+
+        path_key = self._sample_path()
+        payload_class = self._sample(self._class_arms, self._active[path_key])
+
+        index = self._next_index[(path_key, payload_class)]
+        if index + 1 < len(self.payloads[payload_class]):
+            self._next_index[(path_key, payload_class)] = index + 1
+        else:
+            del self._next_index[(path_key, payload_class)]
+            self._active[path_key].remove(payload_class)
+            if not self._active[path_key]:
+                del self._active[path_key]
+                self._group_remove(path_key)
+
+        return ScheduledItem(
+            path=self._paths[path_key],
+            payload_class=payload_class,
+            index=index,
+            value_to_inject=self.payloads[payload_class][index],
+        )
+
+    def reward(
+        self, path: List[Union[str, int]], payload_class: str, reward: float
+    ) -> None:
+        """
+        Feeds back how interesting the outcome of a scheduled item was
+
+        :param path: Path of the scheduled item
+        :type path: List[Union[str, int]]
+        :param payload_class: Payload class of the scheduled item
+        :type payload_class: str
+        :param reward: Between 0 (nothing found) and 1 (anomaly, e.g. a new triage bucket)
+        :type reward: float
+        """
+        reward = min(1.0, max(0.0, float(reward)))
+        path_key = tuple(path)
+
+        active = path_key in self._positions
+        if active:
+            self._group_remove(path_key)
+
+        for arm in (self._path_arms[path_key], self._class_arms[payload_class]):
+            arm[0] += reward
+            arm[1] += 1 - reward
+
+        if active:
+            self._group_add(path_key)
+
+    def posterior_means(self) -> Tuple[Dict[Any, float], Dict[str, float]]:
+        """
+        Expected reward of each path and payload class arm
+
+        :return: Path means keyed by path tuple, and payload class means
+        :rtype: Tuple[Dict[Any, float], Dict[str, float]]
+        """
+        return (
+            {
+                key: alpha / (alpha + beta)
+                for key, (alpha, beta) in self._path_arms.items()
+            },
+            {
+                key: alpha / (alpha + beta)
+                for key, (alpha, beta) in self._class_arms.items()
+            },
+        )
+
+    def _sample(self, arms: Dict[Any, List[float]], candidates) -> Any:
+        best, best_score = None, -1.0
+        for candidate in candidates:
+            alpha, beta = arms[candidate]
+            score = self._random.betavariate(alpha, beta)
+            if score > best_score:
+                best, best_score = candidate, score
+
+        return best
+
+    def _sample_path(self) -> Any:
+        best_group, best_score = None, -1.0
+        for (alpha, beta), group in self._groups.items():
+            score = self._sample_best(alpha, beta, len(group))
+            if score > best_score:
+                best_group, best_score = group, score
+
+        return best_group[self._random.randrange(len(best_group))]
+
+    def _sample_best(self, alpha: float, beta: float, count: int) -> float:
+        # Best of count Beta(alpha, beta) samples, by inverting the CDF of the maximum
+        # where the Beta CDF has a closed form
+        if count == 1:
+            return self._random.betavariate(alpha, beta)
+        if alpha == 1:
+            return 1 - (1 - self._random.random() ** (1 / count)) ** (1 / beta)
+        if beta == 1:
+            return self._random.random() ** (1 / (count * alpha))
+
+        return max(self._random.betavariate(alpha, beta) for _ in range(count))
+
+    def _group_add(self, path_key: Any) -> None:
+        group = self._groups.setdefault(tuple(self._path_arms[path_key]), [])
+        self._positions[path_key] = len(group)
+        group.append(path_key)
+
+    def _group_remove(self, path_key: Any) -> None:
+        posterior = tuple(self._path_arms[path_key])
+        group = self._groups[posterior]
+        position = self._positions.pop(path_key)
+
+        # Swap with the last member so removal doesn't shift the group
+        last = group.pop()
+        if last != path_key:
+            group[position] = last
+            self._positions[last] = position
+        if not group:
+            del self._groups[posterior]
@@ -0,0 +1,423 @@
+from jsonfuzzer.core.fuzzer import MODES, Fuzzer, FuzzCase, payload_fingerprint
+from jsonfuzzer.corpus.corpus import Corpus
+from jsonfuzzer.harness.harness import (
+    OUTCOME_CRASH,
+    OUTCOME_EXCEPTION,
+    OUTCOME_HANG,
+    OUTCOME_OK,
+)
+
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+OUTCOME_CODES = {
+    OUTCOME_OK: 0,
+    OUTCOME_EXCEPTION: 1,
+    OUTCOME_CRASH: 2,
+    OUTCOME_HANG: 3,
+}
+OUTCOME_NOT_RUN = 255
+
+NO_CORPUS = 0xFFFF
+
+# Largest values the fixed width record fields can hold
+MAX_VARIANT = 0xFFFF
+MAX_CORPUS_INDEX = 0xFFFFFFFF
+
+# Bytes of a corpus file read at a time while hashing it
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+_OUTCOMES_BY_CODE = {code: outcome for outcome, code in OUTCOME_CODES.items()}
+
+
+class CaseRecord(NamedTuple):
+    mode: str
+    path_id: int
+    variant: int
+    corpus_id: Optional[int]
+    corpus_index: Optional[int]
+    outcome: Optional[str]
+    latency: float
+
+
+class _CaseLogFormat:
+    MAGIC = b"JFCL"
+    VERSION = 1
+    # magic, version, template hash, corpus count, path table length
+    HEADER = struct.Struct("<4sI32sHI")
+    # corpus hash, corpus name length
+    CORPUS = struct.Struct("<32sH")
+    # mode, path id, variant, corpus id, corpus index, outcome code, latency
+    RECORD = struct.Struct("<BIHHIBf")
+
+    @classmethod
+    def header(
+        cls,
+        template_hash: bytes,
+        corpora: List[Tuple[str, bytes]],
+        paramater_paths: List[List[Union[str, int]]],
+    ) -> bytes:
+        path_table = json.dumps(paramater_paths, separators=(",", ":")).encode()
+        parts = [
+            cls.HEADER.pack(
+                cls.MAGIC, cls.VERSION, template_hash, len(corpora), len(path_table)
+            )
+        ]
+        for name, digest in corpora:
+            encoded = name.encode()
+            parts.append(cls.CORPUS.pack(digest, len(encoded)))
+            parts.append(encoded)
+        parts.append(path_table)
+
+        return b"".join(parts)
+
+
+class CaseLogWriter:
+    """
+    Append only binary log of generated cases and their outcomes
+
+    A case is fully determined by the template, its mode, path, variant and the corpus
+    entry it injected, so instead of the payload each case is stored as an 18 byte
+    fixed width record of those ids plus the outcome code and latency. The header
+    holds the template hash, the hash and name of each corpus and the path table the
+    path ids index into. Replayer rebuilds the payloads from the same template.
+
+    Opening an existing log appends to it, as long as it was written for the same
+    template, paths and corpora.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        structure: Union[Dict[str, Any], List[Any]],
+        paramater_paths: List[List[Union[str, int]]],
+        corpora: Optional[Dict[str, Sequence[Any]]] = None,
+    ) -> None:
+        self.path = path
+        corpora = corpora or {}
+
+        self._path_ids = {
+            tuple(param_path): path_id
+            for path_id, param_path in enumerate(paramater_paths)
+        }
+        self._corpus_ids = {name: corpus_id for corpus_id, name in enumerate(corpora)}
+        if len(self._corpus_ids) >= NO_CORPUS:
+            raise ValueError(f"A case log holds at most {NO_CORPUS - 1} corpora")
+
+        header = _CaseLogFormat.header(
+            template_hash=template_hash(structure),
+            corpora=[(name, corpus_hash(corpus)) for name, corpus in corpora.items()],
+            paramater_paths=paramater_paths,
+        )
+
+        self._file = open(path, "a+b")
+        self._file.seek(0)
+        existing = self._file.read(len(header))
+
+        if not existing:
+            self._file.write(header)
+        elif existing != header:
+            self._file.close()
+            raise ValueError(
+                f"{path} was written for a different template, paths or corpora"
+            )
+        else:
+            # Drop a partial record left behind by an interrupted write
+            size = os.fstat(self._file.fileno()).st_size
+            self._file.truncate(
+                size - (size - len(header)) % _CaseLogFormat.RECORD.size
+            )
+
+    def __enter__(self) -> "CaseLogWriter":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def append(
+        self, case: FuzzCase, outcome: Optional[str] = None, latency: float = 0.0
+    ) -> None:
+        """
+        Appends a record for a single case
+
+        :param case: The case to record, payload itself is not stored
+        :type case: FuzzCase
+        :param outcome: One of the harness outcomes, defaults to None for not run
+        :type outcome: Optional[str], optional
+        :param latency: Seconds the case took, defaults to 0.0
+        :type latency: float, optional
+        :raises ValueError: If the case doesn't fit in a record, e.g. a variant above
+            MAX_VARIANT
+        """
+        if not 0 <= case.variant <= MAX_VARIANT:
+            raise ValueError(
+                f"variant {case.variant} of {case.mode} case doesn't fit in a case "
+                f"log record, which holds variants up to {MAX_VARIANT}"
+            )
+
+        try:
+            path_id = self._path_ids[tuple(case.path)]
+        except KeyError:
+            raise ValueError(f"Path not in the path table: {case.path}") from None
+
+        if case.corpus is None:
+            corpus_id, corpus_index = NO_CORPUS, 0
+        else:
+            try:
+                corpus_id = self._corpus_ids[case.corpus]
+            except KeyError:
+                raise ValueError(f"Unknown corpus: {case.corpus}") from None
+            corpus_index = case.corpus_index
+            if not 0 <= corpus_index <= MAX_CORPUS_INDEX:
+                raise ValueError(
+                    f"corpus_index {corpus_index} doesn't fit in a case log record, "
+                    f"which holds corpus indexes up to {MAX_CORPUS_INDEX}"
+                )
+
+        self._file.write(
+            _CaseLogFormat.RECORD.pack(
+                MODES.index(case.mode),
+                path_id,
+                case.variant,
+                corpus_id,
+                corpus_index,
+                OUTCOME_NOT_RUN if outcome is None else OUTCOME_CODES[outcome],
+                latency,
+            )
+        )
+
+    def append_result(self, result: Any) -> None:
+        """
+        Appends a record for a HarnessResult, for use as the on_result hook
+
+        :param result: Result of running a FuzzCase
+        :type result: HarnessResult
+        """
+        self.append(result.case, outcome=result.outcome, latency=result.duration)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class CaseLog:
+    """
+    Memory mapped reader for a log written by CaseLogWriter
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = None
+
+        try:
+            # Raises ValueError for an empty file, which must close the file too
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, self.template_hash, corpus_count, path_table_length = (
+                _CaseLogFormat.HEADER.unpack_from(self._map, 0)
+            )
+            if magic != _CaseLogFormat.MAGIC or version != _CaseLogFormat.VERSION:
+                raise ValueError(
+                    f"{path} is not a version {_CaseLogFormat.VERSION} case log"
+                )
+
+            offset = _CaseLogFormat.HEADER.size
+            self.corpus_names: List[str] = []
+            self.corpus_hashes: List[bytes] = []
+            for _ in range(corpus_count):
+                digest, name_length = _CaseLogFormat.CORPUS.unpack_from(
+                    self._map, offset
+                )
+                offset += _CaseLogFormat.CORPUS.size
+                self.corpus_names.append(
+                    self._map[offset : offset + name_length].decode()
+                )
+                self.corpus_hashes.append(digest)
+                offset += name_length
+
+            self.paramater_paths: List[List[Union[str, int]]] = json.loads(
+                self._map[offset : offset + path_table_length]
+            )
+        except (struct.error, ValueError):
+            self.close()
+            raise
+
+        self._records_offset = offset + path_table_length
+
+    def __len__(self) -> int:
+        # A partial record at the end of an interrupted log is ignored
+        return (len(self._map) - self._records_offset) // _CaseLogFormat.RECORD.size
+
+    def __getitem__(self, index: int) -> CaseRecord:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("case log index out of range")
+
+        return self._record(
+            _CaseLogFormat.RECORD.unpack_from(
+                self._map,
+                self._records_offset + index * _CaseLogFormat.RECORD.size,
+            )
+        )
+
+    def __iter__(self) -> Iterator[CaseRecord]:
+        end = self._records_offset + len(self) * _CaseLogFormat.RECORD.size
+        for fields in _CaseLogFormat.RECORD.iter_unpack(
+            memoryview(self._map)[self._records_offset : end]
+        ):
+            yield self._record(fields)
+
+    def __enter__(self) -> "CaseLog":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def _record(self, fields: tuple) -> CaseRecord:
+        mode, path_id, variant, corpus_id, corpus_index, outcome, latency = fields
+        if corpus_id == NO_CORPUS:
+            corpus_id = corpus_index = None
+
+        return CaseRecord(
+            mode=MODES[mode],
+            path_id=path_id,
+            variant=variant,
+            corpus_id=corpus_id,
+            corpus_index=corpus_index,
+            outcome=_OUTCOMES_BY_CODE.get(outcome),
+            latency=latency,
+        )
+
+
+class Replayer:
+    """
+    Rebuilds the cases recorded in a CaseLog
+
+    The template and corpora must hash to the values in the log header. Cases of the
+    VALUE_MODES that didn't come from a corpus need the value_to_inject they were
+    generated with.
+    """
+
+    def __init__(
+        self,
+        case_log: CaseLog,
+        structure: Union[Dict[str, Any], List[Any]],
+        corpora: Optional[Dict[str, Sequence[Any]]] = None,
+        value_to_inject: Any = None,
+    ) -> None:
+        if template_hash(structure) != case_log.template_hash:
+            raise ValueError("Template does not match the case log")
+
+        corpora = corpora or {}
+        for name, digest in zip(case_log.corpus_names, case_log.corpus_hashes):
+            if name in corpora and corpus_hash(corpora[name]) != digest:
+                raise ValueError(f"Corpus {name} does not match the case log")
+
+        self.case_log = case_log
+        self.structure = structure
+        self.corpora = corpora
+        self.value_to_inject = value_to_inject
+        self.FUZZER = Fuzzer()
+
+        # Consecutive records usually share a path, keep its payloads around
+        self._cached_key = None
+        self._cached_payloads: List[Any] = []
+
+    def __iter__(self) -> Iterator[Tuple[CaseRecord, FuzzCase]]:
+        for record in self.case_log:
+            yield record, self.replay(record)
+
+    def replay(self, record: Union[int, CaseRecord]) -> FuzzCase:
+        """
+        Rebuilds a single case
+
+        :param record: A record, or its position in the log
+        :type record: Union[int, CaseRecord]
+        :return: The case exactly as it was generated
+        :rtype: FuzzCase
+        """
+        if isinstance(record, int):
+            record = self.case_log[record]
+
+        corpus = None
+        value_to_inject = self.value_to_inject
+        if record.corpus_id is not None:
+            corpus = self.case_log.corpus_names[record.corpus_id]
+            if corpus not in self.corpora:
+                raise ValueError(f"Corpus {corpus} is needed to replay this case")
+            value_to_inject = self.corpora[corpus][record.corpus_index]
+
+        path = self.case_log.paramater_paths[record.path_id]
+        key = (record.mode, record.path_id, record.corpus_id, record.corpus_index)
+        if key != self._cached_key:
+            self._cached_payloads = self.FUZZER.generate_payloads_for_path(
+                structure=self.structure,
+                mode=record.mode,
+                path=path,
+                value_to_inject=value_to_inject,
+            )
+            self._cached_key = key
+
+        return FuzzCase(
+            mode=record.mode,
+            path=path,
+            variant=record.variant,
+            payload=self._cached_payloads[record.variant],
+            corpus=corpus,
+            corpus_index=record.corpus_index,
+        )
+
+
+def template_hash(structure: Union[Dict[str, Any], List[Any]]) -> bytes:
+    return hashlib.sha256(payload_fingerprint(structure).encode()).digest()
+
+
+def corpus_hash(corpus: Sequence[Any]) -> bytes:
+    """
+    Hashes the entries of a corpus to check a replay uses the one a log was written with
+
+    A Corpus is hashed by streaming the raw bytes of its file, much cheaper than
+    fingerprinting every entry, so it has to be replayed from a Corpus of the same
+    file content rather than a list of its entries.
+
+    :param corpus: Corpus or sequence of values
+    :type corpus: Sequence[Any]
+    :return: SHA-256 digest of the corpus
+    :rtype: bytes
+    """
+    digest = hashlib.sha256()
+    if isinstance(corpus, Corpus):
+        digest.update(f"corpus:{corpus.encoding}\n".encode())
+        with open(corpus.path, "rb") as corpus_file:
+            for chunk in iter(lambda: corpus_file.read(_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+
+        return digest.digest()
+
+    for entry in corpus:
+        digest.update(payload_fingerprint(entry).encode())
+        digest.update(b"\n")
+
+    return digest.digest()
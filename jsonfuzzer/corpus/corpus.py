@@ -0,0 +1,186 @@
+from array import array
+from typing import Iterator, Optional
+import mmap
+import os
+import struct
+import tempfile
+
+
+class Corpus:
+    """
+    Memory mapped payload wordlist
+
+    Maps a newline separated wordlist into memory and builds an index of line offsets
+    so entries can be read lazily or by position without loading the whole file. The
+    index is persisted next to the wordlist as a sidecar file and reused for as long as
+    the wordlist size and modification time are unchanged.
+    """
+
+    INDEX_SUFFIX = ".idx"
+    _INDEX_MAGIC = b"JFCI"
+    _INDEX_VERSION = 2
+    # Magic, version, wordlist size and mtime, number of offsets
+    _INDEX_HEADER = struct.Struct("<4sIQQQ")
+
+    def __init__(
+        self, path: str, index_path: Optional[str] = None, encoding: str = "utf-8"
+    ) -> None:
+        self.path = path
+        self.index_path = index_path or path + self.INDEX_SUFFIX
+        self.encoding = encoding
+
+        self._file = open(path, "rb")
+        self._map = None
+
+        # Anything failing from here on has to close the file again
+        try:
+            stat = os.fstat(self._file.fileno())
+            self._size = stat.st_size
+            self._mtime = stat.st_mtime_ns
+
+            # mmap refuses to map empty files, an empty wordlist is an empty corpus
+            if self._size:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            self._offsets = self._load_index()
+            if self._offsets is None:
+                self._offsets = self._build_index()
+                self._save_index()
+        except BaseException:
+            self.close()
+            raise
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index: int) -> str:
+        """
+        Reads a single entry from the wordlist
+
+        :param index: Position of the entry in the wordlist, negative indexes are supported
+        :type index: int
+        :return: The entry with the trailing line ending stripped
+        :rtype: str
+        """
+        if index < 0:
+            index += len(self._offsets)
+
+        if not 0 <= index < len(self._offsets):
+            raise IndexError("corpus index out of range")
+
+        start = self._offsets[index]
+        end = self._offsets[index + 1] if index + 1 < len(self._offsets) else self._size
+
+        line = self._map[start:end]
+        if line.endswith(b"\n"):
+            line = line[:-1]
+        if line.endswith(b"\r"):
+            line = line[:-1]
+
+        return line.decode(self.encoding, errors="replace")
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self._offsets)):
+            yield self[index]
+
+    def __enter__(self) -> "Corpus":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def shard(self, worker_index: int, worker_count: int) -> Iterator[str]:
+        """
+        Lazily yields the entries owned by a single worker
+
+        Entries are distributed round robin, so every worker sees a similar mix of the
+        wordlist regardless of how it is ordered. Only the owned lines are ever read.
+
+        :param worker_index: Index of the current worker, starting at 0
+        :type worker_index: int
+        :param worker_count: Total number of workers sharing the corpus
+        :type worker_count: int
+        :return: Iterator over the entries assigned to the worker
+        :rtype: Iterator[str]
+        """
+        if not 0 <= worker_index < worker_count:
+            raise ValueError("worker_index must be within [0, worker_count)")
+
+        for index in range(worker_index, len(self._offsets), worker_count):
+            yield self[index]
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def _build_index(self) -> array:
+        offsets = array("Q")
+        if not self._size:
+            return offsets
+
+        position = 0
+        while position < self._size:
+            offsets.append(position)
+            newline = self._map.find(b"\n", position)
+            if newline == -1:
+                break
+            position = newline + 1
+
+        return offsets
+
+    def _load_index(self) -> Optional[array]:
+        try:
+            with open(self.index_path, "rb") as index_file:
+                header = index_file.read(self._INDEX_HEADER.size)
+                if len(header) != self._INDEX_HEADER.size:
+                    return None
+
+                magic, version, size, mtime, count = self._INDEX_HEADER.unpack(header)
+                if (
+                    magic != self._INDEX_MAGIC
+                    or version != self._INDEX_VERSION
+                    or size != self._size
+                    or mtime != self._mtime
+                ):
+                    return None  # Stale or foreign sidecar, rebuild it
+
+                offsets = array("Q")
+                offsets.frombytes(index_file.read(count * offsets.itemsize))
+                if len(offsets) != count or index_file.read(1):
+                    return None  # Truncated or corrupt sidecar, rebuild it
+
+                return offsets
+        except (OSError, ValueError):
+            return None
+
+    def _save_index(self) -> None:
+        # Write a temporary file next to the index and swap it in, so workers sharing
+        # the corpus never read a half written index
+        directory, name = os.path.split(os.path.abspath(self.index_path))
+        try:
+            descriptor, temporary_path = tempfile.mkstemp(
+                prefix=name + ".", suffix=".tmp", dir=directory
+            )
+        except OSError:
+            return  # Read only locations still work, the index is just rebuilt next time
+
+        try:
+            with os.fdopen(descriptor, "wb") as index_file:
+                index_file.write(
+                    self._INDEX_HEADER.pack(
+                        self._INDEX_MAGIC,
+                        self._INDEX_VERSION,
+                        self._size,
+                        self._mtime,
+                        len(self._offsets),
+                    )
+                )
+                self._offsets.tofile(index_file)
+            os.replace(temporary_path, self.index_path)
+        except OSError:
+            try:
+                os.unlink(temporary_path)
+            except OSError:
+                pass
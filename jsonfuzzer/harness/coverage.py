@@ -0,0 +1,409 @@
+from jsonfuzzer.core.fuzzer import MODE_MUTATION, MODE_TYPE_CONFUSION, Fuzzer
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+import json
+import logging
+import os
+import random
+import sys
+import sysconfig
+import time
+
+# Percentage slowdown of the target allowed for coverage collection
+MAX_OVERHEAD = 50.0
+
+# Iterations between overhead measurements during a run
+OVERHEAD_CHECK_INTERVAL = 1000
+
+# Corpus entries run to measure the overhead, so a check costs the same however
+# large the corpus grows
+OVERHEAD_SAMPLE_SIZE = 100
+
+COVERAGE_MODES = (MODE_MUTATION, MODE_TYPE_CONFUSION)
+
+logger = logging.getLogger(__name__)
+
+# Code in the standard library, installed packages and the fuzzer itself is never
+# interesting. sysconfig gives the site-packages of the active virtualenv, if any.
+_EXCLUDED_PREFIXES = tuple(
+    os.path.realpath(path) + os.sep
+    for path in {
+        sysconfig.get_paths()["stdlib"],
+        sysconfig.get_paths()["platstdlib"],
+        sysconfig.get_paths()["purelib"],
+        sysconfig.get_paths()["platlib"],
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    }
+)
+
+
+class CoverageTracer:
+    """
+    Records which lines and branches of the target have ever been executed
+
+    Uses sys.monitoring on Python 3.12+, where every location is disabled after its
+    first hit so code that is already covered runs at full speed. Older interpreters
+    fall back to sys.settrace, recording line to line arcs as a proxy for branches.
+
+    Only files under one of the include paths are recorded. By default everything is
+    recorded except the standard library, the site-packages of the running interpreter
+    or virtualenv and jsonfuzzer itself, so a target installed as a package needs to
+    be passed in include.
+    Call close, or use the tracer as a context manager, to release the monitoring
+    tool id when done.
+    """
+
+    def __init__(self, include: Optional[Sequence[str]] = None) -> None:
+        self.include = (
+            tuple(os.path.realpath(path) for path in include) if include else None
+        )
+        self.seen: Set[Tuple[Any, ...]] = set()
+        self._new = 0
+        self._traced_files: Dict[str, bool] = {}
+        self.use_monitoring = hasattr(sys, "monitoring")
+        self._registered = False
+        self._active = False
+        self._previous_trace = None
+
+    def __len__(self) -> int:
+        return len(self.seen)
+
+    def __enter__(self) -> "CoverageTracer":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def run(
+        self, target: Callable[[Any], Any], payload: Any
+    ) -> Tuple[int, Optional[BaseException]]:
+        """
+        Calls the target with coverage collection enabled
+
+        :param target: The callable being fuzzed
+        :type target: Callable[[Any], Any]
+        :param payload: Argument passed to the target
+        :type payload: Any
+        :return: Number of newly covered locations, and the exception raised if any
+        :rtype: Tuple[int, Optional[BaseException]]
+        """
+        self._new = 0
+        error = None
+
+        self._start()
+        try:
+            target(payload)
+        except (Exception, SystemExit) as exception:
+            error = exception
+        finally:
+            self._stop()
+
+        return self._new, error
+
+    def _is_traced(self, filename: str) -> bool:
+        traced = self._traced_files.get(filename)
+        if traced is None:
+            path = os.path.realpath(filename)
+            if self.include is not None:
+                traced = path.startswith(self.include)
+            else:
+                traced = not path.startswith(_EXCLUDED_PREFIXES)
+            self._traced_files[filename] = traced
+
+        return traced
+
+    def _record(self, location: Tuple[Any, ...]) -> None:
+        if location not in self.seen:
+            self.seen.add(location)
+            self._new += 1
+
+    def close(self) -> None:
+        """
+        Releases the monitoring tool id so other coverage tools can use it
+        """
+        if self._registered:
+            sys.monitoring.set_events(sys.monitoring.COVERAGE_ID, 0)
+            sys.monitoring.free_tool_id(sys.monitoring.COVERAGE_ID)
+            self._registered = False
+
+    def _start(self) -> None:
+        self._active = True
+        if not self.use_monitoring:
+            self._previous_trace = sys.gettrace()
+            sys.settrace(self._global_trace)
+            return
+
+        if self._registered:
+            return
+
+        monitoring = sys.monitoring
+        try:
+            monitoring.use_tool_id(monitoring.COVERAGE_ID, "jsonfuzzer")
+        except ValueError:
+            # Another coverage tool owns the id, fall back to tracing
+            self.use_monitoring = False
+            self._start()
+            return
+
+        monitoring.register_callback(
+            monitoring.COVERAGE_ID, monitoring.events.LINE, self._on_line
+        )
+        monitoring.register_callback(
+            monitoring.COVERAGE_ID, monitoring.events.BRANCH, self._on_branch
+        )
+        # Locations disabled by an earlier tracer would otherwise never be reported
+        monitoring.restart_events()
+        # Events stay enabled between runs, changing them re-instruments all code and
+        # would cost far more than the few first hits reported outside a run
+        monitoring.set_events(
+            monitoring.COVERAGE_ID, monitoring.events.LINE | monitoring.events.BRANCH
+        )
+        self._registered = True
+
+    def _stop(self) -> None:
+        self._active = False
+        if not self.use_monitoring:
+            sys.settrace(self._previous_trace)
+
+    def _on_line(self, code, line_number: int) -> Any:
+        if self._is_traced(code.co_filename):
+            if not self._active:
+                return None  # Keep it enabled until a run reaches it
+            self._record((code.co_filename, line_number))
+
+        return sys.monitoring.DISABLE  # Seen once is enough, never report it again
+
+    def _on_branch(self, code, instruction_offset: int, destination_offset: int) -> Any:
+        if self._is_traced(code.co_filename):
+            if not self._active:
+                return None
+            self._record((code.co_filename, instruction_offset, destination_offset))
+
+        return sys.monitoring.DISABLE
+
+    def _global_trace(self, frame, event: str, arg: Any):
+        if event != "call" or not self._is_traced(frame.f_code.co_filename):
+            return None
+
+        filename = frame.f_code.co_filename
+        previous_line = -frame.f_code.co_firstlineno
+
+        def local_trace(frame, event: str, arg: Any):
+            nonlocal previous_line
+            if event == "line":
+                self._record((filename, previous_line, frame.f_lineno))
+                previous_line = frame.f_lineno
+            return local_trace
+
+        return local_trace
+
+
+class CoverageRun(NamedTuple):
+    iterations: int
+    corpus: List[Any]
+    failures: List[Tuple[Any, BaseException]]
+    coverage: int
+    overhead: Optional[float]
+    traced: int
+    trace_ratio: float
+
+
+class CoverageFuzzer:
+    """
+    Coverage guided fuzzing of an importable Python callable
+
+    Starts from the template and repeatedly picks a corpus entry, a path in it and a
+    mutation or type confusion payload for that path. Payloads reaching new coverage
+    are added to the corpus and mutated further. Runs in the current process, all
+    randomness comes from the seed.
+
+    The tracing overhead is measured every OVERHEAD_CHECK_INTERVAL iterations. When it
+    exceeds max_overhead percent only a share of the iterations are traced, spread
+    evenly, so the slowdown stays within the budget. The other iterations still run
+    the target and record failures, but can't add to the corpus. The share goes back
+    up as the overhead drops, e.g. once sys.monitoring has disabled covered code.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[Any], Any],
+        structure: Union[Dict[str, Any], List[Any]],
+        seed: int = 0,
+        serialize: bool = False,
+        include: Optional[Sequence[str]] = None,
+        max_overhead: float = MAX_OVERHEAD,
+    ) -> None:
+        if max_overhead <= 0:
+            raise ValueError("max_overhead must be above 0")
+
+        self.target = target
+        self.serialize = serialize
+        self.max_overhead = max_overhead
+        # Share of iterations run with coverage collection to stay within max_overhead
+        self.trace_ratio = 1.0
+        self._trace_credit = 0.0
+        self.corpus: List[Any] = [structure]
+        self.failures: List[Tuple[Any, BaseException]] = []
+        self.tracer = CoverageTracer(include=include)
+        self.FUZZER = Fuzzer()
+
+        self._random = random.Random(seed)
+        # Separate from _random, measuring doesn't change which payloads are generated
+        self._sample_random = random.Random(seed)
+        # Paths of each corpus entry by its index, mapped the first time it's picked
+        self._paths: Dict[int, List[List[Union[str, int]]]] = {}
+        self._call(self.tracer.run, structure)
+
+    def __enter__(self) -> "CoverageFuzzer":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.tracer.close()
+
+    def run(self, iterations: int) -> CoverageRun:
+        """
+        Runs a number of fuzzing iterations
+
+        :param iterations: Number of payloads to generate and run
+        :type iterations: int
+        :return: Summary of the run, including the corpus and failing payloads
+        :rtype: CoverageRun
+        """
+        overhead = None
+        traced = 0
+
+        for iteration in range(1, iterations + 1):
+            payload = self._next_payload()
+            if payload is not None:
+                traced += self._run_payload(payload)
+
+            if iteration % OVERHEAD_CHECK_INTERVAL == 0:
+                overhead = self.measure_overhead()
+                self._set_trace_ratio(overhead)
+
+        return CoverageRun(
+            iterations=iterations,
+            corpus=self.corpus,
+            failures=self.failures,
+            coverage=len(self.tracer),
+            overhead=overhead,
+            traced=traced,
+            trace_ratio=self.trace_ratio,
+        )
+
+    def measure_overhead(self, repeat: int = 3) -> float:
+        """
+        Measures the slowdown of running the corpus with coverage collection
+
+        Corpora larger than OVERHEAD_SAMPLE_SIZE are measured on a random sample of
+        that many entries.
+
+        :param repeat: Number of times the sample is run each way, defaults to 3
+        :type repeat: int, optional
+        :return: Percentage slowdown of traced runs over plain runs
+        :rtype: float
+        """
+        plain, traced = float("inf"), float("inf")
+        sample = (
+            self._sample_random.sample(self.corpus, OVERHEAD_SAMPLE_SIZE)
+            if len(self.corpus) > OVERHEAD_SAMPLE_SIZE
+            else self.corpus
+        )
+
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for payload in sample:
+                self._call(_run_plain, payload)
+            plain = min(plain, time.perf_counter() - started)
+
+            started = time.perf_counter()
+            for payload in sample:
+                self._call(self.tracer.run, payload)
+            traced = min(traced, time.perf_counter() - started)
+
+        if plain <= 0:
+            return 0.0
+
+        return max(0.0, (traced - plain) / plain * 100)
+
+    def _run_payload(self, payload: Any) -> bool:
+        # Traced runs are spread evenly, trace_ratio of them per iteration
+        self._trace_credit += self.trace_ratio
+        if self._trace_credit < 1:
+            error = self._call(_run_plain, payload)
+            if error is not None:
+                self.failures.append((payload, error))
+            return False
+
+        self._trace_credit -= 1
+        new_coverage, error = self._call(self.tracer.run, payload)
+        if new_coverage:
+            self.corpus.append(payload)
+        if error is not None:
+            self.failures.append((payload, error))
+        return True
+
+    def _set_trace_ratio(self, overhead: float) -> None:
+        trace_ratio = min(1.0, self.max_overhead / overhead) if overhead else 1.0
+        if trace_ratio < 1 and self.trace_ratio == 1:
+            logger.warning(
+                "Coverage overhead %.1f%% exceeds %.1f%%, tracing %.1f%% of runs",
+                overhead,
+                self.max_overhead,
+                trace_ratio * 100,
+            )
+        self.trace_ratio = trace_ratio
+
+    def _call(self, runner: Callable, payload: Any) -> Any:
+        if self.serialize:
+            payload = json.dumps(payload).encode()
+
+        return runner(self.target, payload)
+
+    def _next_payload(self) -> Any:
+        index = self._random.randrange(len(self.corpus))
+        parent = self.corpus[index]
+
+        paths = self._paths.get(index)
+        if paths is None:
+            paths = self._paths[index] = (
+                self.FUZZER.PATH_FINDER.map_structure(structure=parent)
+                if isinstance(parent, (dict, list))
+                else []
+            )
+
+        if not paths:
+            return None
+
+        payloads = self.FUZZER.generate_payloads_for_path(
+            structure=parent,
+            mode=self._random.choice(COVERAGE_MODES),
+            path=self._random.choice(paths),
+        )
+        if not payloads:
+            return None
+
+        return self._random.choice(payloads)
+
+
+def _run_plain(target: Callable[[Any], Any], payload: Any) -> Optional[BaseException]:
+    try:
+        target(payload)
+    except (Exception, SystemExit) as exception:
+        return exception
+
+    return None
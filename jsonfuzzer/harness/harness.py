@@ -0,0 +1,312 @@
+from jsonfuzzer.core.fuzzer import FuzzCase
+from jsonfuzzer.harness.watchdog import Watchdog
+
+from multiprocessing.connection import wait
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, Tuple
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import time
+import traceback
+
+OUTCOME_OK = "ok"
+OUTCOME_EXCEPTION = "exception"
+OUTCOME_CRASH = "crash"
+OUTCOME_HANG = "hang"
+
+# Number of innermost stack frames kept for each exception
+STACK_DEPTH = 5
+
+MAX_CASES_PER_WORKER = 1000
+
+logger = logging.getLogger(__name__)
+
+
+class HarnessResult(NamedTuple):
+    case: Any
+    outcome: str
+    exception_type: Optional[str]
+    message: Optional[str]
+    frames: Tuple[str, ...]
+    duration: float
+
+
+class Harness:
+    """
+    Feeds payloads directly to an importable Python callable
+
+    Cases run in a pool of forked worker processes that is reused across runs, so a
+    handler that crashes the interpreter or leaks memory only costs a worker restart.
+    Workers are also recycled after max_cases_per_worker cases to bound slow leaks.
+    With workers set to 0 cases run in the current process without any isolation.
+
+    When a timeout is set, a worker still busy with a case after timeout seconds is
+    killed and replaced, and the case is reported as a hang while the other workers
+    carry on. Delivery to remote targets gets the same protection by passing the
+    function that sends a payload as the target.
+
+    on_result is called with every result before it is yielded, e.g. to feed a
+    LatencyTracker or Triage.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[Any], Any],
+        serialize: bool = False,
+        workers: Optional[int] = None,
+        max_cases_per_worker: int = MAX_CASES_PER_WORKER,
+        timeout: Optional[float] = None,
+        on_result: Optional[Callable[[HarnessResult], None]] = None,
+    ) -> None:
+        self.target = target
+        self.serialize = serialize
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_cases_per_worker = max_cases_per_worker
+        self.timeout = timeout
+        self.on_result = on_result
+        self._pool = []
+
+        if timeout is not None and self.workers == 0:
+            raise ValueError("A timeout can only be enforced with at least one worker")
+
+    def __enter__(self) -> "Harness":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def run_case(self, case: Any) -> HarnessResult:
+        """
+        Runs a single case in the current process
+
+        :param case: A FuzzCase or a bare payload
+        :type case: Any
+        :return: The classified outcome of the case
+        :rtype: HarnessResult
+        """
+        return self._report(
+            HarnessResult(
+                case, *_execute(self.target, _payload_for(case), self.serialize)
+            )
+        )
+
+    def run(self, cases: Iterable[Any]) -> Iterator[HarnessResult]:
+        """
+        Runs cases across the worker pool
+
+        Results are yielded as soon as each case finishes, so they are not guaranteed
+        to be in the same order as the input cases.
+
+        :param cases: FuzzCase instances or bare payloads
+        :type cases: Iterable[Any]
+        :return: Iterator over the classified outcome of each case
+        :rtype: Iterator[HarnessResult]
+        """
+        if self.workers == 0:
+            for case in cases:
+                yield self.run_case(case)
+            return
+
+        while len(self._pool) < self.workers:
+            self._pool.append(_Worker(self.target, self.serialize))
+
+        pending = iter(cases)
+        idle = list(self._pool)
+        busy = {}
+        watchdog = Watchdog(self.timeout) if self.timeout is not None else None
+
+        try:
+            while True:
+                while idle:
+                    case = next(pending, _EXHAUSTED)
+                    if case is _EXHAUSTED:
+                        break
+
+                    worker = idle.pop()
+                    worker.submit(_payload_for(case))
+                    busy[worker.connection] = (worker, case)
+                    if watchdog is not None:
+                        watchdog.start(worker.connection)
+
+                if not busy:
+                    return
+
+                ready = wait(
+                    list(busy),
+                    timeout=(
+                        watchdog.time_until_next() if watchdog is not None else None
+                    ),
+                )
+
+                for connection in ready:
+                    worker, case = busy.pop(connection)
+                    if watchdog is not None:
+                        watchdog.stop(connection)
+
+                    try:
+                        outcome = connection.recv()
+                    except (EOFError, OSError):
+                        outcome = worker.crash_outcome()
+                        worker.restart()
+                    else:
+                        if worker.cases >= self.max_cases_per_worker:
+                            worker.restart()
+
+                    idle.append(worker)
+                    yield self._report(HarnessResult(case, *outcome))
+
+                if watchdog is None:
+                    continue
+
+                for connection in watchdog.expired():
+                    # Results that raced the deadline were already handled above
+                    if connection not in busy:
+                        continue
+
+                    worker, case = busy.pop(connection)
+                    worker.kill()
+                    worker.restart()
+
+                    logger.warning(
+                        "Hang after %.3fs in mode %s at path %s",
+                        self.timeout,
+                        getattr(case, "mode", None),
+                        getattr(case, "path", None),
+                    )
+
+                    idle.append(worker)
+                    yield self._report(
+                        HarnessResult(
+                            case,
+                            OUTCOME_HANG,
+                            None,
+                            f"no result after {self.timeout}s",
+                            (),
+                            self.timeout,
+                        )
+                    )
+        finally:
+            # The caller stopped early, don't leave stale results in the pipes
+            for worker, _ in busy.values():
+                worker.restart()
+
+    def close(self) -> None:
+        for worker in self._pool:
+            worker.stop()
+        self._pool = []
+
+    def _report(self, result: HarnessResult) -> HarnessResult:
+        if self.on_result is not None:
+            self.on_result(result)
+
+        return result
+
+
+class _Worker:
+    def __init__(self, target: Callable[[Any], Any], serialize: bool) -> None:
+        self.target = target
+        self.serialize = serialize
+        self._start()
+
+    def submit(self, payload: Any) -> None:
+        self.cases += 1
+        self.started = time.perf_counter()
+        self.connection.send((payload,))
+
+    def crash_outcome(self) -> tuple:
+        self.process.join()
+        exitcode = self.process.exitcode
+
+        try:
+            reason = signal.Signals(-exitcode).name
+        except (TypeError, ValueError):
+            reason = f"exit code {exitcode}"
+
+        return (
+            OUTCOME_CRASH,
+            None,
+            f"worker died with {reason}",
+            (),
+            time.perf_counter() - self.started,
+        )
+
+    def restart(self) -> None:
+        self.stop()
+        self._start()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+
+    def stop(self) -> None:
+        # Siblings forked later hold copies of our pipe, so EOF alone isn't enough
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass  # Already dead
+        self.connection.close()
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+
+    def _start(self) -> None:
+        context = multiprocessing.get_context("fork")
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(self.target, self.serialize, child_connection),
+            daemon=True,
+        )
+        self.process.start()
+        child_connection.close()
+        self.cases = 0
+        self.started = 0.0
+
+
+class _Exhausted:
+    pass
+
+
+_EXHAUSTED = _Exhausted()
+
+
+def _payload_for(case: Any) -> Any:
+    return case.payload if isinstance(case, FuzzCase) else case
+
+
+def _worker_main(target: Callable[[Any], Any], serialize: bool, connection) -> None:
+    while True:
+        try:
+            message = connection.recv()
+        except (EOFError, OSError):
+            return
+
+        if message is None:
+            return
+
+        connection.send(_execute(target, message[0], serialize))
+
+
+def _execute(target: Callable[[Any], Any], payload: Any, serialize: bool) -> tuple:
+    if serialize:
+        payload = json.dumps(payload).encode()
+
+    started = time.perf_counter()
+    try:
+        target(payload)
+    except (Exception, SystemExit) as error:
+        duration = time.perf_counter() - started
+        # Drop the frame for this function, keep the innermost frames of the target
+        frames = traceback.extract_tb(error.__traceback__)[1:][-STACK_DEPTH:]
+        return (
+            OUTCOME_EXCEPTION,
+            type(error).__name__,
+            str(error),
+            tuple(f"{frame.filename}:{frame.lineno}:{frame.name}" for frame in frames),
+            duration,
+        )
+
+    return OUTCOME_OK, None, None, (), time.perf_counter() - started
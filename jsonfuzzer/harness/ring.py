@@ -0,0 +1,243 @@
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Iterator, Optional
+import json
+import multiprocessing
+import os
+import struct
+import sys
+
+SLOTS = 64
+SLOT_SIZE = 64 * 1024
+
+# Length header written in place of a payload length to tell a reader to stop
+_SENTINEL = 0xFFFFFFFF
+_LENGTH = struct.Struct("<I")
+# Next slot to write, next slot to read
+_COUNTERS = struct.Struct("<QQ")
+
+
+class RingSlot:
+    """
+    A filled slot handed to a reader
+
+    data is a memoryview straight into shared memory, valid until the slot is
+    released. Use the slot as a context manager, or call release, once done with it.
+    """
+
+    def __init__(self, ring: "SharedRing", index: int, data: memoryview) -> None:
+        self.ring = ring
+        self.index = index
+        self.data = data
+
+    def __enter__(self) -> memoryview:
+        return self.data
+
+    def __exit__(self, *_) -> None:
+        self.release()
+
+    def release(self) -> None:
+        if self.data is None:
+            return
+
+        self.data.release()
+        self.data = None
+        self.ring._slot_free[self.index].release()
+
+
+class SharedRing:
+    """
+    Fixed size ring of slots in shared memory between writer and reader processes
+
+    Writers copy each serialised payload once into the next slot, readers get a
+    memoryview of the slot without any copying or pickling. Every slot has its own
+    pair of semaphores, so a writer that laps the ring blocks until the reader of that
+    slot has released it, which is the backpressure, and readers can hold and release
+    slots in any order. Writers and readers take turns on the shared counters under a
+    lock, so any number of each is supported.
+
+    Create the ring in the parent and pass it to the worker processes as an argument.
+    close_writers sends one sentinel per reader to shut them down cleanly, and the
+    parent unlinks the shared memory once everyone has closed it.
+    """
+
+    def __init__(
+        self,
+        slots: int = SLOTS,
+        slot_size: int = SLOT_SIZE,
+        context: Optional[Any] = None,
+    ) -> None:
+        if slot_size <= _LENGTH.size:
+            raise ValueError(f"slot_size must be larger than {_LENGTH.size} bytes")
+
+        context = context or multiprocessing.get_context()
+        self.slots = slots
+        self.slot_size = slot_size
+
+        self._memory = shared_memory.SharedMemory(
+            create=True, size=_COUNTERS.size + slots * slot_size
+        )
+        self._memory.buf[: _COUNTERS.size] = _COUNTERS.pack(0, 0)
+        self._slot_free = [context.Semaphore(1) for _ in range(slots)]
+        self._slot_filled = [context.Semaphore(0) for _ in range(slots)]
+        self._write_lock = context.Lock()
+        self._read_lock = context.Lock()
+        # Forked children inherit the attribute, so compare pids rather than a flag
+        self._owner_pid = os.getpid()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_memory"] = self._memory.name
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._memory = attach_shared_memory(state["_memory"])
+
+    def __enter__(self) -> "SharedRing":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def write(self, data: bytes, timeout: Optional[float] = None) -> None:
+        """
+        Copies serialised bytes into the next slot, blocking while it is in use
+
+        :param data: Serialised payload, at most slot_size - 4 bytes
+        :type data: bytes
+        :param timeout: Seconds to wait for a free slot, defaults to None for forever
+        :type timeout: Optional[float], optional
+        """
+        if len(data) > self.slot_size - _LENGTH.size:
+            raise ValueError(
+                f"{len(data)} bytes don't fit in a {self.slot_size} byte slot"
+            )
+
+        self._write(data, len(data), timeout)
+
+    def write_payload(self, payload: Any, timeout: Optional[float] = None) -> None:
+        """
+        Serialises a payload as JSON and writes it to the next slot
+
+        :param payload: The payload, or a FuzzCase whose payload is written
+        :type payload: Any
+        :param timeout: Seconds to wait for a free slot, defaults to None for forever
+        :type timeout: Optional[float], optional
+        """
+        payload = getattr(payload, "payload", payload)
+        self.write(json.dumps(payload).encode(), timeout=timeout)
+
+    def close_writers(self, readers: int, timeout: Optional[float] = None) -> None:
+        """
+        Tells readers there is nothing more to read
+
+        :param readers: Number of reader processes, each one stops at one sentinel
+        :type readers: int
+        :param timeout: Seconds to wait for each free slot, defaults to None for forever
+        :type timeout: Optional[float], optional
+        """
+        for _ in range(readers):
+            self._write(b"", _SENTINEL, timeout)
+
+    def read(self, timeout: Optional[float] = None) -> Optional[RingSlot]:
+        """
+        Waits for the next filled slot
+
+        :param timeout: Seconds to wait for a filled slot, defaults to None for forever
+        :type timeout: Optional[float], optional
+        :return: The filled slot, or None once the writers have closed
+        :rtype: Optional[RingSlot]
+        """
+        # Holding the lock while waiting keeps readers in ring order, otherwise a
+        # reader a full lap ahead could take a slot meant for the one behind it
+        with self._read_lock:
+            tail = self._counter(1)
+            index = tail % self.slots
+            if not self._slot_filled[index].acquire(timeout=timeout):
+                raise TimeoutError("No filled slot within the timeout")
+            self._set_counter(1, tail + 1)
+
+        offset = self._slot_offset(index)
+        (length,) = _LENGTH.unpack_from(self._memory.buf, offset)
+        if length == _SENTINEL:
+            self._slot_free[index].release()
+            return None
+
+        start = offset + _LENGTH.size
+        return RingSlot(self, index, self._memory.buf[start : start + length])
+
+    def consume(self, timeout: Optional[float] = None) -> Iterator[memoryview]:
+        """
+        Yields the data of every filled slot until the writers close
+
+        Each slot is released as soon as the loop moves on, so the memoryview must not
+        be kept past its iteration.
+
+        :param timeout: Seconds to wait for each slot, defaults to None for forever
+        :type timeout: Optional[float], optional
+        :return: Iterator over the serialised payloads
+        :rtype: Iterator[memoryview]
+        """
+        while True:
+            slot = self.read(timeout=timeout)
+            if slot is None:
+                return
+
+            with slot as data:
+                yield data
+
+    def close(self) -> None:
+        """
+        Detaches from the shared memory, the creating process also unlinks it
+        """
+        if self._memory is None:
+            return
+
+        self._memory.close()
+        if os.getpid() == self._owner_pid:
+            self._memory.unlink()
+        self._memory = None
+
+    def _write(self, data: bytes, length: int, timeout: Optional[float]) -> None:
+        with self._write_lock:
+            head = self._counter(0)
+            index = head % self.slots
+            if not self._slot_free[index].acquire(timeout=timeout):
+                raise TimeoutError("No free slot within the timeout")
+            self._set_counter(0, head + 1)
+
+        offset = self._slot_offset(index)
+        _LENGTH.pack_into(self._memory.buf, offset, length)
+        start = offset + _LENGTH.size
+        self._memory.buf[start : start + len(data)] = data
+        self._slot_filled[index].release()
+
+    def _slot_offset(self, index: int) -> int:
+        return _COUNTERS.size + index * self.slot_size
+
+    def _counter(self, position: int) -> int:
+        return _COUNTERS.unpack_from(self._memory.buf, 0)[position]
+
+    def _set_counter(self, position: int, value: int) -> None:
+        struct.pack_into("<Q", self._memory.buf, position * 8, value)
+
+
+def attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    Attaches to shared memory created by another process without tracking it
+
+    The process attaching must not unlink the memory when it exits, that is left to the
+    process that created it.
+
+    :param name: Name of the shared memory
+    :type name: str
+    :return: The attached shared memory
+    :rtype: shared_memory.SharedMemory
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    # Older versions track attached segments too and would unlink it on exit
+    memory = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(memory._name, "shared_memory")
+    return memory
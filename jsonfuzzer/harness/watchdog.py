@@ -0,0 +1,53 @@
+from typing import Dict, Hashable, List, Optional
+import time
+
+
+class Watchdog:
+    """
+    Tracks a per-case deadline for every case in flight
+
+    The watchdog only keeps time, the owner decides how to cancel or kill whatever is
+    running a case once its deadline has passed.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        if timeout <= 0:
+            raise ValueError("timeout must be positive")
+
+        self.timeout = timeout
+        self._deadlines: Dict[Hashable, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def start(self, key: Hashable) -> None:
+        self._deadlines[key] = time.monotonic() + self.timeout
+
+    def stop(self, key: Hashable) -> None:
+        self._deadlines.pop(key, None)
+
+    def expired(self) -> List[Hashable]:
+        """
+        Removes and returns every key whose deadline has passed
+
+        :return: Keys of the cases that ran out of time
+        :rtype: List[Hashable]
+        """
+        now = time.monotonic()
+        expired = [key for key, deadline in self._deadlines.items() if deadline <= now]
+        for key in expired:
+            del self._deadlines[key]
+
+        return expired
+
+    def time_until_next(self) -> Optional[float]:
+        """
+        Seconds until the earliest deadline, None when nothing is being watched
+
+        :return: Seconds to wait before checking expired again
+        :rtype: Optional[float]
+        """
+        if not self._deadlines:
+            return None
+
+        return max(0.0, min(self._deadlines.values()) - time.monotonic())
@@ -0,0 +1,74 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+import functools
+import json
+
+# Path key that steps from a string holding JSON into the parsed document, e.g.
+# ["payload", EMBEDDED_JSON, "a"] for {"payload": "{\"a\": 1}"}. It can't clash with
+# a real key since JSON text from the wild doesn't carry NUL characters in keys.
+EMBEDDED_JSON = "\x00json"
+
+# Distinct embedded documents kept parsed, least recently used ones are dropped first
+EMBEDDED_CACHE_SIZE = 4096
+
+_COMPACT_SEPARATORS = (",", ":")
+
+
+def parse_embedded(value: Any) -> Optional[Union[Dict[str, Any], List[Any]]]:
+    """
+    Parses a string holding a JSON object or array
+
+    Parsed documents are cached by the hash of the string, so the same blob repeated
+    across a template or across templates is only parsed once. The returned document
+    is shared between callers and must not be modified.
+
+    :param value: Any value from a structure
+    :type value: Any
+    :return: The parsed object or array, or None if value isn't one encoded as a string
+    :rtype: Optional[Union[Dict[str, Any], List[Any]]]
+    """
+    if not isinstance(value, str):
+        return None
+
+    # Rule out ordinary strings before paying for a cache lookup or a parse
+    stripped = value.strip()
+    if not stripped or stripped[0] not in "{[" or stripped[-1] not in "}]":
+        return None
+
+    parsed = _parse(value)
+    return None if parsed is None else parsed[0]
+
+
+def encode_embedded(original: str, document: Any) -> str:
+    """
+    Encodes a modified document back into a string the way the original was encoded
+
+    Compact JSON, as most serialisers emit it, stays compact and anything else is
+    written with the default separators.
+
+    :param original: The string the document was parsed from
+    :type original: str
+    :param document: The modified document
+    :type document: Any
+    :return: The document as JSON text
+    :rtype: str
+    """
+    parsed = _parse(original)
+    separators = parsed[1] if parsed is not None else None
+
+    return json.dumps(document, separators=separators, ensure_ascii=False)
+
+
+@functools.lru_cache(maxsize=EMBEDDED_CACHE_SIZE)
+def _parse(
+    text: str,
+) -> Optional[Tuple[Union[Dict[str, Any], List[Any]], Optional[Tuple[str, str]]]]:
+    try:
+        document = json.loads(text)
+    except ValueError:
+        return None
+
+    if not isinstance(document, (dict, list)):
+        return None
+
+    compact = json.dumps(document, separators=_COMPACT_SEPARATORS, ensure_ascii=False)
+    return document, _COMPACT_SEPARATORS if compact == text else None
@@ -1,4 +1,6 @@
-from typing import Dict, Any, List, Union
+from jsonfuzzer.parser.embedded import EMBEDDED_JSON, encode_embedded, parse_embedded
+
+from typing import Dict, Any, List, Tuple, Union
 import copy
 
 
@@ -30,6 +32,23 @@ class Injector:
         :return: A structure with the target parameter modified to the injection value
         :rtype: Union[Dict[str, Any], List[Any]]
         """
+        if EMBEDDED_JSON in path:
+            outer_path, text, document, inner_path = self._split_embedded_path(
+                structure=structure, path=path
+            )
+            if inner_path:
+                document = self.modify_attribute_in_structure_by_path(
+                    structure=document, path=inner_path, value_to_inject=value_to_inject
+                )
+            else:
+                document = value_to_inject
+
+            return self.modify_attribute_in_structure_by_path(
+                structure=structure,
+                path=outer_path,
+                value_to_inject=encode_embedded(text, document),
+            )
+
         # Take a deep copy to avoid accidentally changing a shared reference
         target_dict = copy.deepcopy(structure)
 
@@ -46,6 +65,38 @@ class Injector:
 
         return target_dict
 
+    def get_attribute_in_structure_by_path(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        path: List[Union[str, int]],
+    ) -> Any:
+        """
+        Gets an attribute in a structure
+
+        Uses a list of keys / indexes to walk through a structure and return the target
+        parameter. The returned value is a reference into the structure, not a copy.
+
+        :param structure: The complex dict / list based structure to walk
+        :type structure: Union[Dict[str, Any], List[Any]]
+        :param path: List of keys to get to a primitive in a structure
+        :type path: List[Union[str, int]]
+        :return: The value at the end of the path
+        :rtype: Any
+        """
+        if EMBEDDED_JSON in path:
+            _, _, document, inner_path = self._split_embedded_path(
+                structure=structure, path=path
+            )
+            return self.get_attribute_in_structure_by_path(
+                structure=document, path=inner_path
+            )
+
+        current = structure
+        for k in path:
+            current = current[k]
+
+        return current
+
     def remove_attribute_in_structure_by_path(
         self,
         structure: Union[Dict[str, Any], List[Any]],
@@ -69,6 +120,27 @@ class Injector:
         :return: A structure with the target parameter modified to the injection value
         :rtype: Union[Dict[str, Any], List[Any]]
         """
+        if EMBEDDED_JSON in path:
+            outer_path, text, document, inner_path = self._split_embedded_path(
+                structure=structure, path=path
+            )
+            # Removing the whole embedded document removes the string holding it
+            if not inner_path:
+                return self.remove_attribute_in_structure_by_path(
+                    structure=structure, path=outer_path
+                )
+
+            return self.modify_attribute_in_structure_by_path(
+                structure=structure,
+                path=outer_path,
+                value_to_inject=encode_embedded(
+                    text,
+                    self.remove_attribute_in_structure_by_path(
+                        structure=document, path=inner_path
+                    ),
+                ),
+            )
+
         # Take a deep copy to avoid accidentally changing a shared reference
         target_dict = copy.deepcopy(structure)
 
@@ -181,8 +253,261 @@ class Injector:
                 structure=structure, path=path[: index + 1]
             )
             for index in range(0, len(path), 1)
+            # Same payload as removing the string that holds the embedded document
+            if path[index] != EMBEDDED_JSON
         ]
 
+    def copy_path_in_structure(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        path: List[Union[str, int]],
+    ) -> Tuple[Union[Dict[str, Any], List[Any]], Union[Dict[str, Any], List[Any]]]:
+        """
+        Copies only the containers along a path in a structure
+
+        Shallow copies the root and each container on the way to the last key of the
+        path, everything else is shared with the source structure. This is much cheaper
+        than a deep copy for large templates, but callers must only modify the returned
+        parent container.
+
+        :param structure: The complex dict / list based structure to copy
+        :type structure: Union[Dict[str, Any], List[Any]]
+        :param path: List of keys to get to a primitive in a structure
+        :type path: List[Union[str, int]]
+        :return: The copied root and the copied container holding the last key of the path
+        :rtype: Tuple[Union[Dict[str, Any], List[Any]], Union[Dict[str, Any], List[Any]]]
+        """
+        target_dict = copy.copy(structure)
+
+        current = target_dict
+        for k in path[:-1]:
+            current[k] = copy.copy(current[k])
+            current = current[k]
+
+        return target_dict, current
+
+    def generate_value_payloads_by_path(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        path: List[Union[str, int]],
+        values_to_inject: List[Any],
+    ) -> List[Union[Dict[str, Any], List[Any]]]:
+        """
+        Generates a structure for each value injected into the same target parameter
+
+        The containers along the path are resolved once and only those are copied for
+        each value, siblings of the path are shared with the source structure.
+
+        :param structure: The complex dict / list based structure to modify
+        :type structure: Union[Dict[str, Any], List[Any]]
+        :param path: List of keys to get to a primitive in a structure
+        :type path: List[Union[str, int]]
+        :param values_to_inject: Values to inject into the target parameter, one per structure
+        :type values_to_inject: List[Any]
+        :return: A list of structures, one for each value
+        :rtype: List[Union[Dict[str, Any], List[Any]]]
+        """
+        if EMBEDDED_JSON in path:
+            outer_path, text, document, inner_path = self._split_embedded_path(
+                structure=structure, path=path
+            )
+            if inner_path:
+                documents = self.generate_value_payloads_by_path(
+                    structure=document,
+                    path=inner_path,
+                    values_to_inject=values_to_inject,
+                )
+            else:
+                documents = values_to_inject
+
+            return self.generate_value_payloads_by_path(
+                structure=structure,
+                path=outer_path,
+                values_to_inject=[encode_embedded(text, item) for item in documents],
+            )
+
+        containers = [structure]
+        for k in path[:-1]:
+            containers.append(containers[-1][k])
+
+        payloads = []
+        for value_to_inject in values_to_inject:
+            current = copy.copy(containers[-1])
+            current[path[-1]] = value_to_inject
+
+            # Rebuild the copied chain from the target back up to the root
+            for container, k in zip(reversed(containers[:-1]), reversed(path[:-1])):
+                parent = copy.copy(container)
+                parent[k] = current
+                current = parent
+
+            payloads.append(current)
+
+        return payloads
+
+    def rename_key_in_structure_by_path(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        path: List[Union[str, int]],
+        new_key: str,
+        keep_original: bool = False,
+    ) -> Union[Dict[str, Any], List[Any]]:
+        """
+        Renames a dictionary key in a structure
+
+        Only the containers along the path are copied, and the dictionary holding the key
+        is rebuilt so the renamed key keeps its original position. Renaming onto a key
+        that already exists in the dictionary raises a ValueError, as the rebuilt
+        dictionary would silently drop that sibling.
+
+        :param structure: The complex dict / list based structure to modify
+        :type structure: Union[Dict[str, Any], List[Any]]
+        :param path: List of keys to get to the dictionary key being renamed
+        :type path: List[Union[str, int]]
+        :param new_key: Name to give the key
+        :type new_key: str
+        :param keep_original: Keep the original key next to the new one, defaults to False
+        :type keep_original: bool, optional
+        :return: A structure with the target key renamed
+        :rtype: Union[Dict[str, Any], List[Any]]
+        """
+        if EMBEDDED_JSON in path:
+            outer_path, text, document, inner_path = self._split_embedded_path(
+                structure=structure, path=path
+            )
+            if not inner_path:
+                raise ValueError("The root of an embedded document has no key")
+
+            return self.modify_attribute_in_structure_by_path(
+                structure=structure,
+                path=outer_path,
+                value_to_inject=encode_embedded(
+                    text,
+                    self.rename_key_in_structure_by_path(
+                        structure=document,
+                        path=inner_path,
+                        new_key=new_key,
+                        keep_original=keep_original,
+                    ),
+                ),
+            )
+
+        if len(path) > 1:
+            target_dict, grandparent = self.copy_path_in_structure(
+                structure=structure, path=path[:-1]
+            )
+            parent = grandparent[path[-2]]
+        else:
+            target_dict, grandparent, parent = None, None, structure
+
+        if new_key != path[-1] and new_key in parent:
+            raise ValueError(f"Key {new_key!r} already exists next to {path[-1]!r}")
+
+        renamed = {}
+        for key, value in parent.items():
+            if key == path[-1]:
+                if keep_original:
+                    renamed[key] = value
+                renamed[new_key] = value
+            else:
+                renamed[key] = value
+
+        if grandparent is None:
+            return renamed
+
+        grandparent[path[-2]] = renamed
+        return target_dict
+
+    def add_attribute_in_structure_by_path(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        path: List[Union[str, int]],
+        key: str,
+        value_to_inject: Any,
+    ) -> Union[Dict[str, Any], List[Any]]:
+        """
+        Adds an attribute to a dictionary in a structure
+
+        Only the containers along the path are copied, and the injected value is deep
+        copied so payloads never share it.
+
+        :param structure: The complex dict / list based structure to modify
+        :type structure: Union[Dict[str, Any], List[Any]]
+        :param path: List of keys to get to the dictionary, empty for the root
+        :type path: List[Union[str, int]]
+        :param key: Key of the attribute to add
+        :type key: str
+        :param value_to_inject: Value of the attribute to add
+        :type value_to_inject: Any
+        :return: A structure with the attribute added to the target dictionary
+        :rtype: Union[Dict[str, Any], List[Any]]
+        """
+        if EMBEDDED_JSON in path:
+            outer_path, text, document, inner_path = self._split_embedded_path(
+                structure=structure, path=path
+            )
+            return self.modify_attribute_in_structure_by_path(
+                structure=structure,
+                path=outer_path,
+                value_to_inject=encode_embedded(
+                    text,
+                    self.add_attribute_in_structure_by_path(
+                        structure=document,
+                        path=inner_path,
+                        key=key,
+                        value_to_inject=value_to_inject,
+                    ),
+                ),
+            )
+
+        if not path:
+            target_dict = copy.copy(structure)
+            target_dict[key] = copy.deepcopy(value_to_inject)
+            return target_dict
+
+        target_dict, parent = self.copy_path_in_structure(
+            structure=structure, path=path
+        )
+        parent[path[-1]] = copy.copy(parent[path[-1]])
+        parent[path[-1]][key] = copy.deepcopy(value_to_inject)
+
+        return target_dict
+
+    def _split_embedded_path(
+        self,
+        structure: Union[Dict[str, Any], List[Any]],
+        path: List[Union[str, int]],
+    ) -> Tuple[
+        List[Union[str, int]],
+        str,
+        Union[Dict[str, Any], List[Any]],
+        List[Union[str, int]],
+    ]:
+        """
+        Splits a compound path at its first EMBEDDED_JSON key
+
+        Later EMBEDDED_JSON keys stay in the inner path, so documents embedded in
+        embedded documents are handled by recursing on the inner document.
+
+        :param structure: The complex dict / list based structure to walk
+        :type structure: Union[Dict[str, Any], List[Any]]
+        :param path: Path with at least one EMBEDDED_JSON key
+        :type path: List[Union[str, int]]
+        :return: Path to the string, the string, its parsed document and the path inside it
+        :rtype: Tuple[List[Union[str, int]], str, Union[Dict[str, Any], List[Any]], List[Union[str, int]]]
+        """
+        split = path.index(EMBEDDED_JSON)
+        outer_path = path[:split]
+
+        text = self.get_attribute_in_structure_by_path(
+            structure=structure, path=outer_path
+        )
+        document = parse_embedded(text)
+        if document is None:
+            raise ValueError(f"No embedded JSON document at {outer_path}")
+
+        return outer_path, text, document, path[split + 1 :]
+
     def _nest_value_in_dict(self, input, inject_value):
         result = {}
         if isinstance(input, dict):
@@ -0,0 +1,211 @@
+from jsonfuzzer.parser.injector import Injector
+
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Union
+import re
+
+LEAF_STRING = "string"
+LEAF_INTEGER = "integer"
+LEAF_FLOAT = "float"
+LEAF_BOOLEAN = "boolean"
+LEAF_NULL = "null"
+
+INT_RANGES = (
+    ("int8", -(2**7), 2**7 - 1),
+    ("int16", -(2**15), 2**15 - 1),
+    ("int32", -(2**31), 2**31 - 1),
+    ("int64", -(2**63), 2**63 - 1),
+)
+INT_RANGE_BIG = "bigint"
+
+# Criteria used to route a class of payloads to the leaves it is meaningful for
+PAYLOAD_CLASSES = {
+    "numeric": {"types": (LEAF_INTEGER, LEAF_FLOAT)},
+    "integer": {"types": (LEAF_INTEGER,)},
+    "string": {"types": (LEAF_STRING,)},
+    "boolean": {"types": (LEAF_BOOLEAN,)},
+    "email": {"types": (LEAF_STRING,), "email": True},
+    "uuid": {"types": (LEAF_STRING,), "uuid": True},
+    "date": {"types": (LEAF_STRING,), "date": True},
+}
+
+_EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+_UUID_PATTERN = re.compile(
+    r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+)
+_DATE_PATTERN = re.compile(
+    r"^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?)?$"
+)
+
+
+class LeafIndex:
+    """
+    Columnar index of leaf types and features
+
+    Stores one row per parameter path, with each feature held in its own column so
+    routing a payload class to matching leaves is a scan over a few compact arrays.
+    """
+
+    def __init__(self) -> None:
+        self.paths: List[List[Union[str, int]]] = []
+        self.types: List[str] = []
+        self.lengths = array("q")  # -1 for non string leaves
+        self.emails = bytearray()
+        self.uuids = bytearray()
+        self.dates = bytearray()
+        self.int_ranges: List[Optional[str]] = []
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    @classmethod
+    def build(
+        cls,
+        structure: Union[Dict[str, Any], List[Any]],
+        paramater_paths: List[List[Union[str, int]]],
+    ) -> "LeafIndex":
+        """
+        Builds an index from a structure and its parameter paths
+
+        :param structure: The complex dict / list based structure the paths were mapped from
+        :type structure: Union[Dict[str, Any], List[Any]]
+        :param paramater_paths: List of paths to each primitive in the structure
+        :type paramater_paths: List[List[Union[str, int]]]
+        :return: Index with a row for each parameter path
+        :rtype: LeafIndex
+        """
+        injector = Injector()
+        leaf_index = cls()
+
+        for param_path in paramater_paths:
+            leaf_index.add(
+                path=param_path,
+                value=injector.get_attribute_in_structure_by_path(
+                    structure=structure, path=param_path
+                ),
+            )
+
+        return leaf_index
+
+    def add(self, path: List[Union[str, int]], value: Any) -> None:
+        """
+        Appends a row for a single leaf
+
+        :param path: List of keys to get to the primitive in a structure
+        :type path: List[Union[str, int]]
+        :param value: The primitive found at the end of the path
+        :type value: Any
+        """
+        self.paths.append(path)
+        self.types.append(leaf_type(value))
+
+        if isinstance(value, str):
+            self.lengths.append(len(value))
+            # Cheap character checks first so the regexes only run on likely candidates
+            self.emails.append("@" in value and bool(_EMAIL_PATTERN.match(value)))
+            self.uuids.append(len(value) == 36 and bool(_UUID_PATTERN.match(value)))
+            self.dates.append(
+                len(value) >= 10
+                and value[4:5] == "-"
+                and bool(_DATE_PATTERN.match(value))
+            )
+        else:
+            self.lengths.append(-1)
+            self.emails.append(False)
+            self.uuids.append(False)
+            self.dates.append(False)
+
+        self.int_ranges.append(
+            int_range(value) if self.types[-1] == LEAF_INTEGER else None
+        )
+
+    def select(
+        self,
+        types: Optional[Sequence[str]] = None,
+        email: Optional[bool] = None,
+        uuid: Optional[bool] = None,
+        date: Optional[bool] = None,
+        int_ranges: Optional[Sequence[str]] = None,
+        min_length: Optional[int] = None,
+        max_length: Optional[int] = None,
+    ) -> List[List[Union[str, int]]]:
+        """
+        Returns the parameter paths of every leaf matching all of the given criteria
+
+        Criteria left as None are not applied.
+
+        :param types: Leaf types to accept, e.g. LEAF_STRING
+        :type types: Optional[Sequence[str]]
+        :param email: Require the leaf to look (or not look) like an email address
+        :type email: Optional[bool]
+        :param uuid: Require the leaf to look (or not look) like a UUID
+        :type uuid: Optional[bool]
+        :param date: Require the leaf to look (or not look) like an ISO 8601 date
+        :type date: Optional[bool]
+        :param int_ranges: Integer ranges to accept, e.g. "int8" or "bigint"
+        :type int_ranges: Optional[Sequence[str]]
+        :param min_length: Minimum string length
+        :type min_length: Optional[int]
+        :param max_length: Maximum string length
+        :type max_length: Optional[int]
+        :return: List of paths to each matching primitive
+        :rtype: List[List[Union[str, int]]]
+        """
+        rows = range(len(self.paths))
+
+        if types is not None:
+            rows = [row for row in rows if self.types[row] in types]
+        if email is not None:
+            rows = [row for row in rows if bool(self.emails[row]) == email]
+        if uuid is not None:
+            rows = [row for row in rows if bool(self.uuids[row]) == uuid]
+        if date is not None:
+            rows = [row for row in rows if bool(self.dates[row]) == date]
+        if int_ranges is not None:
+            rows = [row for row in rows if self.int_ranges[row] in int_ranges]
+        if min_length is not None:
+            rows = [row for row in rows if self.lengths[row] >= min_length]
+        if max_length is not None:
+            rows = [row for row in rows if 0 <= self.lengths[row] <= max_length]
+
+        return [self.paths[row] for row in rows]
+
+    def paths_for_payload_class(
+        self, payload_class: str
+    ) -> List[List[Union[str, int]]]:
+        """
+        Returns the parameter paths a named payload class should be injected into
+
+        :param payload_class: Name of a payload class in PAYLOAD_CLASSES
+        :type payload_class: str
+        :return: List of paths to each matching primitive
+        :rtype: List[List[Union[str, int]]]
+        """
+        try:
+            criteria = PAYLOAD_CLASSES[payload_class]
+        except KeyError:
+            raise ValueError(f"Unknown payload class: {payload_class}") from None
+
+        return self.select(**criteria)
+
+
+def leaf_type(value: Any) -> str:
+    # bool is a subclass of int so it has to be checked first
+    if isinstance(value, bool):
+        return LEAF_BOOLEAN
+    if isinstance(value, int):
+        return LEAF_INTEGER
+    if isinstance(value, float):
+        return LEAF_FLOAT
+    if value is None:
+        return LEAF_NULL
+
+    return LEAF_STRING
+
+
+def int_range(value: int) -> str:
+    for name, lower, upper in INT_RANGES:
+        if lower <= value <= upper:
+            return name
+
+    return INT_RANGE_BIG
@@ -0,0 +1,99 @@
+from jsonfuzzer.parser.embedded import EMBEDDED_JSON
+from jsonfuzzer.parser.injector import Injector
+from jsonfuzzer.parser.path_finder import PathFinder
+
+from typing import Any, Dict, List, NamedTuple, Tuple, Union
+import copy
+import json
+import re
+
+MARKER = "§"
+
+_MARKER_PATTERN = re.compile(
+    f"^(.*?){re.escape(MARKER)}(.*?){re.escape(MARKER)}(.*)$", re.DOTALL
+)
+
+
+class Marker(NamedTuple):
+    """
+    An insertion point marked in a template, e.g. "Bearer §token§" has the name token,
+    the prefix "Bearer " and an empty suffix
+    """
+
+    name: str
+    path: List[Union[str, int]]
+    prefix: str
+    suffix: str
+
+    def render(self, value: Any) -> Any:
+        """
+        Places a value between the text around the marker
+
+        :param value: Value to insert
+        :type value: Any
+        :return: The value itself when the marker was the whole string, else a string
+        :rtype: Any
+        """
+        if not self.prefix and not self.suffix:
+            return value
+
+        text = value if isinstance(value, str) else json.dumps(value)
+        return f"{self.prefix}{text}{self.suffix}"
+
+
+class MarkerFinder:
+    def __init__(self) -> None:
+        self.INJECTOR = Injector()
+        self.PATH_FINDER = PathFinder()
+
+    def is_marked(self, value: Any) -> bool:
+        return isinstance(value, str) and _MARKER_PATTERN.match(value) is not None
+
+    def find_markers(
+        self, structure: Union[Dict[str, Any], List[Any]]
+    ) -> Tuple[Union[Dict[str, Any], List[Any]], List[Marker]]:
+        """
+        Finds the markers in a template while mapping its paths
+
+        Only string values can be marked, with a single pair of MARKER each. Values in
+        embedded JSON documents are searched too, their markers have compound paths
+        through EMBEDDED_JSON and are stripped by re-encoding the document.
+
+        :param structure: Template with marked values, e.g. {"user": "§admin§"}
+        :type structure: Union[Dict[str, Any], List[Any]]
+        :return: A copy of the template with the markers stripped, e.g.
+            {"user": "admin"}, and the markers in path order
+        :rtype: Tuple[Union[Dict[str, Any], List[Any]], List[Marker]]
+        """
+        stripped = copy.deepcopy(structure)
+        markers = []
+
+        for param_path in self.PATH_FINDER.map_embedded_structure(structure=stripped):
+            value = self.INJECTOR.get_attribute_in_structure_by_path(
+                structure=stripped, path=param_path
+            )
+            match = _MARKER_PATTERN.match(value) if isinstance(value, str) else None
+            if match is None:
+                continue
+
+            prefix, name, suffix = match.groups()
+            markers.append(
+                Marker(name=name, path=param_path, prefix=prefix, suffix=suffix)
+            )
+
+            if EMBEDDED_JSON in param_path:
+                # The string holding the document has to be re-encoded
+                stripped = self.INJECTOR.generate_value_payloads_by_path(
+                    structure=stripped,
+                    path=param_path,
+                    values_to_inject=[f"{prefix}{name}{suffix}"],
+                )[0]
+                continue
+
+            # Strip the markers in place, the structure is our own copy
+            parent = self.INJECTOR.get_attribute_in_structure_by_path(
+                structure=stripped, path=param_path[:-1]
+            )
+            parent[param_path[-1]] = f"{prefix}{name}{suffix}"
+
+        return stripped, markers
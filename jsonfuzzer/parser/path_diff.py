@@ -0,0 +1,160 @@
+from jsonfuzzer.parser.path_finder import PathFinder
+
+from typing import Any, Dict, List, NamedTuple, Tuple, Union
+
+
+class PathDiff(NamedTuple):
+    added: List[List[Union[str, int]]]
+    removed: List[List[Union[str, int]]]
+    changed: List[List[Union[str, int]]]
+    paramater_paths: List[List[Union[str, int]]]
+
+    @property
+    def affected(self) -> List[List[Union[str, int]]]:
+        # The paths whose cases have to be generated and sent again
+        return self.added + self.changed
+
+
+def diff_structures(
+    old_structure: Union[Dict[str, Any], List[Any]],
+    old_paths: List[List[Union[str, int]]],
+    new_structure: Union[Dict[str, Any], List[Any]],
+) -> PathDiff:
+    """
+    Works out how the parameter paths changed between two versions of a template
+
+    Subtrees that compare equal are skipped without diffing them and their paths are
+    copied straight from old_paths, so only the parts of the template that differ are
+    visited. Equality is type strict like the comparison of single values, so 1, 1.0
+    and True are different values anywhere in the template, and dicts with their keys
+    in a different order are walked so the paths follow the new order.
+
+    :param old_structure: The previous template
+    :type old_structure: Union[Dict[str, Any], List[Any]]
+    :param old_paths: map_structure of the previous template, in its original order
+    :type old_paths: List[List[Union[str, int]]]
+    :param new_structure: The changed template
+    :type new_structure: Union[Dict[str, Any], List[Any]]
+    :return: Added, removed and changed paths plus the path table of the new template
+    :rtype: PathDiff
+    """
+    path_diff = PathDiff(added=[], removed=[], changed=[], paramater_paths=[])
+    _diff(
+        old=old_structure,
+        new=new_structure,
+        prefix=[],
+        old_paths=old_paths,
+        ranges=_prefix_ranges(old_paths),
+        path_diff=path_diff,
+    )
+
+    return path_diff
+
+
+def _diff(
+    old: Any,
+    new: Any,
+    prefix: List[Union[str, int]],
+    old_paths: List[List[Union[str, int]]],
+    ranges: Dict[Tuple[Union[str, int], ...], Tuple[int, int]],
+    path_diff: PathDiff,
+) -> None:
+    old_is_container = isinstance(old, (dict, list))
+    new_is_container = isinstance(new, (dict, list))
+
+    if not old_is_container and not new_is_container:
+        path_diff.paramater_paths.append(prefix)
+        if type(old) is not type(new) or old != new:
+            path_diff.changed.append(prefix)
+        return
+
+    if type(old) is not type(new):
+        # A primitive became a container or the other way round, or dict <-> list
+        path_diff.removed.extend(_old_subtree(prefix, old_paths, ranges))
+        added = _new_subtree(new, prefix)
+        path_diff.added.extend(added)
+        path_diff.paramater_paths.extend(added)
+        return
+
+    # Python equality is the cheap check, _strictly_equal only walks equal subtrees
+    if old == new and _strictly_equal(old, new):
+        path_diff.paramater_paths.extend(_old_subtree(prefix, old_paths, ranges))
+        return
+
+    if isinstance(new, dict):
+        for key, value in new.items():
+            if key in old:
+                _diff(old[key], value, prefix + [key], old_paths, ranges, path_diff)
+            else:
+                added = _new_subtree(value, prefix + [key])
+                path_diff.added.extend(added)
+                path_diff.paramater_paths.extend(added)
+        for key in old:
+            if key not in new:
+                path_diff.removed.extend(
+                    _old_subtree(prefix + [key], old_paths, ranges)
+                )
+        return
+
+    for index, value in enumerate(new):
+        if index < len(old):
+            _diff(old[index], value, prefix + [index], old_paths, ranges, path_diff)
+        else:
+            added = _new_subtree(value, prefix + [index])
+            path_diff.added.extend(added)
+            path_diff.paramater_paths.extend(added)
+    for index in range(len(new), len(old)):
+        path_diff.removed.extend(_old_subtree(prefix + [index], old_paths, ranges))
+
+
+def _strictly_equal(old: Any, new: Any) -> bool:
+    if old is new:
+        return True
+    if type(old) is not type(new):
+        return False
+
+    if isinstance(old, dict):
+        # Key order decides the order of the paths, so reordered keys aren't equal
+        return list(old) == list(new) and all(
+            _strictly_equal(value, new[key]) for key, value in old.items()
+        )
+    if isinstance(old, list):
+        return len(old) == len(new) and all(map(_strictly_equal, old, new))
+
+    return old == new
+
+
+def _prefix_ranges(
+    paramater_paths: List[List[Union[str, int]]],
+) -> Dict[Tuple[Union[str, int], ...], Tuple[int, int]]:
+    # Paths under one prefix are contiguous in depth first order, so a subtree is a
+    # single slice of the path table
+    ranges = {}
+    for position, param_path in enumerate(paramater_paths):
+        for length in range(len(param_path) + 1):
+            prefix = tuple(param_path[:length])
+            start, _ = ranges.get(prefix, (position, position))
+            ranges[prefix] = (start, position + 1)
+
+    return ranges
+
+
+def _old_subtree(
+    prefix: List[Union[str, int]],
+    old_paths: List[List[Union[str, int]]],
+    ranges: Dict[Tuple[Union[str, int], ...], Tuple[int, int]],
+) -> List[List[Union[str, int]]]:
+    start, end = ranges.get(tuple(prefix), (0, 0))
+    return old_paths[start:end]
+
+
+def _new_subtree(
+    value: Any, prefix: List[Union[str, int]]
+) -> List[List[Union[str, int]]]:
+    if not isinstance(value, (dict, list)):
+        return [prefix]
+
+    return [
+        prefix + param_path
+        for param_path in PathFinder().map_structure(structure=value)
+    ]
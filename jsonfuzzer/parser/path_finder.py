@@ -1,3 +1,6 @@
+from jsonfuzzer.parser.embedded import EMBEDDED_JSON, parse_embedded
+from jsonfuzzer.parser.leaf_index import LeafIndex
+
 from typing import Dict, Any, List, Union
 
 
@@ -35,6 +38,64 @@ class PathFinder:
 
         return stack  # Hit the bottom, we should save this chain
 
+    def map_embedded_structure(
+        self, structure: Union[List[Any], Dict[str, Any]]
+    ) -> List[List[Union[str, int]]]:
+        """
+        Map paths to primitives in structure, including those inside embedded JSON
+
+        Same as map_structure, but strings holding a JSON object or array, e.g.
+        {"payload": "{\"a\": 1}"}, are parsed and mapped too. Their paths are compound
+        paths with EMBEDDED_JSON where the string is decoded, ["payload", EMBEDDED_JSON,
+        "a"], which the Injector follows and re-encodes on injection. Documents embedded
+        in embedded documents are mapped as well.
+
+        :param structure: The complex dict / list based structure to map out
+        :type structure: Union[List[Any], Dict[str, Any]]
+        :return: List of lists containing the path to each primitive in the structure
+        :rtype: List[List[Union[str, int]]]
+        """
+        completed = []
+
+        for param_path in self.map_structure(structure=structure):
+            current = structure
+            for k in param_path:
+                current = current[k]
+
+            document = parse_embedded(current)
+            inner_paths = (
+                self.map_embedded_structure(structure=document)
+                if document is not None
+                else []
+            )
+
+            # An empty embedded document has nothing to fuzz inside, keep the string
+            if not inner_paths:
+                completed.append(param_path)
+                continue
+
+            completed.extend(
+                param_path + [EMBEDDED_JSON] + inner_path for inner_path in inner_paths
+            )
+
+        return completed
+
+    def map_leaf_index(self, structure: Union[List[Any], Dict[str, Any]]) -> LeafIndex:
+        """
+        Map paths to primitives in structure along with their types
+
+        Same as map_structure, but also records the type and a few cheap features of each
+        primitive in a columnar index so payload classes can be routed to matching paths.
+
+        :param structure: The complex dict / list based structure to map out
+        :type structure: Union[List[Any], Dict[str, Any]]
+        :return: Index with a row for each path to a primitive in the structure
+        :rtype: LeafIndex
+        """
+        return LeafIndex.build(
+            structure=structure, paramater_paths=self.map_structure(structure=structure)
+        )
+
     def _parse_list(
         self, input_list: List[Any], stack=None, depth=0
     ) -> List[List[Union[str, int]]]:
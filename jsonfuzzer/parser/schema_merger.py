@@ -0,0 +1,137 @@
+from jsonfuzzer.parser.leaf_index import leaf_type
+from jsonfuzzer.parser.path_finder import PathFinder
+
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Union
+
+TYPE_OBJECT = "object"
+TYPE_ARRAY = "array"
+
+
+class PathStats(NamedTuple):
+    path: List[Union[str, int]]
+    count: int
+    presence: float
+    types: Dict[str, int]
+
+
+class _Node:
+    __slots__ = ("count", "types", "examples", "fields", "items")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.types: Dict[str, int] = {}
+        self.examples: Dict[str, Any] = {}  # First value seen of each leaf type
+        self.fields: Dict[str, "_Node"] = {}
+        self.items: Dict[int, "_Node"] = {}
+
+
+class SchemaMerger:
+    """
+    Folds sample documents into a single union template, one document at a time
+
+    Every distinct path seen in any sample becomes a node that counts how many
+    documents had it and which JSON types it held, so memory grows with the number of
+    distinct paths rather than the number of samples. Lists are merged index by index.
+
+    template builds a structure holding every path seen, with the first value of the
+    most common type at each leaf, ready for PathFinder and Fuzzer. Where samples
+    disagree on whether a path is an object, array or primitive the most common
+    container wins, so the paths below it are still fuzzed.
+    """
+
+    def __init__(self) -> None:
+        self.documents = 0
+        self._root = _Node()
+
+    def add(self, document: Union[Dict[str, Any], List[Any]]) -> None:
+        """
+        Folds a single document into the union
+
+        :param document: A sample document
+        :type document: Union[Dict[str, Any], List[Any]]
+        """
+        self.documents += 1
+        _fold(self._root, document)
+
+    def add_all(self, documents: Iterable[Union[Dict[str, Any], List[Any]]]) -> None:
+        for document in documents:
+            self.add(document)
+
+    def stats(self) -> List[PathStats]:
+        """
+        Returns presence and type counts for every path that held a primitive
+
+        :return: One entry per path, in the order the paths were first seen
+        :rtype: List[PathStats]
+        """
+        return list(self._stats(self._root, []))
+
+    def template(self) -> Union[Dict[str, Any], List[Any]]:
+        """
+        Builds the union template
+
+        :return: A structure with every path seen in any sample
+        :rtype: Union[Dict[str, Any], List[Any]]
+        """
+        return _render(self._root)
+
+    def paramater_paths(self) -> List[List[Union[str, int]]]:
+        """
+        Maps the union template
+
+        :return: List of paths to each primitive in the union template
+        :rtype: List[List[Union[str, int]]]
+        """
+        return PathFinder().map_structure(structure=self.template())
+
+    def _stats(self, node: _Node, path: List[Union[str, int]]) -> Iterator[PathStats]:
+        if node.examples:
+            yield PathStats(
+                path=path,
+                count=node.count,
+                presence=node.count / self.documents if self.documents else 0.0,
+                types=dict(node.types),
+            )
+
+        for key, child in node.fields.items():
+            yield from self._stats(child, path + [key])
+        for index, child in node.items.items():
+            yield from self._stats(child, path + [index])
+
+
+def _fold(node: _Node, value: Any) -> None:
+    node.count += 1
+
+    if isinstance(value, dict):
+        node.types[TYPE_OBJECT] = node.types.get(TYPE_OBJECT, 0) + 1
+        for key, item in value.items():
+            child = node.fields.get(key)
+            if child is None:
+                child = node.fields[key] = _Node()
+            _fold(child, item)
+    elif isinstance(value, list):
+        node.types[TYPE_ARRAY] = node.types.get(TYPE_ARRAY, 0) + 1
+        for index, item in enumerate(value):
+            child = node.items.get(index)
+            if child is None:
+                child = node.items[index] = _Node()
+            _fold(child, item)
+    else:
+        value_type = leaf_type(value)
+        node.types[value_type] = node.types.get(value_type, 0) + 1
+        node.examples.setdefault(value_type, value)
+
+
+def _render(node: _Node) -> Any:
+    objects = node.types.get(TYPE_OBJECT, 0)
+    arrays = node.types.get(TYPE_ARRAY, 0)
+
+    if objects and objects >= arrays:
+        return {key: _render(child) for key, child in node.fields.items()}
+    if arrays:
+        return [_render(child) for _, child in sorted(node.items.items())]
+    if not node.examples:
+        return None
+
+    most_common = max(node.examples, key=lambda value_type: node.types[value_type])
+    return node.examples[most_common]
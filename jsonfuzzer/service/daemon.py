@@ -0,0 +1,413 @@
+from jsonfuzzer.core.fuzzer import Fuzzer, FuzzCase, payload_fingerprint
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import argparse
+import hashlib
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import threading
+
+# Compiled templates kept in memory, least recently used ones are dropped first
+MAX_TEMPLATES = 128
+
+# Case streams kept per template, one per combination of modes and value
+MAX_STREAMS_PER_TEMPLATE = 16
+
+BATCH_LIMIT = 1000
+
+# Refuse messages larger than this, a corrupt length prefix shouldn't allocate GBs
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+_LENGTH = struct.Struct(">I")
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledTemplate:
+    """
+    A template with everything derived from it that is worth keeping between requests
+
+    Holds the mapped parameter paths and, per combination of modes and value, a case
+    stream made of the generator to continue from and the cases generated since the
+    last offset asked for, so batches at increasing offsets generate each case once.
+    Streams can't be advanced by two threads at once, so batch holds a lock of this
+    template while generating and clients of other templates aren't held up.
+    """
+
+    def __init__(self, template_id: str, structure: Any, fuzzer: Fuzzer) -> None:
+        self.template_id = template_id
+        self.structure = structure
+        self.paramater_paths = fuzzer.PATH_FINDER.map_structure(structure=structure)
+        self._fuzzer = fuzzer
+        self._streams: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def batch(
+        self,
+        modes: Optional[List[str]],
+        value_to_inject: Any,
+        offset: int,
+        limit: int,
+    ) -> Tuple[List[FuzzCase], Optional[int]]:
+        """
+        Returns the cases at [offset, offset + limit) of a case stream
+
+        :param modes: Modes to generate, defaults to the same modes as generate_cases
+        :type modes: Optional[List[str]]
+        :param value_to_inject: Value for the modes in VALUE_MODES
+        :type value_to_inject: Any
+        :param offset: Position of the first case
+        :type offset: int
+        :param limit: Maximum number of cases
+        :type limit: int
+        :raises ValueError: If offset is not a non-negative integer or limit is below 1
+        :return: The cases, and the offset of the next batch or None at the end
+        :rtype: Tuple[List[FuzzCase], Optional[int]]
+        """
+        # Both come straight from clients, a bad one would corrupt the shared stream
+        if not _is_count(offset) or offset < 0:
+            raise ValueError(f"offset must be an integer of at least 0, got {offset!r}")
+        if not _is_count(limit) or limit < 1:
+            raise ValueError(f"limit must be an integer of at least 1, got {limit!r}")
+
+        with self._lock:
+            return self._batch(modes, value_to_inject, offset, limit)
+
+    def _batch(
+        self,
+        modes: Optional[List[str]],
+        value_to_inject: Any,
+        offset: int,
+        limit: int,
+    ) -> Tuple[List[FuzzCase], Optional[int]]:
+        key = payload_fingerprint([modes, value_to_inject])
+        stream = self._streams.get(key)
+
+        # Streams only keep cases from the last offset asked for, going back means
+        # generating again from the start, which yields the exact same cases
+        if stream is None or offset < stream[0]:
+            stream = self._streams[key] = [
+                0,
+                [],
+                self._fuzzer.generate_cases(
+                    structure=self.structure,
+                    paramater_paths=self.paramater_paths,
+                    modes=modes,
+                    value_to_inject=value_to_inject,
+                ),
+            ]
+            if len(self._streams) > MAX_STREAMS_PER_TEMPLATE:
+                self._streams.popitem(last=False)
+        self._streams.move_to_end(key)
+
+        base, cases, generator = stream
+        try:
+            while base + len(cases) < offset + limit:
+                case = next(generator, None)
+                if case is None:
+                    break
+                cases.append(case)
+        except ValueError:
+            del self._streams[key]  # e.g. an unknown mode, the generator is done for
+            raise
+
+        del cases[: offset - base]
+        stream[0] = offset
+
+        batch = cases[:limit]
+        next_offset = offset + len(batch) if len(batch) == limit else None
+
+        return batch, next_offset
+
+
+class TemplateCache:
+    """
+    Thread safe LRU cache of compiled templates keyed by the hash of the template
+    """
+
+    def __init__(self, max_templates: int = MAX_TEMPLATES) -> None:
+        self.max_templates = max_templates
+        self.FUZZER = Fuzzer()
+        self._templates: "OrderedDict[str, CompiledTemplate]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def load(self, structure: Union[Dict[str, Any], List[Any]]) -> CompiledTemplate:
+        template_id = template_id_for(structure)
+
+        with self._lock:
+            compiled = self._templates.get(template_id)
+            if compiled is not None:
+                self._templates.move_to_end(template_id)
+                return compiled
+
+        # Map outside the lock, two clients racing on a new template both just map it
+        compiled = CompiledTemplate(template_id, structure, self.FUZZER)
+
+        with self._lock:
+            compiled = self._templates.setdefault(template_id, compiled)
+            if len(self._templates) > self.max_templates:
+                self._templates.popitem(last=False)
+
+        return compiled
+
+    def get(self, template_id: str) -> Optional[CompiledTemplate]:
+        with self._lock:
+            compiled = self._templates.get(template_id)
+            if compiled is not None:
+                self._templates.move_to_end(template_id)
+            return compiled
+
+    def batch(
+        self,
+        compiled: CompiledTemplate,
+        modes: Optional[List[str]],
+        value_to_inject: Any,
+        offset: int,
+        limit: int,
+    ) -> Tuple[List[FuzzCase], Optional[int]]:
+        # The cache lock only guards the lookups, generation locks the template alone
+        return compiled.batch(modes, value_to_inject, offset, limit)
+
+
+class FuzzDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serves payload batches over a Unix socket from templates kept in memory
+
+    Every message in either direction is a 4 byte big endian length followed by that
+    many bytes of UTF-8 JSON, and a connection can carry any number of requests.
+    Requests are objects with an "op" of:
+
+    - "load" with a "template", replies with its "template_id" and path count
+    - "batch" with a "template" or a "template_id" plus optional "modes",
+      "value_to_inject", "offset" and "limit", replies with "cases" and the
+      "next_offset" to ask for, which is null once the cases run out
+    - "ping", replies with the number of cached templates
+    - "shutdown", stops the daemon after replying
+
+    Failed requests get a reply with an "error" message instead.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, max_templates: int = MAX_TEMPLATES) -> None:
+        self.socket_path = socket_path
+        self.templates = TemplateCache(max_templates=max_templates)
+
+        # A socket left behind by a daemon that didn't exit cleanly blocks the bind
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+        super().__init__(socket_path, _RequestHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    def handle_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        if not isinstance(message, dict):
+            raise ValueError("Requests must be JSON objects")
+
+        op = message.get("op")
+
+        if op == "ping":
+            return {"templates": len(self.templates)}
+        if op == "load":
+            compiled = self.templates.load(message["template"])
+            return {
+                "template_id": compiled.template_id,
+                "paths": len(compiled.paramater_paths),
+            }
+        if op == "batch":
+            if "template" in message:
+                compiled = self.templates.load(message["template"])
+            else:
+                compiled = self.templates.get(message["template_id"])
+                if compiled is None:
+                    raise ValueError(f"Unknown template_id: {message['template_id']}")
+
+            limit = message.get("limit", BATCH_LIMIT)
+            cases, next_offset = self.templates.batch(
+                compiled,
+                modes=message.get("modes"),
+                value_to_inject=message.get("value_to_inject"),
+                offset=message.get("offset", 0),
+                limit=min(limit, BATCH_LIMIT) if _is_count(limit) else limit,
+            )
+            return {
+                "template_id": compiled.template_id,
+                "cases": [case._asdict() for case in cases],
+                "next_offset": next_offset,
+            }
+        if op == "shutdown":
+            # shutdown waits for serve_forever to return, which needs this thread back
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {}
+
+        raise ValueError(f"Unknown op: {op}")
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        while True:
+            try:
+                message = receive_message(self.request)
+            except (ConnectionError, ValueError) as error:
+                logger.warning("Dropping connection: %s", error)
+                return
+            if message is None:
+                return
+
+            try:
+                reply = self.server.handle_message(message)
+            except (KeyError, TypeError, ValueError) as error:
+                reply = {"error": f"{type(error).__name__}: {error}"}
+
+            try:
+                send_message(self.request, reply)
+            except OSError:
+                return  # The client went away without waiting for the reply
+
+
+class DaemonClient:
+    """
+    Client for a FuzzDaemon, keeps one connection open for all requests
+    """
+
+    def __init__(self, socket_path: str) -> None:
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(socket_path)
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sends a request and waits for the reply
+
+        :param message: The request, see FuzzDaemon for the supported ops
+        :type message: Dict[str, Any]
+        :return: The reply
+        :rtype: Dict[str, Any]
+        """
+        send_message(self._socket, message)
+        reply = receive_message(self._socket)
+        if reply is None:
+            raise ConnectionError("Daemon closed the connection")
+        if "error" in reply:
+            raise ValueError(reply["error"])
+
+        return reply
+
+    def load(self, structure: Union[Dict[str, Any], List[Any]]) -> str:
+        return self.request({"op": "load", "template": structure})["template_id"]
+
+    def batches(
+        self,
+        template_id: str,
+        modes: Optional[List[str]] = None,
+        value_to_inject: Any = None,
+        limit: int = BATCH_LIMIT,
+    ) -> Iterator[List[FuzzCase]]:
+        """
+        Lazily requests every batch of cases for a loaded template
+
+        :param template_id: Id returned by load
+        :type template_id: str
+        :param modes: Modes to generate, defaults to the same modes as generate_cases
+        :type modes: Optional[List[str]], optional
+        :param value_to_inject: Value for the modes in VALUE_MODES, defaults to None
+        :type value_to_inject: Any, optional
+        :param limit: Cases per batch, defaults to BATCH_LIMIT
+        :type limit: int, optional
+        :return: Iterator over the batches
+        :rtype: Iterator[List[FuzzCase]]
+        """
+        offset = 0
+        while offset is not None:
+            reply = self.request(
+                {
+                    "op": "batch",
+                    "template_id": template_id,
+                    "modes": modes,
+                    "value_to_inject": value_to_inject,
+                    "offset": offset,
+                    "limit": limit,
+                }
+            )
+            if reply["cases"]:
+                yield [FuzzCase(**case) for case in reply["cases"]]
+            offset = reply["next_offset"]
+
+    def close(self) -> None:
+        self._socket.close()
+
+
+def template_id_for(structure: Union[Dict[str, Any], List[Any]]) -> str:
+    return hashlib.sha256(payload_fingerprint(structure).encode()).hexdigest()
+
+
+def send_message(connection: socket.socket, message: Dict[str, Any]) -> None:
+    data = json.dumps(message, default=repr).encode()
+    connection.sendall(_LENGTH.pack(len(data)) + data)
+
+
+def receive_message(connection: socket.socket) -> Optional[Dict[str, Any]]:
+    header = _receive_exactly(connection, _LENGTH.size)
+    if header is None:
+        return None
+
+    (length,) = _LENGTH.unpack(header)
+    if length > MAX_MESSAGE_SIZE:
+        raise ValueError(f"Message of {length} bytes exceeds {MAX_MESSAGE_SIZE}")
+
+    data = _receive_exactly(connection, length)
+    if data is None:
+        raise ConnectionError("Connection closed in the middle of a message")
+
+    return json.loads(data)
+
+
+def _receive_exactly(connection: socket.socket, size: int) -> Optional[bytes]:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = connection.recv(size - len(buffer))
+        if not chunk:
+            if buffer:
+                raise ConnectionError("Connection closed in the middle of a message")
+            return None
+        buffer += chunk
+
+    return bytes(buffer)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve payload batches over a socket")
+    parser.add_argument("socket_path", help="Path of the Unix socket to listen on")
+    parser.add_argument("--max-templates", type=int, default=MAX_TEMPLATES)
+    arguments = parser.parse_args()
+
+    with FuzzDaemon(arguments.socket_path, arguments.max_templates) as daemon:
+        daemon.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
+
+
+def _is_count(value: Any) -> bool:
+    # JSON true / false decode to bools, which are ints to Python
+    return isinstance(value, int) and not isinstance(value, bool)
@@ -0,0 +1,217 @@
+from jsonfuzzer.core.fuzzer import VALUE_MODES, FuzzCase, Fuzzer
+
+from typing import Any, Dict, Iterator, List, Sequence, Tuple, Union
+import hashlib
+import json
+
+CANARY_PLACEHOLDER = "{canary}"
+CANARY_PREFIX = "jfz"
+CANARY_DIGEST_SIZE = 6
+
+
+class AhoCorasick:
+    """
+    Multi-pattern byte matcher
+
+    Builds a trie of all patterns with failure links so every pattern is found in a
+    single pass over the input, regardless of how many patterns there are.
+    """
+
+    def __init__(self, patterns: Sequence[bytes]) -> None:
+        self.patterns = list(patterns)
+        self._goto: List[Dict[int, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[int]] = [[]]
+
+        for pattern_index, pattern in enumerate(self.patterns):
+            state = 0
+            for byte in pattern:
+                next_state = self._goto[state].get(byte)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][byte] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                state = next_state
+            self._outputs[state].append(pattern_index)
+
+        # Breadth first so every failure link points at an already linked state
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for byte, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fail = self._fail[state]
+                while fail and byte not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(byte, 0)
+                self._outputs[next_state].extend(self._outputs[self._fail[next_state]])
+
+    def scan(self, data: bytes) -> List[Tuple[int, int]]:
+        """
+        Finds every occurrence of every pattern
+
+        :param data: Bytes to scan
+        :type data: bytes
+        :return: List of (start offset, pattern index) pairs in order of their end offset
+        :rtype: List[Tuple[int, int]]
+        """
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        matches = []
+        state = 0
+
+        for offset, byte in enumerate(data):
+            while state and byte not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(byte, 0)
+
+            for pattern_index in outputs[state]:
+                matches.append(
+                    (offset + 1 - len(self.patterns[pattern_index]), pattern_index)
+                )
+
+        return matches
+
+
+class CanaryRegistry:
+    """
+    Tags payloads with canaries and maps canaries found in responses back to paths
+
+    Each canary is derived from the mode and path it was injected by, so the same
+    template always produces the same canaries.
+    """
+
+    def __init__(self) -> None:
+        self._origins: Dict[str, Tuple[str, List[Union[str, int]]]] = {}
+        self._matcher = None
+
+    def __len__(self) -> int:
+        return len(self._origins)
+
+    def canary_for(self, mode: str, path: List[Union[str, int]]) -> str:
+        """
+        Returns the canary for a mode and path, registering it as live
+
+        :param mode: The fuzzing mode
+        :type mode: str
+        :param path: The fuzzed parameter path
+        :type path: List[Union[str, int]]
+        :return: A short alphanumeric canary
+        :rtype: str
+        """
+        digest = hashlib.blake2b(
+            json.dumps([mode, path]).encode(), digest_size=CANARY_DIGEST_SIZE
+        ).hexdigest()
+        canary = CANARY_PREFIX + digest
+
+        if canary not in self._origins:
+            self._origins[canary] = (mode, path)
+            self._matcher = None  # Rebuilt with the new canary on the next scan
+
+        return canary
+
+    def template_value(
+        self, value_to_inject: Any, mode: str, path: List[Union[str, int]]
+    ) -> Any:
+        """
+        Replaces CANARY_PLACEHOLDER in a value with the canary for a mode and path
+
+        Strings nested in lists and dictionaries are templated too, other values are
+        returned unchanged.
+
+        :param value_to_inject: Value containing CANARY_PLACEHOLDER
+        :type value_to_inject: Any
+        :param mode: The fuzzing mode
+        :type mode: str
+        :param path: The fuzzed parameter path
+        :type path: List[Union[str, int]]
+        :return: The templated value
+        :rtype: Any
+        """
+        if isinstance(value_to_inject, str):
+            if CANARY_PLACEHOLDER not in value_to_inject:
+                return value_to_inject
+            return value_to_inject.replace(
+                CANARY_PLACEHOLDER, self.canary_for(mode=mode, path=path)
+            )
+        if isinstance(value_to_inject, list):
+            return [self.template_value(item, mode, path) for item in value_to_inject]
+        if isinstance(value_to_inject, dict):
+            return {
+                key: self.template_value(value, mode, path)
+                for key, value in value_to_inject.items()
+            }
+
+        return value_to_inject
+
+    def generate_cases(
+        self,
+        fuzzer: Fuzzer,
+        structure: Union[Dict[str, Any], List[Any]],
+        paramater_paths: List[List[Union[str, int]]],
+        value_to_inject: Any,
+        modes: Sequence[str] = VALUE_MODES,
+    ) -> Iterator[FuzzCase]:
+        """
+        Generates cases whose injected value carries the canary for its mode and path
+
+        :param fuzzer: Fuzzer used to generate the payloads
+        :type fuzzer: Fuzzer
+        :param structure: The complex dict / list based structure to fuzz
+        :type structure: Union[Dict[str, Any], List[Any]]
+        :param paramater_paths: List of paths to each primitive in the structure
+        :type paramater_paths: List[List[Union[str, int]]]
+        :param value_to_inject: Value containing CANARY_PLACEHOLDER
+        :type value_to_inject: Any
+        :param modes: Modes that inject a value, defaults to VALUE_MODES
+        :type modes: Sequence[str], optional
+        :return: Iterator over the generated cases
+        :rtype: Iterator[FuzzCase]
+        """
+        for mode in modes:
+            for param_path in paramater_paths:
+                # Don't register canaries for paths the mode generates nothing for
+                if not fuzzer.count_payloads_for_path(
+                    structure=structure, mode=mode, path=param_path
+                ):
+                    continue
+
+                payloads = fuzzer.generate_payloads_for_path(
+                    structure=structure,
+                    mode=mode,
+                    path=param_path,
+                    value_to_inject=self.template_value(
+                        value_to_inject, mode=mode, path=param_path
+                    ),
+                )
+
+                for variant, payload in enumerate(payloads):
+                    yield FuzzCase(
+                        mode=mode, path=param_path, variant=variant, payload=payload
+                    )
+
+    def scan(self, data: Union[bytes, str]) -> List[Tuple[str, List[Union[str, int]]]]:
+        """
+        Finds every live canary reflected in a response or log
+
+        :param data: Response body or log contents
+        :type data: Union[bytes, str]
+        :return: Unique (mode, path) origins of the canaries found, in order of appearance
+        :rtype: List[Tuple[str, List[Union[str, int]]]]
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8", errors="replace")
+
+        if self._matcher is None:
+            self._matcher = AhoCorasick([canary.encode() for canary in self._origins])
+
+        canaries = list(self._origins)
+        hits = []
+        seen = set()
+        for _, pattern_index in self._matcher.scan(data):
+            if pattern_index not in seen:
+                seen.add(pattern_index)
+                hits.append(self._origins[canaries[pattern_index]])
+
+        return hits
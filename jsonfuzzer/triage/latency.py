@@ -0,0 +1,204 @@
+from jsonfuzzer.core.fuzzer import FuzzCase
+from jsonfuzzer.harness.harness import HarnessResult
+
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple, Union
+import math
+
+QUANTILES = (0.5, 0.99)
+
+# A path is flagged when its quantile is this many times the baseline quantile
+DEVIATION_FACTOR = 2.0
+
+# Estimates from fewer samples than this are too noisy to flag
+MIN_SAMPLES = 50
+
+BASELINE = "baseline"
+
+
+class P2Quantile:
+    """
+    Streaming quantile estimator using the P-square algorithm
+
+    Tracks a single quantile with five markers whose heights are adjusted with a
+    piecewise parabolic fit as samples arrive, so memory is constant no matter how many
+    samples are observed.
+    """
+
+    def __init__(self, quantile: float) -> None:
+        if not 0 < quantile < 1:
+            raise ValueError("quantile must be within (0, 1)")
+
+        self.quantile = quantile
+        self.count = 0
+        self._heights: List[float] = []
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0, 2 * quantile, 4 * quantile, 2 + 2 * quantile, 4]
+        self._increments = [0, quantile / 2, quantile, (1 + quantile) / 2, 1]
+
+    def add(self, sample: float) -> None:
+        self.count += 1
+        heights = self._heights
+
+        if len(heights) < 5:
+            heights.append(sample)
+            heights.sort()
+            return
+
+        if sample < heights[0]:
+            heights[0] = sample
+            cell = 0
+        elif sample >= heights[4]:
+            heights[4] = sample
+            cell = 3
+        else:
+            cell = 0
+            while sample >= heights[cell + 1]:
+                cell += 1
+
+        for marker in range(cell + 1, 5):
+            self._positions[marker] += 1
+        for marker in range(5):
+            self._desired[marker] += self._increments[marker]
+
+        for marker in range(1, 4):
+            self._adjust(marker)
+
+    def value(self) -> Optional[float]:
+        if not self._heights:
+            return None
+
+        if len(self._heights) < 5 or self.count < 5:
+            rank = max(0, math.ceil(self.quantile * len(self._heights)) - 1)
+            return self._heights[rank]
+
+        return self._heights[2]
+
+    def _adjust(self, marker: int) -> None:
+        heights, positions = self._heights, self._positions
+        offset = self._desired[marker] - positions[marker]
+
+        if not (
+            (offset >= 1 and positions[marker + 1] - positions[marker] > 1)
+            or (offset <= -1 and positions[marker - 1] - positions[marker] < -1)
+        ):
+            return
+
+        step = 1 if offset > 0 else -1
+
+        # Piecewise parabolic prediction, falling back to linear if it overshoots
+        height = heights[marker] + step / (
+            positions[marker + 1] - positions[marker - 1]
+        ) * (
+            (positions[marker] - positions[marker - 1] + step)
+            * (heights[marker + 1] - heights[marker])
+            / (positions[marker + 1] - positions[marker])
+            + (positions[marker + 1] - positions[marker] - step)
+            * (heights[marker] - heights[marker - 1])
+            / (positions[marker] - positions[marker - 1])
+        )
+        if not heights[marker - 1] < height < heights[marker + 1]:
+            height = heights[marker] + step * (
+                heights[marker + step] - heights[marker]
+            ) / (positions[marker + step] - positions[marker])
+
+        heights[marker] = height
+        positions[marker] += step
+
+
+class LatencyTracker:
+    """
+    Fixed memory latency quantiles per (mode, path)
+
+    Each key holds one P2Quantile per tracked quantile. Latencies of the unmodified
+    template are tracked under a baseline key, and keys whose quantile drifts well
+    above the baseline are reported as deviations.
+    """
+
+    def __init__(
+        self,
+        quantiles: Sequence[float] = QUANTILES,
+        deviation_factor: float = DEVIATION_FACTOR,
+        min_samples: int = MIN_SAMPLES,
+    ) -> None:
+        self.quantiles = tuple(quantiles)
+        self.deviation_factor = deviation_factor
+        self.min_samples = min_samples
+        self._estimators: Dict[Hashable, Tuple[P2Quantile, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._estimators)
+
+    def observe(
+        self, mode: str, path: Sequence[Union[str, int]], seconds: float
+    ) -> None:
+        self._add((mode, tuple(path)), seconds)
+
+    def observe_baseline(self, seconds: float) -> None:
+        self._add(BASELINE, seconds)
+
+    def observe_result(self, result: HarnessResult) -> None:
+        # Bare payloads carry no mode or path to attribute the latency to
+        if isinstance(result.case, FuzzCase):
+            self.observe(result.case.mode, result.case.path, result.duration)
+
+    def quantile(
+        self, mode: str, path: Sequence[Union[str, int]], quantile: float
+    ) -> Optional[float]:
+        return self._value((mode, tuple(path)), quantile)
+
+    def baseline_quantile(self, quantile: float) -> Optional[float]:
+        return self._value(BASELINE, quantile)
+
+    def deviations(
+        self, quantile: Optional[float] = None
+    ) -> List[Tuple[str, List[Union[str, int]], float, float]]:
+        """
+        Lists the (mode, path) keys whose quantile deviates from the baseline
+
+        :param quantile: Quantile to compare, defaults to the highest tracked quantile
+        :type quantile: Optional[float]
+        :return: (mode, path, estimate, baseline estimate) for each deviating key,
+            largest ratio first
+        :rtype: List[Tuple[str, List[Union[str, int]], float, float]]
+        """
+        if quantile is None:
+            quantile = max(self.quantiles)
+
+        baseline = self.baseline_quantile(quantile)
+        baseline_estimators = self._estimators.get(BASELINE)
+        if (
+            baseline is None
+            or baseline_estimators[0].count < self.min_samples
+            or baseline <= 0
+        ):
+            return []
+
+        deviations = []
+        for key, estimators in self._estimators.items():
+            if key == BASELINE or estimators[0].count < self.min_samples:
+                continue
+
+            estimate = estimators[self.quantiles.index(quantile)].value()
+            if estimate >= baseline * self.deviation_factor:
+                deviations.append((key[0], list(key[1]), estimate, baseline))
+
+        return sorted(
+            deviations, key=lambda deviation: deviation[2] / deviation[3], reverse=True
+        )
+
+    def _add(self, key: Hashable, seconds: float) -> None:
+        estimators = self._estimators.get(key)
+        if estimators is None:
+            estimators = self._estimators[key] = tuple(
+                P2Quantile(quantile) for quantile in self.quantiles
+            )
+
+        for estimator in estimators:
+            estimator.add(seconds)
+
+    def _value(self, key: Hashable, quantile: float) -> Optional[float]:
+        estimators = self._estimators.get(key)
+        if estimators is None:
+            return None
+
+        return estimators[self.quantiles.index(quantile)].value()
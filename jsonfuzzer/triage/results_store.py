@@ -0,0 +1,296 @@
+from jsonfuzzer.harness.harness import HarnessResult
+from jsonfuzzer.triage.triage import (
+    response_signature,
+    result_signature,
+    signature_key,
+)
+from jsonfuzzer.util.util import Util
+
+from typing import Any, List, NamedTuple, Optional, Tuple, Union
+import json
+import sqlite3
+
+# Rows buffered before they are written in a single transaction
+BATCH_SIZE = 5000
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS results (
+        id INTEGER PRIMARY KEY,
+        mode TEXT,
+        path TEXT,
+        path_pattern TEXT,
+        variant INTEGER,
+        corpus TEXT,
+        corpus_index INTEGER,
+        status INTEGER,
+        outcome TEXT,
+        signature TEXT,
+        latency REAL,
+        payload TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS results_path ON results (path)",
+    "CREATE INDEX IF NOT EXISTS results_path_pattern ON results (path_pattern, status)",
+    "CREATE INDEX IF NOT EXISTS results_mode ON results (mode)",
+    "CREATE INDEX IF NOT EXISTS results_status ON results (status)",
+    "CREATE INDEX IF NOT EXISTS results_signature ON results (signature)",
+)
+
+_COLUMNS = (
+    "mode",
+    "path",
+    "path_pattern",
+    "variant",
+    "corpus",
+    "corpus_index",
+    "status",
+    "outcome",
+    "signature",
+    "latency",
+    "payload",
+)
+
+_INSERT = (
+    f"INSERT INTO results ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _COLUMNS)})"
+)
+
+
+class StoredResult(NamedTuple):
+    mode: Optional[str]
+    path: Optional[List[Union[str, int]]]
+    path_pattern: Optional[str]
+    variant: Optional[int]
+    corpus: Optional[str]
+    corpus_index: Optional[int]
+    status: Optional[int]
+    outcome: Optional[str]
+    signature: str
+    latency: Optional[float]
+    payload: Any
+
+
+class ResultsStore:
+    """
+    SQLite database of delivered cases and their outcomes
+
+    Rows are buffered and written batch_size at a time with a single executemany in
+    one transaction, which reuses one prepared statement for the whole batch. The
+    database runs in WAL mode so it can be queried while a campaign is still writing.
+    Paths are stored exactly as JSON and as a pattern with list indexes replaced by
+    *, e.g. hobbies[*].name, and both are indexed along with the mode, status and
+    signature. Signatures are the bucket keys Triage uses.
+    """
+
+    def __init__(
+        self, path: str, batch_size: int = BATCH_SIZE, store_payloads: bool = True
+    ) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.store_payloads = store_payloads
+        self._rows: List[Tuple[Any, ...]] = []
+
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps the database consistent without syncing every commit
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def add_response(
+        self,
+        case: Any,
+        status: int,
+        body: Union[bytes, str],
+        latency: Optional[float] = None,
+    ) -> None:
+        """
+        Records the response to a delivered case
+
+        :param case: The FuzzCase or bare payload that was delivered
+        :type case: Any
+        :param status: Response status code
+        :type status: int
+        :param body: Response body
+        :type body: Union[bytes, str]
+        :param latency: Seconds the request took, defaults to None
+        :type latency: Optional[float], optional
+        """
+        self._add(
+            case=case,
+            status=status,
+            outcome=None,
+            signature=signature_key(response_signature(status=status, body=body)),
+            latency=latency,
+        )
+
+    def add_result(self, result: HarnessResult) -> None:
+        """
+        Records the outcome of a case run by the harness, for use as the on_result hook
+
+        :param result: Outcome of a harness run
+        :type result: HarnessResult
+        """
+        self._add(
+            case=result.case,
+            status=None,
+            outcome=result.outcome,
+            signature=signature_key(result_signature(result)),
+            latency=result.duration,
+        )
+
+    def query(
+        self,
+        path: Optional[List[Union[str, int]]] = None,
+        path_pattern: Optional[str] = None,
+        mode: Optional[str] = None,
+        status: Optional[int] = None,
+        outcome: Optional[str] = None,
+        signature: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[StoredResult]:
+        """
+        Returns the results matching all of the given criteria, in insertion order
+
+        Criteria left as None are not applied.
+
+        :param path: Exact path of the case
+        :type path: Optional[List[Union[str, int]]]
+        :param path_pattern: Path with list indexes as *, e.g. hobbies[*].name
+        :type path_pattern: Optional[str]
+        :param mode: Mode the case was generated by
+        :type mode: Optional[str]
+        :param status: Response status code
+        :type status: Optional[int]
+        :param outcome: Harness outcome
+        :type outcome: Optional[str]
+        :param signature: Triage bucket key
+        :type signature: Optional[str]
+        :param limit: Maximum number of results, defaults to None for all
+        :type limit: Optional[int]
+        :return: Matching results
+        :rtype: List[StoredResult]
+        """
+        where, parameters = self._where(
+            path=path,
+            path_pattern=path_pattern,
+            mode=mode,
+            status=status,
+            outcome=outcome,
+            signature=signature,
+        )
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM results{where} ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+
+        return [
+            StoredResult(
+                mode=row[0],
+                path=None if row[1] is None else json.loads(row[1]),
+                path_pattern=row[2],
+                variant=row[3],
+                corpus=row[4],
+                corpus_index=row[5],
+                status=row[6],
+                outcome=row[7],
+                signature=row[8],
+                latency=row[9],
+                payload=None if row[10] is None else json.loads(row[10]),
+            )
+            for row in self._connection.execute(sql, parameters)
+        ]
+
+    def count(self, **criteria: Any) -> int:
+        """
+        Counts the results matching the same criteria as query
+
+        :return: Number of matching results
+        :rtype: int
+        """
+        where, parameters = self._where(**criteria)
+
+        return self._connection.execute(
+            f"SELECT COUNT(*) FROM results{where}", parameters
+        ).fetchone()[0]
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+
+        with self._connection:
+            self._connection.executemany(_INSERT, self._rows)
+        self._rows = []
+
+    def close(self) -> None:
+        self.flush()
+        self._connection.close()
+
+    def _add(
+        self,
+        case: Any,
+        status: Optional[int],
+        outcome: Optional[str],
+        signature: str,
+        latency: Optional[float],
+    ) -> None:
+        path = getattr(case, "path", None)
+        payload = getattr(case, "payload", case)
+
+        self._rows.append(
+            (
+                getattr(case, "mode", None),
+                None if path is None else json.dumps(path),
+                None if path is None else Util.format_path(path, wildcard=True),
+                getattr(case, "variant", None),
+                getattr(case, "corpus", None),
+                getattr(case, "corpus_index", None),
+                status,
+                outcome,
+                signature,
+                latency,
+                json.dumps(payload, default=repr) if self.store_payloads else None,
+            )
+        )
+
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def _where(
+        self,
+        path: Optional[List[Union[str, int]]] = None,
+        path_pattern: Optional[str] = None,
+        mode: Optional[str] = None,
+        status: Optional[int] = None,
+        outcome: Optional[str] = None,
+        signature: Optional[str] = None,
+    ) -> Tuple[str, List[Any]]:
+        # Buffered rows have to be visible to queries
+        self.flush()
+
+        criteria = {
+            "path": None if path is None else json.dumps(path),
+            "path_pattern": path_pattern,
+            "mode": mode,
+            "status": status,
+            "outcome": outcome,
+            "signature": signature,
+        }
+        criteria = {
+            column: value for column, value in criteria.items() if value is not None
+        }
+        if not criteria:
+            return "", []
+
+        return (
+            " WHERE " + " AND ".join(f"{column} = ?" for column in criteria),
+            list(criteria.values()),
+        )
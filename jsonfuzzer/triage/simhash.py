@@ -0,0 +1,183 @@
+from functools import lru_cache
+from typing import Dict, Hashable, List, Optional, Sequence, Union
+import hashlib
+import re
+
+FINGERPRINT_BITS = 64
+
+# Fingerprints within this many differing bits are considered the same response
+HAMMING_THRESHOLD = 6
+
+MAX_FINGERPRINTS_PER_PATH = 1024
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# Tokens containing digits are collapsed so counters, timestamps and ids don't
+# change the fingerprint
+_DIGITS_PATTERN = re.compile(r"\w*\d\w*")
+
+
+@lru_cache(maxsize=65536)
+def _token_hash(token: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(token.encode(), digest_size=FINGERPRINT_BITS // 8).digest(),
+        "big",
+    )
+
+
+def simhash(body: Union[bytes, str]) -> int:
+    """
+    Computes a 64 bit SimHash fingerprint of a response body
+
+    Similar bodies produce fingerprints that differ in only a few bits, so a changed
+    timestamp or request id barely moves the fingerprint.
+
+    :param body: Response body
+    :type body: Union[bytes, str]
+    :return: The fingerprint
+    :rtype: int
+    """
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+
+    weights = [0] * FINGERPRINT_BITS
+    for token in _TOKEN_PATTERN.findall(_DIGITS_PATTERN.sub("0", body.lower())):
+        token_hash = _token_hash(token)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if token_hash >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+
+    return fingerprint
+
+
+def hamming_distance(first: int, second: int) -> int:
+    return bin(first ^ second).count("1")
+
+
+class _FingerprintIndex:
+    """
+    Finds stored fingerprints within a Hamming threshold without a linear scan
+
+    Fingerprints are split into threshold + 1 bands. Two fingerprints that differ in
+    at most threshold bits must have at least one identical band (pigeonhole), so only
+    fingerprints sharing a band with the query are compared.
+    """
+
+    def __init__(self, threshold: int, capacity: int) -> None:
+        self.threshold = threshold
+        self.capacity = capacity
+        self.size = 0
+
+        band_count = threshold + 1
+        band_width = -(-FINGERPRINT_BITS // band_count)
+        self._bands = [
+            (offset, (1 << min(band_width, FINGERPRINT_BITS - offset)) - 1)
+            for offset in range(0, FINGERPRINT_BITS, band_width)
+        ]
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in self._bands]
+
+    def add(self, fingerprint: int) -> None:
+        if self.size >= self.capacity or self.contains(fingerprint, distance=0):
+            return
+
+        for (offset, mask), table in zip(self._bands, self._tables):
+            table.setdefault(fingerprint >> offset & mask, []).append(fingerprint)
+        self.size += 1
+
+    def contains(self, fingerprint: int, distance: Optional[int] = None) -> bool:
+        if distance is None:
+            distance = self.threshold
+
+        for (offset, mask), table in zip(self._bands, self._tables):
+            for candidate in table.get(fingerprint >> offset & mask, ()):
+                if hamming_distance(fingerprint, candidate) <= distance:
+                    return True
+
+        return False
+
+
+class AnomalyDetector:
+    """
+    Streaming detector for responses that differ from the known normal responses
+
+    Normal fingerprints are kept per fuzzed path, plus a template baseline shared by
+    every path. A response is anomalous when no normal fingerprint for its path or the
+    baseline is within the Hamming threshold. Memory is capped per path.
+    """
+
+    def __init__(
+        self,
+        threshold: int = HAMMING_THRESHOLD,
+        max_fingerprints_per_path: int = MAX_FINGERPRINTS_PER_PATH,
+    ) -> None:
+        self.threshold = threshold
+        self.max_fingerprints_per_path = max_fingerprints_per_path
+        self._indexes: Dict[Hashable, _FingerprintIndex] = {}
+
+    def add_baseline(self, body: Union[bytes, str]) -> None:
+        """
+        Records a normal response to the unmodified template, shared by all paths
+
+        :param body: Response body
+        :type body: Union[bytes, str]
+        """
+        self._index_for(None).add(simhash(body))
+
+    def add_normal(
+        self, path: Sequence[Union[str, int]], body: Union[bytes, str]
+    ) -> None:
+        """
+        Records a response known to be normal for a fuzzed path
+
+        :param path: The fuzzed parameter path
+        :type path: Sequence[Union[str, int]]
+        :param body: Response body
+        :type body: Union[bytes, str]
+        """
+        self._index_for(tuple(path)).add(simhash(body))
+
+    def is_anomalous(
+        self,
+        path: Sequence[Union[str, int]],
+        body: Union[bytes, str],
+        learn: bool = False,
+    ) -> bool:
+        """
+        Checks if a response is unlike every normal response for its path
+
+        :param path: The fuzzed parameter path
+        :type path: Sequence[Union[str, int]]
+        :param body: Response body
+        :type body: Union[bytes, str]
+        :param learn: Record the response as normal for the path when it is not
+            anomalous, defaults to False
+        :type learn: bool, optional
+        :return: True when the response is beyond the threshold of every normal response
+        :rtype: bool
+        """
+        fingerprint = simhash(body)
+        path_index = self._indexes.get(tuple(path))
+        baseline_index = self._indexes.get(None)
+
+        anomalous = not any(
+            index is not None and index.contains(fingerprint)
+            for index in (path_index, baseline_index)
+        )
+
+        if learn and not anomalous:
+            self._index_for(tuple(path)).add(fingerprint)
+
+        return anomalous
+
+    def _index_for(self, key: Hashable) -> _FingerprintIndex:
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = _FingerprintIndex(
+                threshold=self.threshold, capacity=self.max_fingerprints_per_path
+            )
+
+        return index
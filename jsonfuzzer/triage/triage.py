@@ -0,0 +1,170 @@
+from jsonfuzzer.core.fuzzer import payload_fingerprint
+from jsonfuzzer.harness.harness import OUTCOME_OK, HarnessResult
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+import hashlib
+import re
+
+# Number of innermost stack frames that make up an exception signature
+SIGNATURE_FRAMES = 3
+
+# Only the start of a response body is normalised, error messages come first
+ERROR_TEXT_LIMIT = 512
+
+_NORMALISERS = (
+    (
+        re.compile(
+            r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+        ),
+        "<uuid>",
+    ),
+    (re.compile(r"0x[0-9a-fA-F]+"), "<hex>"),
+    (re.compile(r"\d+(\.\d+)?"), "<n>"),
+    (re.compile(r"'[^']*'|\"[^\"]*\""), "<str>"),
+    (re.compile(r"\s+"), " "),
+)
+
+
+class Bucket:
+    """
+    All outcomes sharing one signature
+
+    Keeps the smallest payload seen, measured by its serialised size, together with
+    the mode and path that produced it.
+    """
+
+    def __init__(self, key: str, signature: Tuple[Any, ...]) -> None:
+        self.key = key
+        self.signature = signature
+        self.count = 0
+        self.mode: Optional[str] = None
+        self.path: Optional[List[Union[str, int]]] = None
+        self.payload: Any = None
+        self.payload_size: Optional[int] = None
+
+    def add(self, case: Any) -> None:
+        self.count += 1
+
+        payload = getattr(case, "payload", case)
+        payload_size = len(payload_fingerprint(payload))
+        if self.payload_size is None or payload_size < self.payload_size:
+            self.mode = getattr(case, "mode", None)
+            self.path = getattr(case, "path", None)
+            self.payload = payload
+            self.payload_size = payload_size
+
+    def __str__(self) -> str:
+        return (
+            f"{self.key} x{self.count} mode={self.mode} path={self.path} "
+            f"signature={self.signature} payload={payload_fingerprint(self.payload)}"
+        )
+
+
+class Triage:
+    """
+    Groups fuzzing outcomes into buckets of likely identical bugs
+
+    Every outcome is reduced to a cheap signature which is hashed into a fixed size
+    key, buckets are then looked up by key so adding an outcome is constant time.
+    """
+
+    def __init__(self) -> None:
+        self.buckets: Dict[str, Bucket] = {}
+
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+    def add_response(
+        self, case: Any, status: int, body: Union[bytes, str]
+    ) -> Optional[Bucket]:
+        """
+        Buckets the response to a delivered case
+
+        :param case: The FuzzCase or bare payload that was delivered
+        :type case: Any
+        :param status: Response status code
+        :type status: int
+        :param body: Response body
+        :type body: Union[bytes, str]
+        :return: The bucket the response was added to
+        :rtype: Optional[Bucket]
+        """
+        return self._add(case, response_signature(status=status, body=body))
+
+    def add_result(
+        self, result: HarnessResult, include_ok: bool = False
+    ) -> Optional[Bucket]:
+        """
+        Buckets the outcome of a case run by the harness
+
+        :param result: Outcome of a harness run
+        :type result: HarnessResult
+        :param include_ok: Also bucket cases that ran without error, defaults to False
+        :type include_ok: bool, optional
+        :return: The bucket the result was added to, None when it was skipped
+        :rtype: Optional[Bucket]
+        """
+        if result.outcome == OUTCOME_OK and not include_ok:
+            return None
+
+        return self._add(result.case, result_signature(result))
+
+    def summary(self) -> List[str]:
+        """
+        One line per bucket, most frequent first
+
+        :return: Human readable bucket lines
+        :rtype: List[str]
+        """
+        return [
+            str(bucket)
+            for bucket in sorted(
+                self.buckets.values(), key=lambda bucket: bucket.count, reverse=True
+            )
+        ]
+
+    def _add(self, case: Any, signature: Tuple[Any, ...]) -> Bucket:
+        key = signature_key(signature)
+
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = Bucket(key=key, signature=signature)
+
+        bucket.add(case)
+        return bucket
+
+
+def normalise_text(text: str) -> str:
+    text = text[:ERROR_TEXT_LIMIT]
+    for pattern, replacement in _NORMALISERS:
+        text = pattern.sub(replacement, text)
+
+    return text.strip()
+
+
+def length_bucket(length: int) -> int:
+    # Power of two buckets, so small length jitter maps to the same bucket
+    return length.bit_length()
+
+
+def response_signature(status: int, body: Union[bytes, str]) -> Tuple[Any, ...]:
+    if isinstance(body, bytes):
+        text = body[: ERROR_TEXT_LIMIT * 4].decode("utf-8", errors="replace")
+    else:
+        text = body
+
+    return ("response", status, normalise_text(text), length_bucket(len(body)))
+
+
+def result_signature(result: HarnessResult) -> Tuple[Any, ...]:
+    return (
+        result.outcome,
+        result.exception_type,
+        result.frames[-SIGNATURE_FRAMES:],
+        # Only crashes carry a message worth keeping, the signal or exit code
+        result.message if result.exception_type is None else None,
+    )
+
+
+def signature_key(signature: Tuple[Any, ...]) -> str:
+    return hashlib.blake2b(repr(signature).encode(), digest_size=8).hexdigest()
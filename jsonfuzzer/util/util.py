@@ -1,3 +1,4 @@
+from typing import List, Union
 import json
 
 
@@ -8,3 +9,24 @@ class Util:
     @staticmethod
     def pretty_print(json_input):
         return json.dumps(json_input, sort_keys=False, indent=4)
+
+    @staticmethod
+    def format_path(path: List[Union[str, int]], wildcard: bool = False) -> str:
+        """
+        Formats a path the way it would be written in JavaScript, e.g. hobbies[0].name
+
+        :param path: List of keys to get to a primitive in a structure
+        :type path: List[Union[str, int]]
+        :param wildcard: Replace list indexes with *, e.g. hobbies[*].name, defaults to False
+        :type wildcard: bool, optional
+        :return: The formatted path
+        :rtype: str
+        """
+        formatted = ""
+        for key in path:
+            if isinstance(key, int):
+                formatted += "[*]" if wildcard else f"[{key}]"
+            else:
+                formatted += f".{key}" if formatted else key
+
+        return formatted
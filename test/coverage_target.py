@@ -0,0 +1,25 @@
+import json
+
+
+def parse_order(order):
+    # Each branch is only reachable with a specific shape of input
+    quantity = order.get("quantity")
+    if isinstance(quantity, int) and not isinstance(quantity, bool):
+        if quantity < 0:
+            raise ValueError("negative quantity")
+        if quantity > 2**31:
+            return "bulk"
+    elif isinstance(quantity, str):
+        return int(quantity)
+    elif quantity is None:
+        return "missing"
+
+    name = order.get("name")
+    if isinstance(name, str) and name.upper() != name:
+        return "mixed case"
+
+    return "ok"
+
+
+def parse_order_document(document):
+    return parse_order(json.loads(document))
@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+import unittest
+from jsonfuzzer.core.batch import BatchCampaign, load_templates, shape_key
+from jsonfuzzer.core.fuzzer import MODE_MUTATION, MODE_PARAMETER, Fuzzer
+
+TEMPLATES = {
+    "jane.json": {"name": "Jane", "hobbies": ["climbing"]},
+    "john.json": {"name": "John", "hobbies": ["skating"]},
+    "order.json": {"id": 1, "items": [{"sku": "a"}, {"sku": "b"}]},
+}
+
+
+class TestBatchCampaign(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        for name, structure in TEMPLATES.items():
+            with open(os.path.join(self.directory.name, name), "w") as template:
+                json.dump(structure, template)
+        with open(os.path.join(self.directory.name, "notes.txt"), "w") as notes:
+            notes.write("not a template")
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        return super().tearDown()
+
+    def test_load_templates_from_directory(self):
+        self.assertEqual(
+            list(load_templates(self.directory.name)), list(TEMPLATES.items())
+        )
+
+    def test_load_templates_from_ndjson(self):
+        ndjson = os.path.join(self.directory.name, "captured.ndjson")
+        with open(ndjson, "w") as ndjson_file:
+            ndjson_file.write('{"a": 1}\n\nnot json\n"scalar"\n[1, 2]\n')
+
+        with self.assertLogs("jsonfuzzer.core.batch", level="WARNING"):
+            templates = list(load_templates(ndjson))
+
+        self.assertEqual(
+            templates, [("captured.ndjson:1", {"a": 1}), ("captured.ndjson:5", [1, 2])]
+        )
+
+    def test_shape_key_ignores_primitives(self):
+        self.assertEqual(
+            shape_key(TEMPLATES["jane.json"]), shape_key(TEMPLATES["john.json"])
+        )
+        self.assertNotEqual(
+            shape_key({"hobbies": ["a"]}), shape_key({"hobbies": ["a", "b"]})
+        )
+
+    def test_run_tags_cases_with_their_source(self):
+        fuzzer = Fuzzer()
+        modes = [MODE_PARAMETER, MODE_MUTATION]
+        campaign = BatchCampaign(modes=modes, value_to_inject="PAYLOAD", workers=2)
+
+        results = list(campaign.run(load_templates(self.directory.name)))
+
+        self.assertEqual(len(campaign.shapes), 2)
+        for source, structure in TEMPLATES.items():
+            self.assertEqual(
+                [result.case for result in results if result.source == source],
+                list(
+                    fuzzer.generate_cases(
+                        structure=structure,
+                        paramater_paths=fuzzer.PATH_FINDER.map_structure(
+                            structure=structure
+                        ),
+                        modes=modes,
+                        value_to_inject="PAYLOAD",
+                    )
+                ),
+            )
+
+    def test_run_in_process(self):
+        campaign = BatchCampaign(modes=[MODE_MUTATION], workers=0)
+
+        sources = {result.source for result in campaign.run(TEMPLATES.items())}
+
+        self.assertEqual(sources, set(TEMPLATES))
+
+
+if __name__ == "__main__":
+    unittest.main()
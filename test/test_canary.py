@@ -0,0 +1,62 @@
+import unittest
+from jsonfuzzer.core.fuzzer import MODE_PARAMETER, MODE_STRUCTURE, Fuzzer
+from jsonfuzzer.triage.canary import AhoCorasick, CanaryRegistry
+
+
+class TestCanary(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = CanaryRegistry()
+        return super().setUp()
+
+    def test_aho_corasick_overlapping_patterns(self):
+        matcher = AhoCorasick([b"he", b"she", b"his", b"hers"])
+
+        self.assertEqual(
+            matcher.scan(b"ushers"),
+            [(1, 1), (2, 0), (2, 3)],
+        )
+        self.assertEqual(matcher.scan(b"nothing"), [])
+
+    def test_canary_for_is_deterministic(self):
+        first = self.registry.canary_for(MODE_PARAMETER, ["a", 0])
+
+        self.assertEqual(first, CanaryRegistry().canary_for(MODE_PARAMETER, ["a", 0]))
+        self.assertNotEqual(first, self.registry.canary_for(MODE_STRUCTURE, ["a", 0]))
+        self.assertTrue(first.isalnum())
+
+    def test_template_value(self):
+        canary = self.registry.canary_for(MODE_PARAMETER, ["a"])
+
+        self.assertEqual(
+            self.registry.template_value("<{canary}>", MODE_PARAMETER, ["a"]),
+            f"<{canary}>",
+        )
+        self.assertEqual(
+            self.registry.template_value({"x": ["{canary}"]}, MODE_PARAMETER, ["a"]),
+            {"x": [canary]},
+        )
+        self.assertEqual(self.registry.template_value(1, MODE_PARAMETER, ["a"]), 1)
+
+    def test_scan_maps_hits_to_paths(self):
+        cases = list(
+            self.registry.generate_cases(
+                fuzzer=Fuzzer(),
+                structure={"a": {"b": "c"}, "d": "e"},
+                paramater_paths=[["a", "b"], ["d"]],
+                value_to_inject="x{canary}",
+            )
+        )
+        reflected = cases[1].payload["d"]
+
+        self.assertEqual(len(cases), 3)
+        # Structure mode has nothing to generate for the top level path ["d"]
+        self.assertEqual(len(self.registry), 3)
+        self.assertEqual(
+            self.registry.scan(f"<p>Unknown value {reflected}, {reflected}</p>"),
+            [(MODE_PARAMETER, ["d"])],
+        )
+        self.assertEqual(self.registry.scan(b"nothing reflected"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
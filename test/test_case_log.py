@@ -0,0 +1,166 @@
+import gc
+import os
+import tempfile
+import unittest
+import warnings
+from jsonfuzzer.core.fuzzer import MODE_MUTATION, MODE_PARAMETER, FuzzCase, Fuzzer
+from jsonfuzzer.core.planner import Planner
+from jsonfuzzer.corpus.case_log import (
+    MAX_VARIANT,
+    CaseLog,
+    CaseLogWriter,
+    Replayer,
+    corpus_hash,
+)
+from jsonfuzzer.corpus.corpus import Corpus
+from jsonfuzzer.harness.harness import OUTCOME_EXCEPTION, Harness
+from jsonfuzzer.parser.path_finder import PathFinder
+
+TEMPLATE = {"name": "Jane", "hobbies": [{"name": "climbing"}], "age": 30}
+PATHS = PathFinder().map_structure(structure=TEMPLATE)
+CORPORA = {"words": ["x", "<svg>", "' or 1=1"]}
+
+
+def reject_strings(payload):
+    if not isinstance(payload["age"], int):
+        raise TypeError("age must be an integer")
+
+
+class TestCaseLog(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.directory.name, "cases.log")
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        return super().tearDown()
+
+    def test_replay_rebuilds_every_case(self):
+        cases = list(
+            Planner(
+                TEMPLATE, PATHS, modes=[MODE_PARAMETER, MODE_MUTATION], corpora=CORPORA
+            ).cases()
+        )
+        with CaseLogWriter(self.log_path, TEMPLATE, PATHS, corpora=CORPORA) as writer:
+            for case in cases:
+                writer.append(case)
+
+        with CaseLog(self.log_path) as case_log:
+            replayed = [
+                case for _, case in Replayer(case_log, TEMPLATE, corpora=CORPORA)
+            ]
+
+        self.assertEqual(replayed, cases)
+        header_size = os.path.getsize(self.log_path) - 18 * len(cases)
+        self.assertLess(header_size, 512)
+
+    def test_outcomes_are_recorded(self):
+        cases = Fuzzer().generate_cases(
+            structure=TEMPLATE, paramater_paths=PATHS, modes=[MODE_MUTATION]
+        )
+        with CaseLogWriter(self.log_path, TEMPLATE, PATHS) as writer:
+            with Harness(
+                reject_strings, workers=0, on_result=writer.append_result
+            ) as harness:
+                results = list(harness.run(cases))
+
+        with CaseLog(self.log_path) as case_log:
+            records = list(case_log)
+            replayer = Replayer(case_log, TEMPLATE)
+
+            self.assertEqual(len(records), len(results))
+            self.assertEqual(records[-1], case_log[-1])
+            for record, result in zip(records, results):
+                self.assertEqual(record.outcome, result.outcome)
+                self.assertAlmostEqual(record.latency, result.duration, places=5)
+            failing = [
+                replayer.replay(index)
+                for index, record in enumerate(records)
+                if record.outcome == OUTCOME_EXCEPTION
+            ]
+
+        self.assertTrue(failing)
+        for case in failing:
+            self.assertNotIsInstance(case.payload["age"], int)
+
+    def test_append_to_existing_log(self):
+        case = next(
+            Fuzzer().generate_cases(
+                structure=TEMPLATE, paramater_paths=PATHS, modes=[MODE_MUTATION]
+            )
+        )
+        with CaseLogWriter(self.log_path, TEMPLATE, PATHS) as writer:
+            writer.append(case)
+        with open(self.log_path, "ab") as log_file:
+            log_file.write(b"\x00" * 5)  # Interrupted write
+        with CaseLogWriter(self.log_path, TEMPLATE, PATHS) as writer:
+            writer.append(case)
+
+        with CaseLog(self.log_path) as case_log:
+            self.assertEqual(len(case_log), 2)
+            self.assertEqual(case_log[0], case_log[1])
+
+        with self.assertRaises(ValueError):
+            CaseLogWriter(self.log_path, {"other": 1}, [["other"]])
+
+    def test_replay_rejects_other_template(self):
+        CaseLogWriter(self.log_path, TEMPLATE, PATHS, corpora=CORPORA).close()
+
+        with CaseLog(self.log_path) as case_log:
+            with self.assertRaises(ValueError):
+                Replayer(case_log, {"name": "John"})
+            with self.assertRaises(ValueError):
+                Replayer(case_log, TEMPLATE, corpora={"words": ["changed"]})
+
+    def test_fields_too_large_for_a_record(self):
+        case = FuzzCase(
+            mode=MODE_MUTATION, path=PATHS[0], variant=MAX_VARIANT, payload=None
+        )
+
+        with CaseLogWriter(self.log_path, TEMPLATE, PATHS, corpora=CORPORA) as writer:
+            writer.append(case)
+            with self.assertRaisesRegex(ValueError, "variant"):
+                writer.append(case._replace(variant=MAX_VARIANT + 1))
+            with self.assertRaisesRegex(ValueError, "corpus_index"):
+                writer.append(case._replace(corpus="words", corpus_index=2**32))
+
+        with CaseLog(self.log_path) as case_log:
+            self.assertEqual(len(case_log), 1)
+            self.assertEqual(case_log[0].variant, MAX_VARIANT)
+
+    def test_empty_log_is_rejected_and_closed(self):
+        open(self.log_path, "wb").close()
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            with self.assertRaises(ValueError):
+                CaseLog(self.log_path)
+            gc.collect()
+
+        self.assertEqual(
+            [warning for warning in caught if warning.category is ResourceWarning], []
+        )
+
+    def test_corpus_file_is_hashed(self):
+        corpus_path = os.path.join(self.directory.name, "words.txt")
+        with open(corpus_path, "w") as corpus_file:
+            corpus_file.write("\n".join(CORPORA["words"]))
+
+        with Corpus(corpus_path) as corpus:
+            digest = corpus_hash(corpus)
+            CaseLogWriter(
+                self.log_path, TEMPLATE, PATHS, corpora={"words": corpus}
+            ).close()
+
+        with open(corpus_path, "a") as corpus_file:
+            corpus_file.write("\nextra")
+
+        with CaseLog(self.log_path) as case_log, Corpus(corpus_path) as corpus:
+            self.assertEqual(case_log.corpus_hashes, [digest])
+            with self.assertRaises(ValueError):
+                Replayer(case_log, TEMPLATE, corpora={"words": corpus})
+
+
+if __name__ == "__main__":
+    unittest.main()
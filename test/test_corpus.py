@@ -0,0 +1,92 @@
+import gc
+import os
+import tempfile
+import unittest
+import warnings
+from unittest import mock
+from jsonfuzzer.corpus.corpus import Corpus
+
+
+class TestCorpus(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.wordlist = os.path.join(self.directory.name, "wordlist.txt")
+        with open(self.wordlist, "wb") as wordlist:
+            wordlist.write(b"alpha\nbeta\r\n\ngamma")
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        return super().tearDown()
+
+    def test_corpus_iteration(self):
+        with Corpus(self.wordlist) as corpus:
+            self.assertEqual(list(corpus), ["alpha", "beta", "", "gamma"])
+
+    def test_corpus_random_access(self):
+        with Corpus(self.wordlist) as corpus:
+            self.assertEqual(len(corpus), 4)
+            self.assertEqual(corpus[1], "beta")
+            self.assertEqual(corpus[-1], "gamma")
+            with self.assertRaises(IndexError):
+                corpus[4]
+
+    def test_corpus_shard(self):
+        with Corpus(self.wordlist) as corpus:
+            self.assertEqual(list(corpus.shard(0, 2)), ["alpha", ""])
+            self.assertEqual(list(corpus.shard(1, 2)), ["beta", "gamma"])
+
+    def test_corpus_index_sidecar_reused(self):
+        Corpus(self.wordlist).close()
+        self.assertTrue(os.path.exists(self.wordlist + Corpus.INDEX_SUFFIX))
+
+        with Corpus(self.wordlist) as corpus:
+            self.assertEqual(corpus[3], "gamma")
+
+    def test_corpus_index_sidecar_rebuilt_when_stale(self):
+        Corpus(self.wordlist).close()
+        with open(self.wordlist, "ab") as wordlist:
+            wordlist.write(b"\ndelta")
+
+        with Corpus(self.wordlist) as corpus:
+            self.assertEqual(list(corpus), ["alpha", "beta", "", "gamma", "delta"])
+
+    def test_corpus_index_sidecar_rebuilt_when_truncated(self):
+        Corpus(self.wordlist).close()
+        index_path = self.wordlist + Corpus.INDEX_SUFFIX
+        with open(index_path, "r+b") as index_file:
+            index_file.truncate(Corpus._INDEX_HEADER.size + 8)
+
+        with Corpus(self.wordlist) as corpus:
+            self.assertEqual(list(corpus), ["alpha", "beta", "", "gamma"])
+        self.assertEqual(os.path.getsize(index_path), Corpus._INDEX_HEADER.size + 4 * 8)
+        # No temporary files are left behind
+        self.assertEqual(
+            sorted(os.listdir(self.directory.name)),
+            ["wordlist.txt", "wordlist.txt.idx"],
+        )
+
+    def test_corpus_empty(self):
+        empty = os.path.join(self.directory.name, "empty.txt")
+        open(empty, "wb").close()
+
+        with Corpus(empty) as corpus:
+            self.assertEqual(len(corpus), 0)
+            self.assertEqual(list(corpus), [])
+
+    def test_corpus_file_is_closed_when_mapping_fails(self):
+        empty = os.path.join(self.directory.name, "empty.txt")
+        open(empty, "wb").close()
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            Corpus(empty).close()
+            # e.g. the file was truncated between the stat and the mmap
+            with mock.patch("mmap.mmap", side_effect=ValueError("cannot mmap")):
+                with self.assertRaises(ValueError):
+                    Corpus(self.wordlist)
+            gc.collect()
+
+        self.assertEqual(
+            [warning for warning in caught if warning.category is ResourceWarning], []
+        )
@@ -0,0 +1,133 @@
+import os
+import sys
+import unittest
+from coverage_target import parse_order, parse_order_document
+from jsonfuzzer.harness.coverage import (
+    MAX_OVERHEAD,
+    OVERHEAD_CHECK_INTERVAL,
+    OVERHEAD_SAMPLE_SIZE,
+    CoverageFuzzer,
+    CoverageTracer,
+)
+
+TEMPLATE = {"quantity": 1, "name": "widget"}
+
+
+class TestCoverage(unittest.TestCase):
+    def test_tracer_reports_only_new_coverage(self):
+        tracer = CoverageTracer(include=[os.path.dirname(__file__)])
+        self.addCleanup(tracer.close)
+
+        first, error = tracer.run(parse_order, {"quantity": 1, "name": "a"})
+        again, _ = tracer.run(parse_order, {"quantity": 2, "name": "b"})
+        other, _ = tracer.run(parse_order, {"quantity": None})
+
+        self.assertGreater(first, 0)
+        self.assertIsNone(error)
+        self.assertEqual(again, 0)
+        self.assertGreater(other, 0)
+
+    def test_tracer_returns_exception(self):
+        tracer = CoverageTracer(include=[os.path.dirname(__file__)])
+        self.addCleanup(tracer.close)
+
+        _, error = tracer.run(parse_order, {"quantity": -1})
+
+        self.assertIsInstance(error, ValueError)
+        self.assertIsNone(sys.gettrace() if not tracer.use_monitoring else None)
+
+    def test_coverage_fuzzer_grows_corpus(self):
+        fuzzer = CoverageFuzzer(
+            target=parse_order,
+            structure=TEMPLATE,
+            seed=1,
+            include=[os.path.dirname(__file__)],
+        )
+        self.addCleanup(fuzzer.close)
+
+        result = fuzzer.run(300)
+
+        self.assertGreater(len(result.corpus), 3)
+        self.assertIn(ValueError, {type(error) for _, error in result.failures})
+        self.assertEqual(result.coverage, len(fuzzer.tracer))
+
+    def test_coverage_fuzzer_is_deterministic(self):
+        corpora = []
+        for _ in range(2):
+            with CoverageFuzzer(
+                target=parse_order,
+                structure=TEMPLATE,
+                seed=5,
+                include=[os.path.dirname(__file__)],
+            ) as fuzzer:
+                corpora.append(fuzzer.run(200).corpus)
+
+        self.assertEqual(corpora[0], corpora[1])
+
+    def test_measure_overhead(self):
+        fuzzer = CoverageFuzzer(
+            target=parse_order, structure=TEMPLATE, include=[os.path.dirname(__file__)]
+        )
+        self.addCleanup(fuzzer.close)
+
+        self.assertGreaterEqual(fuzzer.measure_overhead(), 0.0)
+
+    def test_measure_overhead_on_a_sample(self):
+        calls = []
+
+        def target(payload):
+            calls.append(payload)
+            return parse_order(payload)
+
+        fuzzer = CoverageFuzzer(
+            target=target, structure=TEMPLATE, include=[os.path.dirname(__file__)]
+        )
+        self.addCleanup(fuzzer.close)
+        fuzzer.corpus.extend({"quantity": index} for index in range(1000))
+        del calls[:]
+
+        fuzzer.measure_overhead(repeat=1)
+
+        self.assertEqual(len(calls), 2 * OVERHEAD_SAMPLE_SIZE)
+
+    def test_overhead_within_limit(self):
+        with CoverageFuzzer(
+            target=parse_order_document,
+            structure=TEMPLATE,
+            serialize=True,
+            include=[os.path.dirname(__file__)],
+        ) as fuzzer:
+            result = fuzzer.run(OVERHEAD_CHECK_INTERVAL)
+
+            self.assertIsNotNone(result.overhead)
+            self.assertLessEqual(
+                result.overhead * result.trace_ratio, MAX_OVERHEAD + 1e-9
+            )
+            if fuzzer.tracer.use_monitoring:
+                # Covered locations are disabled, so only the wrapper cost remains
+                self.assertLess(fuzzer.measure_overhead(repeat=20), MAX_OVERHEAD)
+
+    def test_overhead_budget_is_enforced(self):
+        with CoverageFuzzer(
+            target=parse_order,
+            structure=TEMPLATE,
+            seed=2,
+            include=[os.path.dirname(__file__)],
+            max_overhead=1e-6,
+        ) as fuzzer:
+            # Force the sys.settrace fallback, which every version supports
+            fuzzer.tracer.use_monitoring = False
+            first = fuzzer.run(OVERHEAD_CHECK_INTERVAL)
+            second = fuzzer.run(OVERHEAD_CHECK_INTERVAL)
+
+        self.assertLessEqual(first.traced, OVERHEAD_CHECK_INTERVAL)
+        self.assertLess(first.trace_ratio, 1)
+        self.assertLess(second.traced, OVERHEAD_CHECK_INTERVAL // 2)
+        self.assertIn(ValueError, {type(error) for _, error in second.failures})
+
+        with self.assertRaises(ValueError):
+            CoverageFuzzer(target=parse_order, structure=TEMPLATE, max_overhead=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import os
+import tempfile
+import threading
+import unittest
+from jsonfuzzer.core.fuzzer import MODE_MUTATION, MODE_PARAMETER, Fuzzer
+from jsonfuzzer.service.daemon import DaemonClient, FuzzDaemon, send_message
+
+TEMPLATE = {"name": "Jane", "hobbies": [{"name": "climbing"}], "age": 30}
+
+
+class TestFuzzDaemon(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.directory.name, "fuzz.sock")
+        self.daemon = FuzzDaemon(self.socket_path, max_templates=2)
+        self.thread = threading.Thread(
+            target=self.daemon.serve_forever, kwargs={"poll_interval": 0.05}
+        )
+        self.thread.start()
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.daemon.shutdown()
+        self.thread.join()
+        self.daemon.server_close()
+        self.directory.cleanup()
+        return super().tearDown()
+
+    def test_batches_match_generate_cases(self):
+        fuzzer = Fuzzer()
+        expected = list(
+            fuzzer.generate_cases(
+                structure=TEMPLATE,
+                paramater_paths=fuzzer.PATH_FINDER.map_structure(structure=TEMPLATE),
+                modes=[MODE_MUTATION, MODE_PARAMETER],
+                value_to_inject="PAYLOAD",
+            )
+        )
+
+        with DaemonClient(self.socket_path) as client:
+            template_id = client.load(TEMPLATE)
+            batches = list(
+                client.batches(
+                    template_id,
+                    modes=[MODE_MUTATION, MODE_PARAMETER],
+                    value_to_inject="PAYLOAD",
+                    limit=7,
+                )
+            )
+
+        self.assertTrue(all(len(batch) <= 7 for batch in batches))
+        self.assertEqual([case for batch in batches for case in batch], expected)
+
+    def test_templates_are_cached_by_hash(self):
+        with DaemonClient(self.socket_path) as client:
+            first = client.load(TEMPLATE)
+            again = client.load(dict(reversed(list(TEMPLATE.items()))))
+            client.load({"other": 1})
+            client.load({"another": 2})
+
+            self.assertEqual(first, again)
+            self.assertEqual(client.request({"op": "ping"}), {"templates": 2})
+            # The least recently used template was dropped
+            with self.assertRaises(ValueError):
+                client.request({"op": "batch", "template_id": first})
+
+    def test_rewinding_regenerates_the_same_cases(self):
+        with DaemonClient(self.socket_path) as client:
+            request = {"op": "batch", "template": TEMPLATE, "limit": 5}
+            first = client.request(dict(request, offset=0))
+            client.request(dict(request, offset=5))
+
+            self.assertEqual(client.request(dict(request, offset=0)), first)
+            self.assertEqual(first["next_offset"], 5)
+
+    def test_errors_are_reported(self):
+        with DaemonClient(self.socket_path) as client:
+            with self.assertRaises(ValueError):
+                client.request({"op": "nope"})
+            with self.assertRaises(ValueError):
+                client.request(
+                    {"op": "batch", "template": TEMPLATE, "modes": [MODE_PARAMETER]}
+                )
+            with self.assertRaises(ValueError):
+                client.request(["not", "an", "object"])
+            # The connection survives errors
+            self.assertIn("template_id", client.request({"op": "load", "template": {}}))
+
+    def test_bad_offsets_and_limits_are_rejected(self):
+        request = {"op": "batch", "template": TEMPLATE, "limit": 5}
+
+        with DaemonClient(self.socket_path) as client:
+            first = client.request(dict(request, offset=0))
+            client.request(dict(request, offset=5))
+
+            for bad in [{"offset": -1}, {"offset": "5"}, {"offset": True}]:
+                with self.assertRaises(ValueError):
+                    client.request(dict(request, **bad))
+            for bad in [{"limit": 0}, {"limit": -5}, {"limit": 2.5}]:
+                with self.assertRaises(ValueError):
+                    client.request(dict(request, offset=5, **bad))
+            with self.assertRaises(ValueError):
+                next(client.batches(first["template_id"], limit=0))
+
+            # The stream was left alone
+            second = client.request(dict(request, offset=5))
+            both = client.request(dict(request, offset=0, limit=10))
+            self.assertEqual(first["cases"] + second["cases"], both["cases"])
+
+    def test_templates_generate_concurrently(self):
+        compiled = self.daemon.templates.load(TEMPLATE)
+        other = {"other": "template"}
+
+        # Generation of one template doesn't wait on a batch of another
+        with compiled._lock:
+            with DaemonClient(self.socket_path) as client:
+                reply = client.request({"op": "batch", "template": other, "limit": 1})
+
+        self.assertEqual(len(reply["cases"]), 1)
+
+    def test_client_leaving_before_reply(self):
+        with DaemonClient(self.socket_path) as client:
+            send_message(client._socket, {"op": "batch", "template": TEMPLATE})
+
+        with DaemonClient(self.socket_path) as client:
+            self.assertIn("templates", client.request({"op": "ping"}))
+
+    def test_shutdown_op(self):
+        with DaemonClient(self.socket_path) as client:
+            send_message(client._socket, {"op": "shutdown"})
+        self.thread.join(timeout=5)
+
+        self.assertFalse(self.thread.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import multiprocessing
+import unittest
+from jsonfuzzer.core.dedup import ScalableBloomFilter
+from jsonfuzzer.core.fuzzer import Fuzzer
+from jsonfuzzer.parser.path_finder import PathFinder
+
+
+def add_all(bloom_filter, fingerprints, results):
+    results.put(sum(bloom_filter.add(fingerprint) for fingerprint in fingerprints))
+    bloom_filter.close()
+
+
+class TestScalableBloomFilter(unittest.TestCase):
+    def test_add_reports_new_fingerprints(self):
+        bloom_filter = ScalableBloomFilter(initial_capacity=100)
+
+        self.assertTrue(bloom_filter.add("a"))
+        self.assertFalse(bloom_filter.add("a"))
+        self.assertIn("a", bloom_filter)
+        self.assertNotIn("b", bloom_filter)
+        self.assertEqual(len(bloom_filter), 1)
+
+    def test_scales_within_error_rate(self):
+        bloom_filter = ScalableBloomFilter(error_rate=0.01, initial_capacity=100)
+
+        added = sum(bloom_filter.add(f"item-{index}") for index in range(2000))
+        false_positives = sum(f"other-{index}" in bloom_filter for index in range(2000))
+
+        self.assertGreater(added, 1960)
+        self.assertLess(false_positives, 40)
+        self.assertFalse(bloom_filter.saturated)
+
+    def test_memory_cap(self):
+        bloom_filter = ScalableBloomFilter(
+            error_rate=0.01, initial_capacity=100, max_bytes=1024
+        )
+
+        for index in range(2000):
+            bloom_filter.add(f"item-{index}")
+
+        self.assertLessEqual(bloom_filter.size, 1024)
+        self.assertTrue(bloom_filter.saturated)
+
+        with self.assertRaises(ValueError):
+            ScalableBloomFilter(initial_capacity=100_000, max_bytes=1024)
+
+    def test_slices_are_allocated_lazily(self):
+        bloom_filter = ScalableBloomFilter(error_rate=0.01, initial_capacity=100)
+        first = bloom_filter.slices[0].bits // 8
+
+        self.assertEqual(bloom_filter.allocated, first)
+        self.assertGreater(bloom_filter.size, 100 * first)
+
+        for index in range(150):
+            bloom_filter.add(f"item-{index}")
+
+        self.assertEqual(
+            bloom_filter.allocated, first + bloom_filter.slices[1].bits // 8
+        )
+
+    def test_shared_across_processes(self):
+        context = multiprocessing.get_context("spawn")
+        bloom_filter = ScalableBloomFilter(
+            initial_capacity=1000, shared=True, context=context
+        )
+        self.addCleanup(bloom_filter.close)
+        results = context.Queue()
+        fingerprints = [f"item-{index}" for index in range(500)]
+
+        processes = [
+            context.Process(target=add_all, args=(bloom_filter, fingerprints, results))
+            for _ in range(3)
+        ]
+        for process in processes:
+            process.start()
+
+        added = [results.get(timeout=30) for _ in processes]
+        for process in processes:
+            process.join(timeout=30)
+            self.assertEqual(process.exitcode, 0)
+
+        # Every fingerprint is added by exactly one of the processes
+        self.assertEqual(sum(added), len(bloom_filter))
+        self.assertLessEqual(sum(added), 500)
+        self.assertGreater(sum(added), 495)
+        self.assertFalse(bloom_filter.add("item-0"))
+
+    def test_generate_cases_dedup(self):
+        fuzzer = Fuzzer()
+        structure = {"a": {"b": "c"}, "d": ["e"]}
+        paths = PathFinder().map_structure(structure=structure)
+        bloom_filter = ScalableBloomFilter(initial_capacity=1000)
+
+        expected = list(fuzzer.generate_cases(structure, paths, value_to_inject="x"))
+        first = list(
+            fuzzer.generate_cases(
+                structure, paths, value_to_inject="x", dedup=bloom_filter
+            )
+        )
+        second = list(
+            fuzzer.generate_cases(
+                structure, paths, value_to_inject="x", dedup=bloom_filter
+            )
+        )
+
+        self.assertEqual(first, expected)
+        self.assertEqual(second, [])
+
+    def test_permutations_dedup(self):
+        fuzzer = Fuzzer()
+        structure = {"a": {"b": "c"}, "d": ["e"]}
+        paths = PathFinder().map_structure(structure=structure)
+        bloom_filter = ScalableBloomFilter(initial_capacity=1000)
+
+        structural = fuzzer.generate_structure_permutations_for_payload(
+            structure, paths, "x", dedup=bloom_filter
+        )
+        missing = fuzzer.generate_structure_missing_attribute_permutations(
+            structure, paths, dedup=bloom_filter
+        )
+
+        self.assertEqual(
+            structural,
+            fuzzer.generate_structure_permutations_for_payload(structure, paths, "x"),
+        )
+        self.assertEqual(
+            missing,
+            fuzzer.generate_structure_missing_attribute_permutations(structure, paths),
+        )
+        self.assertEqual(len(bloom_filter), len(structural) + len(missing))
+        self.assertEqual(
+            fuzzer.generate_structure_missing_attribute_permutations(
+                structure, paths, dedup=bloom_filter
+            ),
+            [],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
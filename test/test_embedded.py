@@ -0,0 +1,184 @@
+import unittest
+from jsonfuzzer.core.fuzzer import Fuzzer, MODE_KEY_NAME, MODE_UNEXPECTED_ATTRIBUTE
+from jsonfuzzer.parser.embedded import (
+    EMBEDDED_JSON,
+    _parse,
+    encode_embedded,
+    parse_embedded,
+)
+from jsonfuzzer.parser.injector import Injector
+from jsonfuzzer.parser.path_finder import PathFinder
+
+import json
+
+
+class TestEmbedded(unittest.TestCase):
+    def setUp(self) -> None:
+        self.injector = Injector()
+        self.path_finder = PathFinder()
+        self.structure = {
+            "id": 1,
+            "payload": '{"a":1,"b":["x","y"]}',
+            "note": "{not json}",
+        }
+        return super().setUp()
+
+    def test_parse_embedded(self):
+        self.assertEqual(parse_embedded('{"a": 1}'), {"a": 1})
+        self.assertEqual(parse_embedded(" [1, 2] "), [1, 2])
+        self.assertIsNone(parse_embedded("{not json}"))
+        self.assertIsNone(parse_embedded('"quoted"'))
+        self.assertIsNone(parse_embedded("12"))
+        self.assertIsNone(parse_embedded(12))
+
+    def test_parse_embedded_is_cached(self):
+        text = '{"cached": ' + json.dumps(self.id()) + "}"
+        hits = _parse.cache_info().hits
+
+        first = parse_embedded(text)
+        second = parse_embedded(text)
+
+        self.assertIs(first, second)
+        self.assertEqual(_parse.cache_info().hits, hits + 1)
+
+    def test_encode_embedded_keeps_layout(self):
+        self.assertEqual(encode_embedded('{"a":1}', {"a": 2}), '{"a":2}')
+        self.assertEqual(encode_embedded('{"a": 1}', {"a": 2}), '{"a": 2}')
+
+    def test_map_embedded_structure(self):
+        result = self.path_finder.map_embedded_structure(structure=self.structure)
+
+        self.assertEqual(
+            result,
+            [
+                ["id"],
+                ["payload", EMBEDDED_JSON, "a"],
+                ["payload", EMBEDDED_JSON, "b", 0],
+                ["payload", EMBEDDED_JSON, "b", 1],
+                ["note"],
+            ],
+        )
+
+    def test_map_embedded_structure_nested(self):
+        inner = json.dumps({"c": True})
+        structure = {"outer": json.dumps({"inner": inner})}
+
+        result = self.path_finder.map_embedded_structure(structure=structure)
+
+        self.assertEqual(
+            result, [["outer", EMBEDDED_JSON, "inner", EMBEDDED_JSON, "c"]]
+        )
+        self.assertIs(
+            self.injector.get_attribute_in_structure_by_path(structure, result[0]), True
+        )
+
+        payload = self.injector.modify_attribute_in_structure_by_path(
+            structure=structure, path=result[0], value_to_inject="x"
+        )
+        self.assertEqual(
+            json.loads(json.loads(payload["outer"])["inner"]),
+            {"c": "x"},
+        )
+
+    def test_map_embedded_structure_keeps_empty_documents(self):
+        result = self.path_finder.map_embedded_structure(structure={"a": "{}"})
+
+        self.assertEqual(result, [["a"]])
+
+    def test_modify_re_encodes(self):
+        payload = self.injector.modify_attribute_in_structure_by_path(
+            structure=self.structure,
+            path=["payload", EMBEDDED_JSON, "b", 1],
+            value_to_inject="<script>",
+        )
+
+        self.assertEqual(payload["payload"], '{"a":1,"b":["x","<script>"]}')
+        self.assertEqual(self.structure["payload"], '{"a":1,"b":["x","y"]}')
+
+    def test_modify_embedded_root(self):
+        payload = self.injector.modify_attribute_in_structure_by_path(
+            structure=self.structure,
+            path=["payload", EMBEDDED_JSON],
+            value_to_inject=None,
+        )
+
+        self.assertEqual(payload["payload"], "null")
+
+    def test_remove_and_add(self):
+        removed = self.injector.remove_attribute_in_structure_by_path(
+            structure=self.structure, path=["payload", EMBEDDED_JSON, "a"]
+        )
+        added = self.injector.add_attribute_in_structure_by_path(
+            structure=self.structure,
+            path=["payload", EMBEDDED_JSON],
+            key="admin",
+            value_to_inject=True,
+        )
+
+        self.assertEqual(json.loads(removed["payload"]), {"b": ["x", "y"]})
+        self.assertEqual(
+            json.loads(added["payload"]), {"a": 1, "b": ["x", "y"], "admin": True}
+        )
+
+    def test_generate_value_payloads(self):
+        payloads = self.injector.generate_value_payloads_by_path(
+            structure=self.structure,
+            path=["payload", EMBEDDED_JSON, "a"],
+            values_to_inject=[2, "2"],
+        )
+
+        self.assertEqual(
+            [payload["payload"] for payload in payloads],
+            ['{"a":2,"b":["x","y"]}', '{"a":"2","b":["x","y"]}'],
+        )
+
+    def test_missing_attribute_skips_embedded_root(self):
+        payloads = (
+            self.injector.generate_missing_attribute_permutations_for_structure_by_path(
+                structure=self.structure, path=["payload", EMBEDDED_JSON, "a"]
+            )
+        )
+
+        self.assertEqual(len(payloads), 2)
+        self.assertNotIn("payload", payloads[0])
+        self.assertEqual(json.loads(payloads[1]["payload"]), {"b": ["x", "y"]})
+
+    def test_fuzzer_key_modes_skip_marker(self):
+        fuzzer = Fuzzer()
+        path = ["payload", EMBEDDED_JSON, "a"]
+
+        renamed = fuzzer.generate_payloads_for_path(
+            structure=self.structure, mode=MODE_KEY_NAME, path=path
+        )
+        extended = fuzzer.generate_payloads_for_path(
+            structure=self.structure, mode=MODE_UNEXPECTED_ATTRIBUTE, path=path
+        )
+
+        self.assertTrue(renamed)
+        self.assertTrue(extended)
+        for payload in renamed + extended:
+            if isinstance(payload.get("payload"), str):
+                self.assertIsNotNone(parse_embedded(payload["payload"]))
+
+    def test_generate_cases_with_compound_paths(self):
+        fuzzer = Fuzzer()
+        paths = self.path_finder.map_embedded_structure(structure=self.structure)
+
+        cases = list(
+            fuzzer.generate_cases(
+                structure=self.structure, paramater_paths=paths, value_to_inject="X"
+            )
+        )
+
+        self.assertTrue(cases)
+        self.assertTrue(
+            any(
+                case.payload.get("payload") == '{"a":"X","b":["x","y"]}'
+                for case in cases
+                if isinstance(case.payload, dict)
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
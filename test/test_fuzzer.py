@@ -1,5 +1,12 @@
 import unittest
-from jsonfuzzer.core.fuzzer import Fuzzer
+from jsonfuzzer.core.fuzzer import (
+    MODE_PARAMETER,
+    MODE_STRUCTURE,
+    MODE_TYPE_CONFUSION,
+    UNEXPECTED_ATTRIBUTES,
+    FuzzCase,
+    Fuzzer,
+)
 
 
 class TestFuzzer(unittest.TestCase):
@@ -372,3 +379,162 @@ class TestFuzzer(unittest.TestCase):
         )
 
         self.assertEqual(result, expected_result)
+
+    def test_generate_structure_mutation_permutations(self) -> None:
+        test_structure = {"a": True, "b": {"c": None}}
+        test_structure_param_paths = [["a"], ["b", "c"]]
+
+        expected_result = [
+            {"a": False, "b": {"c": None}},
+            {"a": 1, "b": {"c": None}},
+            {"a": "true", "b": {"c": None}},
+        ]
+
+        result = self.fuzzer.generate_structure_mutation_permutations(
+            structure=test_structure, paramater_paths=test_structure_param_paths
+        )
+
+        self.assertEqual(result, expected_result)
+        self.assertEqual(test_structure, {"a": True, "b": {"c": None}})
+
+    def test_generate_structure_type_confusion_permutations(self) -> None:
+        test_structure = {"a": "b", "c": [1]}
+        test_structure_param_paths = [["a"], ["c", 0]]
+
+        expected_result = [
+            {"a": 0, "c": [1]},
+            {"a": 0.0, "c": [1]},
+            {"a": False, "c": [1]},
+            {"a": None, "c": [1]},
+            {"a": [], "c": [1]},
+            {"a": {}, "c": [1]},
+            {"a": "b", "c": [""]},
+            {"a": "b", "c": [0.0]},
+            {"a": "b", "c": [False]},
+            {"a": "b", "c": [None]},
+            {"a": "b", "c": [[]]},
+            {"a": "b", "c": [{}]},
+        ]
+
+        result = self.fuzzer.generate_structure_type_confusion_permutations(
+            structure=test_structure, paramater_paths=test_structure_param_paths
+        )
+
+        self.assertEqual(result, expected_result)
+        self.assertEqual(
+            [type(payload["a"]) for payload in result[:6]],
+            [int, float, bool, type(None), list, dict],
+        )
+        self.assertEqual(test_structure, {"a": "b", "c": [1]})
+
+    def test_generate_key_name_permutations(self) -> None:
+        test_structure = {"id": 1, "user": {"Name": "a"}}
+        test_structure_param_paths = [["id"], ["user", "Name"]]
+
+        result = self.fuzzer.generate_key_name_permutations(
+            structure=test_structure, paramater_paths=test_structure_param_paths
+        )
+
+        self.assertIn({"ID": 1, "user": {"Name": "a"}}, result)
+        self.assertIn({"id": 1, "ID": 1, "user": {"Name": "a"}}, result)
+        self.assertIn({"__proto__": 1, "user": {"Name": "a"}}, result)
+        self.assertIn({"id": 1, "USER": {"Name": "a"}}, result)
+        self.assertIn({"id": 1, "user": {"name": "a"}}, result)
+        self.assertIn({"id": 1, "user": {"constructor": "a"}}, result)
+        self.assertEqual(list(result[0]), ["ID", "user"])
+        self.assertIs(result[0]["user"], test_structure["user"])
+        self.assertEqual(test_structure, {"id": 1, "user": {"Name": "a"}})
+
+    def test_generate_key_name_permutations_skips_existing_siblings(self) -> None:
+        test_structure = {"id": 1, "ID": 2}
+
+        result = self.fuzzer.generate_key_name_permutations(
+            structure=test_structure, paramater_paths=[["id"]]
+        )
+
+        self.assertNotIn({"ID": 1}, result)
+        self.assertNotIn({"id": 1, "ID": 1}, result)
+        self.assertIn({"__proto__": 1, "ID": 2}, result)
+        self.assertTrue(all(payload["ID"] == 2 for payload in result))
+
+        with self.assertRaises(ValueError):
+            self.fuzzer.INJECTOR.rename_key_in_structure_by_path(
+                structure=test_structure, path=["id"], new_key="ID"
+            )
+
+    def test_generate_unexpected_attribute_permutations(self) -> None:
+        test_structure = {"a": [{"b": "c"}, {"b": "d"}], "e": "f"}
+        test_structure_param_paths = [["a", 0, "b"], ["a", 1, "b"], ["e"]]
+
+        expected_result = [
+            {"a": [{"b": "c"}, {"b": "d"}], "e": "f", "role": "admin"},
+            {"a": [{"b": "c", "role": "admin"}, {"b": "d"}], "e": "f"},
+            {"a": [{"b": "c"}, {"b": "d", "role": "admin"}], "e": "f"},
+        ]
+
+        result = self.fuzzer.generate_unexpected_attribute_permutations(
+            structure=test_structure,
+            paramater_paths=test_structure_param_paths,
+            attributes={"role": "admin"},
+        )
+
+        self.assertEqual(result, expected_result)
+        self.assertEqual(test_structure, {"a": [{"b": "c"}, {"b": "d"}], "e": "f"})
+
+    def test_generate_unexpected_attribute_permutations_default(self) -> None:
+        test_structure = {"a": "b"}
+
+        result = self.fuzzer.generate_unexpected_attribute_permutations(
+            structure=test_structure, paramater_paths=[["a"]]
+        )
+
+        self.assertIn({"a": "b", "__proto__": {"polluted": True}}, result)
+        self.assertIsNot(result[0]["__proto__"], UNEXPECTED_ATTRIBUTES["__proto__"])
+
+    def test_generate_cases(self) -> None:
+        test_structure = {"a": {"b": "c", "d": "e"}}
+        test_structure_param_paths = [["a", "b"], ["a", "d"]]
+
+        result = list(
+            self.fuzzer.generate_cases(
+                structure=test_structure,
+                paramater_paths=test_structure_param_paths,
+                modes=[MODE_PARAMETER, MODE_STRUCTURE],
+                value_to_inject="x",
+            )
+        )
+
+        self.assertEqual(
+            result,
+            [
+                FuzzCase(MODE_PARAMETER, ["a", "b"], 0, {"a": {"b": "x", "d": "e"}}),
+                FuzzCase(MODE_PARAMETER, ["a", "d"], 0, {"a": {"b": "c", "d": "x"}}),
+                FuzzCase(MODE_STRUCTURE, ["a", "b"], 0, {"a": "x"}),
+            ],
+        )
+
+        for case in result:
+            self.assertEqual(
+                self.fuzzer.generate_payloads_for_path(
+                    structure=test_structure,
+                    mode=case.mode,
+                    path=case.path,
+                    value_to_inject="x",
+                )[case.variant],
+                case.payload,
+            )
+
+    def test_generate_cases_default_modes(self) -> None:
+        result = list(
+            self.fuzzer.generate_cases(structure={"a": 1}, paramater_paths=[["a"]])
+        )
+
+        self.assertNotIn(MODE_PARAMETER, {case.mode for case in result})
+        self.assertIn(MODE_TYPE_CONFUSION, {case.mode for case in result})
+
+        with self.assertRaises(ValueError):
+            list(
+                self.fuzzer.generate_cases(
+                    structure={"a": 1}, paramater_paths=[["a"]], modes=[MODE_STRUCTURE]
+                )
+            )
@@ -0,0 +1,105 @@
+import os
+import time
+import unittest
+from jsonfuzzer.core.fuzzer import MODE_PARAMETER, FuzzCase
+from jsonfuzzer.harness.harness import (
+    OUTCOME_CRASH,
+    OUTCOME_EXCEPTION,
+    OUTCOME_HANG,
+    OUTCOME_OK,
+    Harness,
+)
+
+
+def handler(request):
+    if request["name"] == "boom":
+        raise ValueError("bad name")
+    if request["name"] == "crash":
+        os._exit(3)
+    if request["name"] == "hang":
+        time.sleep(60)
+    return request
+
+
+def raw_handler(request):
+    if not isinstance(request, bytes):
+        raise TypeError("expected bytes")
+
+
+class TestHarness(unittest.TestCase):
+    def test_run_case_in_process(self):
+        harness = Harness(target=handler, workers=0)
+
+        result = harness.run_case({"name": "boom"})
+
+        self.assertEqual(result.outcome, OUTCOME_EXCEPTION)
+        self.assertEqual(result.exception_type, "ValueError")
+        self.assertEqual(result.message, "bad name")
+        self.assertTrue(result.frames[-1].endswith(":handler"))
+        self.assertGreaterEqual(result.duration, 0)
+
+    def test_run_classifies_outcomes(self):
+        cases = [
+            FuzzCase(MODE_PARAMETER, ["name"], 0, {"name": name})
+            for name in ["ok", "boom", "crash", "fine"]
+        ]
+
+        with Harness(target=handler, workers=2) as harness:
+            results = {
+                result.case.payload["name"]: result for result in harness.run(cases)
+            }
+
+        self.assertEqual(results["ok"].outcome, OUTCOME_OK)
+        self.assertEqual(results["fine"].outcome, OUTCOME_OK)
+        self.assertEqual(results["boom"].outcome, OUTCOME_EXCEPTION)
+        self.assertEqual(results["crash"].outcome, OUTCOME_CRASH)
+        self.assertEqual(results["crash"].message, "worker died with exit code 3")
+        self.assertIs(results["ok"].case, cases[0])
+
+    def test_run_reuses_pool_after_crash(self):
+        with Harness(target=handler, workers=1, max_cases_per_worker=2) as harness:
+            first = list(harness.run([{"name": "crash"}, {"name": "a"}]))
+            second = list(harness.run([{"name": "b"}, {"name": "c"}, {"name": "d"}]))
+
+        self.assertEqual(
+            [result.outcome for result in first], [OUTCOME_CRASH, OUTCOME_OK]
+        )
+        self.assertEqual([result.outcome for result in second], [OUTCOME_OK] * 3)
+
+    def test_run_serialized(self):
+        with Harness(target=raw_handler, serialize=True, workers=1) as harness:
+            results = list(harness.run([{"a": 1}]))
+
+        self.assertEqual(results[0].outcome, OUTCOME_OK)
+
+    def test_run_hang(self):
+        cases = [
+            FuzzCase(MODE_PARAMETER, ["name"], 0, {"name": name})
+            for name in ["hang", "a", "b", "c"]
+        ]
+
+        with Harness(target=handler, workers=2, timeout=0.5) as harness:
+            with self.assertLogs("jsonfuzzer.harness.harness", level="WARNING") as logs:
+                results = list(harness.run(cases))
+
+            self.assertEqual(
+                sorted(result.outcome for result in results),
+                [OUTCOME_HANG] + [OUTCOME_OK] * 3,
+            )
+            # Fast cases are not held up behind the hanging one
+            self.assertEqual(results[-1].outcome, OUTCOME_HANG)
+            self.assertIn("mode parameter at path ['name']", logs.output[0])
+
+            # The killed worker is replaced and the pool keeps working
+            self.assertEqual(
+                [result.outcome for result in harness.run([{"name": "d"}])],
+                [OUTCOME_OK],
+            )
+
+    def test_timeout_requires_workers(self):
+        with self.assertRaises(ValueError):
+            Harness(target=handler, workers=0, timeout=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1028,6 +1028,51 @@ class TestPathFinder(unittest.TestCase):
 
             self.assertEqual(result, expected_results[index])
 
+    def test_get_attribute_in_structure_by_path(self):
+        test_structure = {"a": [{"b": "c"}, ["d", {"e": 1}]]}
+
+        self.assertEqual(
+            self.injector.get_attribute_in_structure_by_path(
+                structure=test_structure, path=["a", 0, "b"]
+            ),
+            "c",
+        )
+        self.assertEqual(
+            self.injector.get_attribute_in_structure_by_path(
+                structure=test_structure, path=["a", 1, 1, "e"]
+            ),
+            1,
+        )
+
+    def test_copy_path_in_structure(self):
+        test_structure = {"a": {"b": ["c", "d"]}, "e": {"f": "g"}}
+
+        result, parent = self.injector.copy_path_in_structure(
+            structure=test_structure, path=["a", "b", 1]
+        )
+        parent[1] = "nice_one!"
+
+        self.assertEqual(result, {"a": {"b": ["c", "nice_one!"]}, "e": {"f": "g"}})
+        self.assertEqual(test_structure, {"a": {"b": ["c", "d"]}, "e": {"f": "g"}})
+        self.assertIs(result["e"], test_structure["e"])
+
+    def test_generate_value_payloads_by_path(self):
+        test_structure = {"a": [{"b": "c"}, "d"], "e": {"f": "g"}}
+
+        result = self.injector.generate_value_payloads_by_path(
+            structure=test_structure, path=["a", 0, "b"], values_to_inject=[1, None]
+        )
+
+        self.assertEqual(
+            result,
+            [
+                {"a": [{"b": 1}, "d"], "e": {"f": "g"}},
+                {"a": [{"b": None}, "d"], "e": {"f": "g"}},
+            ],
+        )
+        self.assertEqual(test_structure, {"a": [{"b": "c"}, "d"], "e": {"f": "g"}})
+        self.assertIsNot(result[0]["a"], result[1]["a"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,66 @@
+import random
+import unittest
+from jsonfuzzer.core.fuzzer import MODE_PARAMETER, MODE_STRUCTURE, FuzzCase
+from jsonfuzzer.harness.harness import Harness
+from jsonfuzzer.triage.latency import LatencyTracker, P2Quantile
+
+
+class TestLatency(unittest.TestCase):
+    def test_p2_quantile_accuracy(self):
+        generator = random.Random(1)
+        samples = [generator.expovariate(1.0) for _ in range(20000)]
+
+        for quantile in [0.5, 0.9, 0.99]:
+            estimator = P2Quantile(quantile)
+            for sample in samples:
+                estimator.add(sample)
+
+            exact = sorted(samples)[int(quantile * len(samples))]
+            self.assertAlmostEqual(estimator.value(), exact, delta=exact * 0.05)
+
+    def test_p2_quantile_few_samples(self):
+        estimator = P2Quantile(0.5)
+        self.assertIsNone(estimator.value())
+
+        for sample in [3, 1, 2]:
+            estimator.add(sample)
+        self.assertEqual(estimator.value(), 2)
+
+    def test_tracker_deviations(self):
+        tracker = LatencyTracker(min_samples=10)
+        generator = random.Random(2)
+
+        for _ in range(200):
+            tracker.observe_baseline(generator.uniform(0.01, 0.02))
+            tracker.observe(MODE_PARAMETER, ["fast"], generator.uniform(0.01, 0.02))
+            tracker.observe(MODE_PARAMETER, ["slow"], generator.uniform(0.05, 0.1))
+        for _ in range(5):
+            tracker.observe(MODE_STRUCTURE, ["rare"], 1.0)
+
+        deviations = tracker.deviations()
+
+        self.assertEqual(len(tracker), 4)
+        self.assertEqual(
+            [deviation[:2] for deviation in deviations], [(MODE_PARAMETER, ["slow"])]
+        )
+        self.assertGreater(deviations[0][2], 0.09)
+        self.assertLess(tracker.quantile(MODE_PARAMETER, ["fast"], 0.5), 0.02)
+
+    def test_tracker_fed_by_harness(self):
+        tracker = LatencyTracker()
+        cases = [FuzzCase(MODE_PARAMETER, ["a"], 0, {"a": index}) for index in range(3)]
+
+        with Harness(
+            target=lambda payload: None, workers=1, on_result=tracker.observe_result
+        ) as harness:
+            list(harness.run(cases))
+        Harness(
+            target=lambda payload: None, workers=0, on_result=tracker.observe_result
+        ).run_case({"a": 1})
+
+        self.assertEqual(len(tracker), 1)
+        self.assertIsNotNone(tracker.quantile(MODE_PARAMETER, ["a"], 0.99))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from jsonfuzzer.parser.leaf_index import (
+    LEAF_BOOLEAN,
+    LEAF_FLOAT,
+    LEAF_INTEGER,
+    LEAF_NULL,
+    LEAF_STRING,
+)
+from jsonfuzzer.parser.path_finder import PathFinder
+
+
+class TestLeafIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.path_finder = PathFinder()
+        self.test_structure = {
+            "id": "123e4567-e89b-12d3-a456-426614174000",
+            "email": "jane@example.com",
+            "born": "1990-01-31",
+            "age": 33,
+            "balance": 2**40,
+            "score": 1.5,
+            "active": True,
+            "manager": None,
+            "hobbies": [{"name": "climbing"}],
+        }
+        self.leaf_index = self.path_finder.map_leaf_index(structure=self.test_structure)
+        return super().setUp()
+
+    def test_leaf_index_types(self):
+        self.assertEqual(
+            self.leaf_index.types,
+            [
+                LEAF_STRING,
+                LEAF_STRING,
+                LEAF_STRING,
+                LEAF_INTEGER,
+                LEAF_INTEGER,
+                LEAF_FLOAT,
+                LEAF_BOOLEAN,
+                LEAF_NULL,
+                LEAF_STRING,
+            ],
+        )
+        self.assertEqual(
+            self.leaf_index.paths, self.path_finder.map_structure(self.test_structure)
+        )
+
+    def test_leaf_index_features(self):
+        self.assertEqual(self.leaf_index.select(uuid=True), [["id"]])
+        self.assertEqual(self.leaf_index.select(email=True), [["email"]])
+        self.assertEqual(self.leaf_index.select(date=True), [["born"]])
+        self.assertEqual(self.leaf_index.select(int_ranges=["int8"]), [["age"]])
+        self.assertEqual(self.leaf_index.select(int_ranges=["int64"]), [["balance"]])
+        self.assertEqual(
+            self.leaf_index.select(types=[LEAF_STRING], max_length=10),
+            [["born"], ["hobbies", 0, "name"]],
+        )
+
+    def test_leaf_index_payload_class(self):
+        self.assertEqual(
+            self.leaf_index.paths_for_payload_class("numeric"),
+            [["age"], ["balance"], ["score"]],
+        )
+        self.assertEqual(
+            self.leaf_index.paths_for_payload_class("string"),
+            [["id"], ["email"], ["born"], ["hobbies", 0, "name"]],
+        )
+
+        with self.assertRaises(ValueError):
+            self.leaf_index.paths_for_payload_class("unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
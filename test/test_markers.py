@@ -0,0 +1,185 @@
+import os
+import tempfile
+import unittest
+from jsonfuzzer.core.fuzzer import MODE_MARKER, MODE_TYPE_CONFUSION, Fuzzer
+from jsonfuzzer.core.markers import MarkedTemplate, Marker
+from jsonfuzzer.parser.embedded import EMBEDDED_JSON
+from jsonfuzzer.parser.path_finder import PathFinder
+from jsonfuzzer.corpus.case_log import CaseLog, CaseLogWriter, Replayer
+
+TEMPLATE = {
+    "user": "§admin§",
+    "auth": {"header": "Bearer §token§", "scheme": "basic"},
+    "items": [{"id": 1, "sku": "§sku§-v2"}],
+    "note": "plain",
+}
+
+
+class TestMarkedTemplate(unittest.TestCase):
+    def setUp(self) -> None:
+        self.template = MarkedTemplate(TEMPLATE)
+        return super().setUp()
+
+    def test_markers_are_indexed_and_stripped(self):
+        self.assertEqual(
+            self.template.markers,
+            [
+                Marker(name="admin", path=["user"], prefix="", suffix=""),
+                Marker(
+                    name="token", path=["auth", "header"], prefix="Bearer ", suffix=""
+                ),
+                Marker(name="sku", path=["items", 0, "sku"], prefix="", suffix="-v2"),
+            ],
+        )
+        self.assertEqual(self.template.index["token"][0].path, ["auth", "header"])
+        self.assertEqual(
+            self.template.structure,
+            {
+                "user": "admin",
+                "auth": {"header": "Bearer token", "scheme": "basic"},
+                "items": [{"id": 1, "sku": "sku-v2"}],
+                "note": "plain",
+            },
+        )
+        self.assertEqual(TEMPLATE["user"], "§admin§")
+
+    def test_generate_cases_only_at_markers(self):
+        cases = list(self.template.generate_cases({"small": ["x", 7]}))
+
+        self.assertEqual(len(cases), 6)
+        self.assertEqual(
+            [case.payload["user"] for case in cases[:2]],
+            ["x", 7],
+        )
+        self.assertEqual(
+            [case.payload["auth"]["header"] for case in cases[2:4]],
+            ["Bearer x", "Bearer 7"],
+        )
+        self.assertEqual(cases[5].payload["items"][0]["sku"], "7-v2")
+        self.assertEqual(
+            {(case.mode, case.corpus) for case in cases}, {(MODE_MARKER, "small")}
+        )
+        self.assertEqual([case.corpus_index for case in cases[:2]], [0, 1])
+
+        # Siblings of the marked path are shared rather than copied
+        self.assertIs(cases[0].payload["auth"], self.template.structure["auth"])
+
+    def test_generate_cases_by_name(self):
+        cases = list(
+            self.template.generate_cases({"small": ["x"]}, names=["sku", "missing"])
+        )
+
+        self.assertEqual([case.path for case in cases], [["items", 0, "sku"]])
+
+    def test_cases_regenerate_from_the_marked_template(self):
+        corpora = {"small": ["x", 7], "other": [{"a": 1}]}
+        cases = list(self.template.generate_cases(corpora))
+        fuzzer = Fuzzer()
+
+        for case in cases:
+            self.assertEqual(
+                fuzzer.generate_payloads_for_path(
+                    structure=TEMPLATE,
+                    mode=case.mode,
+                    path=case.path,
+                    value_to_inject=corpora[case.corpus][case.corpus_index],
+                )[case.variant],
+                case.payload,
+            )
+        self.assertEqual(
+            fuzzer.count_payloads_for_path(TEMPLATE, MODE_MARKER, ["note"]), 0
+        )
+
+    def test_case_log_round_trip(self):
+        corpora = {"small": ["x", 7]}
+        cases = list(self.template.generate_cases(corpora))
+
+        with tempfile.TemporaryDirectory() as directory:
+            log_path = os.path.join(directory, "cases.log")
+            with CaseLogWriter(
+                log_path,
+                self.template.template,
+                self.template.paramater_paths,
+                corpora=corpora,
+            ) as writer:
+                for case in cases:
+                    writer.append(case)
+
+            with CaseLog(log_path) as case_log:
+                replayed = [
+                    case
+                    for _, case in Replayer(
+                        case_log, self.template.template, corpora=corpora
+                    )
+                ]
+
+        self.assertEqual(replayed, cases)
+        self.assertEqual(replayed[3].payload["auth"]["header"], "Bearer 7")
+
+    def test_markers_in_embedded_json(self):
+        template = {"meta": '{"note":"price §5§ each"}', "raw": '{"a":"§x§"}'}
+        paths = PathFinder().map_embedded_structure(structure=template)
+        fuzzer = Fuzzer()
+
+        cases = list(fuzzer.generate_cases(template, paths, value_to_inject="X"))
+        marker_cases = [case for case in cases if case.mode == MODE_MARKER]
+
+        self.assertEqual(
+            [case.path for case in marker_cases],
+            [["meta", EMBEDDED_JSON, "note"], ["raw", EMBEDDED_JSON, "a"]],
+        )
+        self.assertEqual(
+            marker_cases[0].payload,
+            {"meta": '{"note":"price X each"}', "raw": '{"a":"x"}'},
+        )
+        for path in paths + PathFinder().map_structure(structure=template):
+            self.assertEqual(
+                fuzzer.count_payloads_for_path(template, MODE_MARKER, path),
+                len(
+                    fuzzer.generate_payloads_for_path(
+                        template, MODE_MARKER, path, value_to_inject="X"
+                    )
+                ),
+            )
+
+        self.assertEqual(
+            MarkedTemplate(template).markers[0],
+            Marker(
+                name="5",
+                path=["meta", EMBEDDED_JSON, "note"],
+                prefix="price ",
+                suffix=" each",
+            ),
+        )
+
+    def test_marker_cache_across_templates(self):
+        other = {"user": "§name§ (guest)"}
+        fuzzer = Fuzzer()
+
+        for _ in range(2):
+            self.assertEqual(
+                fuzzer.generate_payloads_for_path(TEMPLATE, MODE_MARKER, ["user"], "x"),
+                [dict(self.template.structure, user="x")],
+            )
+            self.assertEqual(
+                fuzzer.generate_payloads_for_path(other, MODE_MARKER, ["user"], "x"),
+                [{"user": "x (guest)"}],
+            )
+
+    def test_other_modes_on_marked_paths(self):
+        cases = list(
+            Fuzzer().generate_cases(
+                structure=self.template.structure,
+                paramater_paths=self.template.paramater_paths,
+                modes=[MODE_TYPE_CONFUSION],
+            )
+        )
+
+        self.assertTrue(cases)
+        self.assertTrue(
+            all(case.path in self.template.paramater_paths for case in cases)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import unittest
+from jsonfuzzer.core.minimizer import Minimizer
+
+
+def reproduces(structure):
+    # The "bug" needs a user with a name containing "<" somewhere in a list of users
+    users = structure.get("users") if isinstance(structure, dict) else None
+    return isinstance(users, list) and any(
+        isinstance(user, dict)
+        and isinstance(user.get("name"), str)
+        and "<" in user["name"]
+        for user in users
+    )
+
+
+class TestMinimizer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.test_structure = {
+            "id": "123",
+            "meta": {"tags": ["a", "b", "c"], "created": "today"},
+            "users": [
+                {"name": "jane", "roles": ["admin"]},
+                {"name": "padding padding <script> padding", "age": 30},
+                {"name": "john", "roles": []},
+            ],
+        }
+        return super().setUp()
+
+    def test_minimize(self):
+        result = Minimizer(predicate=reproduces, workers=4).minimize(
+            self.test_structure
+        )
+
+        self.assertEqual(result, {"users": [{"name": "<"}]})
+        self.assertEqual(self.test_structure["users"][0]["name"], "jane")
+
+    def test_minimize_is_deterministic_across_worker_counts(self):
+        results = [
+            Minimizer(predicate=reproduces, workers=workers).minimize(
+                self.test_structure
+            )
+            for workers in [1, 3, 8]
+        ]
+
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0], results[2])
+
+    def test_minimize_runs_candidates_concurrently(self):
+        threads = set()
+
+        def predicate(structure):
+            threads.add(threading.get_ident())
+            time.sleep(0.001)
+            return reproduces(structure)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            Minimizer(predicate=predicate, workers=4, executor=executor).minimize(
+                self.test_structure
+            )
+
+        self.assertGreater(len(threads), 1)
+
+    def test_minimize_removes_chunks(self):
+        calls = []
+        shared = {"large": list(range(1000))}
+
+        def predicate(structure):
+            calls.append(structure)
+            return 517 in structure.get("items", [])
+
+        result = Minimizer(predicate=predicate, workers=1).minimize(
+            {"items": list(range(1024)), "shared": shared}
+        )
+
+        self.assertEqual(result, {"items": [517]})
+        # Removing one item at a time would take over a thousand calls
+        self.assertLess(len(calls), 100)
+        # Candidates only copy the containers along the reduced path
+        self.assertTrue(
+            any(structure.get("shared") is shared for structure in calls[1:])
+        )
+
+    def test_minimize_requires_reproducing_input(self):
+        with self.assertRaises(ValueError):
+            Minimizer(predicate=reproduces).minimize({"users": []})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from jsonfuzzer.core.mutator import INT_BOUNDARIES, Mutator
+
+
+class TestMutator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mutator = Mutator()
+        return super().setUp()
+
+    def test_mutate_value_int(self):
+        result = self.mutator.mutate_value(100)
+
+        self.assertNotIn(
+            100, [mutation for mutation in result if type(mutation) is int]
+        )
+        self.assertEqual(result[:3], [101, 99, -100])
+        self.assertIn(101, result)
+        self.assertIn(100 ^ 1, result)
+        self.assertIn(100.0, result)
+        self.assertIn("100", result)
+        for boundary in INT_BOUNDARIES:
+            self.assertIn(boundary, result)
+        self.assertEqual(len(result), len(set(map(repr, result))))
+
+    def test_mutate_value_float(self):
+        result = self.mutator.mutate_value(1.5)
+        floats = [repr(mutation) for mutation in result if type(mutation) is float]
+
+        self.assertIn("0.0", floats)
+        self.assertIn("-0.0", floats)
+        self.assertEqual(floats.count("nan"), 1)
+        self.assertNotIn("1.5", floats)
+        self.assertEqual(len(floats), len(set(floats)))
+        self.assertEqual(
+            [repr(mutation) for mutation in self.mutator.mutate_value(-0.0)].count(
+                "-0.0"
+            ),
+            0,
+        )
+
+    def test_mutate_value_str(self):
+        result = self.mutator.mutate_value("abc")
+
+        self.assertNotIn("abc", result)
+        for expected in ["", "a", "ab", "ABC", "abc" * 256, "\uff41\uff42\uff43"]:
+            self.assertIn(expected, result)
+        self.assertIn("\u0430b\u0441", result)  # Cyrillic homoglyphs
+        self.assertIn("Abc", result)  # Case bit flipped in the first character
+        self.assertIn("abb", result)  # Low bit flipped in the last character
+
+    def test_mutate_value_bool(self):
+        self.assertEqual(self.mutator.mutate_value(True), [False, 1, "true"])
+
+    def test_mutate_value_unsupported(self):
+        self.assertEqual(self.mutator.mutate_value(None), [])
+        self.assertEqual(self.mutator.mutate_value({"a": "b"}), [])
+
+    def test_generate_mutation_batches(self):
+        test_structure = {"a": "xy", "b": [True, None]}
+        test_paths = [["a"], ["b", 0], ["b", 1]]
+
+        batches = list(
+            self.mutator.generate_mutation_batches(
+                structure=test_structure, paramater_paths=test_paths, batch_size=4
+            )
+        )
+        pairs = [pair for batch in batches for pair in batch]
+
+        self.assertTrue(all(len(batch) <= 4 for batch in batches))
+        self.assertEqual(
+            [pair[0] for pair in pairs].count(["a"]),
+            len(self.mutator.mutate_value("xy")),
+        )
+        self.assertEqual(
+            pairs[-3:], [(["b", 0], False), (["b", 0], 1), (["b", 0], "true")]
+        )
+
+    def test_mutate_key(self):
+        result = self.mutator.mutate_key("id")
+
+        self.assertNotIn("id", result)
+        self.assertEqual(result[:3], ["ID", "\uff49\uff44", "id "])
+        for expected in ["id ", " id", "id\u0000", "", "__proto__", "constructor"]:
+            self.assertIn(expected, result)
+
+
+if __name__ == "__main__":
+    unittest.main()
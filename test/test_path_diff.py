@@ -0,0 +1,97 @@
+import unittest
+from jsonfuzzer.core.fuzzer import MODE_MUTATION, Fuzzer
+from jsonfuzzer.parser.path_diff import diff_structures
+from jsonfuzzer.parser.path_finder import PathFinder
+
+OLD = {
+    "name": "Jane",
+    "age": 30,
+    "hobbies": [{"name": "climbing"}, {"name": "skating"}],
+    "address": {"city": "Paris", "zip": "75001"},
+}
+
+
+class TestPathDiff(unittest.TestCase):
+    def setUp(self) -> None:
+        self.path_finder = PathFinder()
+        self.old_paths = self.path_finder.map_structure(structure=OLD)
+        return super().setUp()
+
+    def diff(self, new):
+        path_diff = diff_structures(OLD, self.old_paths, new)
+        self.assertEqual(
+            path_diff.paramater_paths, self.path_finder.map_structure(structure=new)
+        )
+        return path_diff
+
+    def test_unchanged(self):
+        path_diff = self.diff(dict(OLD))
+
+        self.assertEqual(
+            (path_diff.added, path_diff.removed, path_diff.changed), ([], [], [])
+        )
+
+    def test_added_removed_and_changed(self):
+        new = {
+            "name": "Jane",
+            "age": "30",
+            "hobbies": [{"name": "climbing", "level": 1}],
+            "address": {"city": "Paris", "zip": "75001"},
+            "email": "jane@example.com",
+        }
+
+        path_diff = self.diff(new)
+
+        self.assertEqual(path_diff.added, [["hobbies", 0, "level"], ["email"]])
+        self.assertEqual(path_diff.removed, [["hobbies", 1, "name"]])
+        self.assertEqual(path_diff.changed, [["age"]])
+
+    def test_type_changes(self):
+        new = dict(OLD, address="Paris", age={"years": 30})
+
+        path_diff = self.diff(new)
+
+        self.assertEqual(path_diff.added, [["age", "years"], ["address"]])
+        self.assertEqual(
+            path_diff.removed, [["age"], ["address", "city"], ["address", "zip"]]
+        )
+
+    def test_equal_values_of_other_types_are_changed(self):
+        old = {"flags": [1, 0.0, {"on": True}], "count": 1}
+        new = {"flags": [True, 0, {"on": 1}], "count": 1}
+
+        path_diff = diff_structures(
+            old, self.path_finder.map_structure(structure=old), new
+        )
+
+        self.assertEqual(
+            path_diff.changed, [["flags", 0], ["flags", 1], ["flags", 2, "on"]]
+        )
+
+    def test_reordered_keys(self):
+        new = dict(OLD, address={"zip": "75001", "city": "Paris"})
+
+        path_diff = self.diff(new)
+
+        self.assertEqual(
+            (path_diff.added, path_diff.removed, path_diff.changed), ([], [], [])
+        )
+
+    def test_only_affected_cases_are_regenerated(self):
+        new = dict(OLD, email="jane@example.com")
+        path_diff = self.diff(new)
+
+        cases = list(
+            Fuzzer().generate_cases(
+                structure=new,
+                paramater_paths=path_diff.affected,
+                modes=[MODE_MUTATION],
+            )
+        )
+
+        self.assertTrue(cases)
+        self.assertEqual({tuple(case.path) for case in cases}, {("email",)})
+
+
+if __name__ == "__main__":
+    unittest.main()
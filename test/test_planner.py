@@ -0,0 +1,169 @@
+import unittest
+from jsonfuzzer.core.fuzzer import (
+    MODE_MISSING_ATTRIBUTE,
+    MODE_MUTATION,
+    MODE_PARAMETER,
+    MODE_TYPE_CONFUSION,
+    Fuzzer,
+)
+from jsonfuzzer.core.planner import Planner
+from jsonfuzzer.parser.path_finder import PathFinder
+
+TEMPLATE = {"name": "Jane", "age": 30, "tags": ["a", "b"]}
+PATHS = PathFinder().map_structure(structure=TEMPLATE)
+
+
+class TestPlanner(unittest.TestCase):
+    def test_counts(self):
+        planner = Planner(TEMPLATE, PATHS, corpora={"small": ["x", "y"], "empty": []})
+
+        counts = planner.counts()
+
+        self.assertEqual(counts[MODE_PARAMETER], 2 * len(PATHS))
+        self.assertEqual(counts[MODE_TYPE_CONFUSION], 6 * len(PATHS))
+        self.assertEqual(
+            counts[MODE_MUTATION],
+            sum(
+                len(
+                    Fuzzer().generate_payloads_for_path(
+                        structure=TEMPLATE, mode=MODE_MUTATION, path=path
+                    )
+                )
+                for path in PATHS
+            ),
+        )
+
+    def test_value_modes_require_corpora(self):
+        with self.assertRaises(ValueError):
+            Planner(TEMPLATE, PATHS, modes=[MODE_PARAMETER])
+
+    def test_unbounded_plan_covers_every_case(self):
+        planner = Planner(TEMPLATE, PATHS, modes=[MODE_MUTATION, MODE_TYPE_CONFUSION])
+
+        cases = list(planner.cases())
+
+        self.assertEqual(
+            len(cases),
+            len(
+                list(
+                    Fuzzer().generate_cases(
+                        structure=TEMPLATE,
+                        paramater_paths=PATHS,
+                        modes=[MODE_MUTATION, MODE_TYPE_CONFUSION],
+                    )
+                )
+            ),
+        )
+        self.assertEqual(sum(planner.counts().values()), 0)
+
+    def test_request_budget_is_split_by_weight(self):
+        planner = Planner(
+            TEMPLATE,
+            PATHS,
+            modes=[MODE_MUTATION, MODE_TYPE_CONFUSION],
+            max_cases=35,
+            weights={MODE_MUTATION: 4.0, MODE_TYPE_CONFUSION: 1.0},
+        )
+
+        plan = planner.plan()
+        planned = {
+            mode: sum(item.cases for item in plan if item.mode == mode)
+            for mode in (MODE_MUTATION, MODE_TYPE_CONFUSION)
+        }
+
+        self.assertEqual(planned, {MODE_MUTATION: 28, MODE_TYPE_CONFUSION: 7})
+        # Spread over every path of the mode
+        self.assertEqual(
+            {tuple(item.path) for item in plan if item.mode == MODE_MUTATION},
+            {tuple(path) for path in PATHS},
+        )
+
+        cases = list(planner.cases())
+
+        self.assertEqual(len(cases), 35)
+        self.assertEqual(cases[0].mode, MODE_MUTATION)
+        self.assertEqual(cases[1].mode, MODE_TYPE_CONFUSION)
+
+    def test_small_mode_hands_back_its_share(self):
+        planner = Planner(
+            TEMPLATE,
+            PATHS,
+            modes=[MODE_MISSING_ATTRIBUTE, MODE_MUTATION],
+            max_cases=60,
+        )
+
+        plan = planner.plan()
+
+        self.assertEqual(
+            sum(item.cases for item in plan if item.mode == MODE_MISSING_ATTRIBUTE),
+            planner.counts()[MODE_MISSING_ATTRIBUTE],
+        )
+        self.assertEqual(sum(item.cases for item in plan), 60)
+
+    def test_rounding_remainder_is_spent(self):
+        planner = Planner(
+            TEMPLATE,
+            PATHS,
+            modes=[MODE_MISSING_ATTRIBUTE, MODE_MUTATION, MODE_TYPE_CONFUSION],
+            max_cases=10,
+            weights={
+                MODE_MISSING_ATTRIBUTE: 1.0,
+                MODE_MUTATION: 1.0,
+                MODE_TYPE_CONFUSION: 1.0,
+            },
+        )
+
+        self.assertEqual(sum(item.cases for item in planner.plan()), 10)
+
+    def test_payloads_are_generated_lazily(self):
+        planner = Planner(TEMPLATE, PATHS, corpora={"small": ["x"]}, max_cases=5)
+
+        self.assertEqual(planner._payloads, {})
+        self.assertEqual(planner._value_payloads, {})
+        self.assertEqual(len(list(planner.cases())), 5)
+
+    def test_time_budget_uses_measured_cost(self):
+        planner = Planner(
+            TEMPLATE,
+            PATHS,
+            modes=[MODE_MUTATION, MODE_TYPE_CONFUSION],
+            max_seconds=10.0,
+            weights={MODE_MUTATION: 1.0, MODE_TYPE_CONFUSION: 1.0},
+        )
+        planner.observe(MODE_MUTATION, seconds=1.0, cases=10)
+        planner.observe(MODE_TYPE_CONFUSION, seconds=1.0)
+
+        planned = {
+            mode: sum(item.cases for item in planner.plan() if item.mode == mode)
+            for mode in (MODE_MUTATION, MODE_TYPE_CONFUSION)
+        }
+
+        # Five seconds each, at 0.1s and 1s per case
+        self.assertEqual(planned, {MODE_MUTATION: 50, MODE_TYPE_CONFUSION: 5})
+
+    def test_cases_stop_at_the_deadline(self):
+        planner = Planner(TEMPLATE, PATHS, max_seconds=0.0)
+
+        self.assertEqual(list(planner.cases()), [])
+
+    def test_corpus_cases_are_tagged(self):
+        corpora = {"first": ["x", "y"], "second": ["z"]}
+        planner = Planner(TEMPLATE, PATHS, modes=[MODE_PARAMETER], corpora=corpora)
+
+        cases = list(planner.cases())
+
+        self.assertEqual(len(cases), 3 * len(PATHS))
+        for case in cases:
+            self.assertEqual(
+                case.payload,
+                Fuzzer().generate_payloads_for_path(
+                    structure=TEMPLATE,
+                    mode=case.mode,
+                    path=case.path,
+                    value_to_inject=corpora[case.corpus][case.corpus_index],
+                )[case.variant],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
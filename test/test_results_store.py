@@ -0,0 +1,86 @@
+import os
+import tempfile
+import time
+import unittest
+from jsonfuzzer.core.fuzzer import MODE_MUTATION, MODE_PARAMETER, FuzzCase
+from jsonfuzzer.harness.harness import OUTCOME_EXCEPTION, OUTCOME_OK, Harness
+from jsonfuzzer.triage.results_store import ResultsStore
+from jsonfuzzer.util.util import Util
+
+
+def reject_negative(payload):
+    if payload["a"] < 0:
+        raise ValueError(f"negative: {payload['a']}")
+
+
+class TestResultsStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.database = os.path.join(self.directory.name, "results.db")
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        return super().tearDown()
+
+    def test_query_by_path_pattern_and_status(self):
+        with ResultsStore(self.database, batch_size=2) as store:
+            for index in range(3):
+                path = ["hobbies", index, "name"]
+                case = FuzzCase(MODE_PARAMETER, path, 0, {"hobbies": [index]})
+                store.add_response(case, status=500 if index else 200, body="error")
+            store.add_response(
+                FuzzCase(MODE_PARAMETER, ["name"], 0, {"name": 1}), 500, "error"
+            )
+
+            results = store.query(path_pattern="hobbies[*].name", status=500)
+
+            self.assertEqual(
+                [result.path for result in results],
+                [["hobbies", 1, "name"], ["hobbies", 2, "name"]],
+            )
+            self.assertEqual(results[0].payload, {"hobbies": [1]})
+            self.assertEqual(store.count(status=500), 3)
+            self.assertEqual(store.count(path=["hobbies", 0, "name"]), 1)
+            self.assertEqual(len(store.query(limit=2)), 2)
+
+    def test_harness_results_and_signatures(self):
+        cases = [
+            FuzzCase(MODE_MUTATION, ["a"], index, {"a": value})
+            for index, value in enumerate([1, -1, -2])
+        ]
+        with ResultsStore(self.database) as store:
+            with Harness(
+                reject_negative, workers=0, on_result=store.add_result
+            ) as harness:
+                list(harness.run(cases))
+
+        # Reopening sees everything that was flushed on close
+        with ResultsStore(self.database) as store:
+            failures = store.query(outcome=OUTCOME_EXCEPTION)
+
+            self.assertEqual(len(failures), 2)
+            self.assertEqual(failures[0].signature, failures[1].signature)
+            self.assertEqual(store.count(signature=failures[0].signature), 2)
+            self.assertEqual(store.count(outcome=OUTCOME_OK, mode=MODE_MUTATION), 1)
+
+    def test_bulk_insert_throughput(self):
+        case = FuzzCase(MODE_PARAMETER, ["a", 0, "b"], 0, {"a": [{"b": 1}]})
+
+        with ResultsStore(self.database) as store:
+            started = time.perf_counter()
+            for _ in range(20000):
+                store.add_response(case, status=200, body="ok")
+            store.flush()
+            elapsed = time.perf_counter() - started
+
+            self.assertEqual(store.count(path_pattern="a[*].b"), 20000)
+        self.assertLess(elapsed, 5.0)
+
+    def test_format_path(self):
+        self.assertEqual(Util.format_path(["hobbies", 1, "name"]), "hobbies[1].name")
+        self.assertEqual(Util.format_path([0, "a", 2], wildcard=True), "[*].a[*]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import json
+import multiprocessing
+import unittest
+from jsonfuzzer.core.fuzzer import MODE_PARAMETER, FuzzCase
+from jsonfuzzer.harness.ring import SharedRing
+
+
+def read_all(ring, results):
+    received = [json.loads(bytes(data)) for data in ring.consume(timeout=10)]
+    results.put(received)
+    ring.close()
+
+
+class TestSharedRing(unittest.TestCase):
+    def run_readers(self, context, readers, payloads):
+        ring = SharedRing(slots=4, slot_size=256, context=context)
+        self.addCleanup(ring.close)
+        results = context.Queue()
+        processes = [
+            context.Process(target=read_all, args=(ring, results))
+            for _ in range(readers)
+        ]
+        for process in processes:
+            process.start()
+
+        for payload in payloads:
+            ring.write_payload(payload, timeout=10)
+        ring.close_writers(readers, timeout=10)
+
+        received = [results.get(timeout=10) for _ in processes]
+        for process in processes:
+            process.join(timeout=10)
+            self.assertEqual(process.exitcode, 0)
+
+        return received
+
+    def test_readers_receive_every_payload_once(self):
+        payloads = [{"a": index} for index in range(100)]
+
+        received = self.run_readers(multiprocessing.get_context("fork"), 3, payloads)
+
+        self.assertEqual(
+            sorted(item["a"] for chunk in received for item in chunk),
+            list(range(100)),
+        )
+        for chunk in received:
+            self.assertEqual(chunk, sorted(chunk, key=lambda item: item["a"]))
+
+    def test_spawned_readers_attach_by_name(self):
+        payloads = [FuzzCase(MODE_PARAMETER, ["a"], 0, {"a": "x"})] * 5
+
+        received = self.run_readers(multiprocessing.get_context("spawn"), 1, payloads)
+
+        self.assertEqual(received, [[{"a": "x"}] * 5])
+
+    def test_backpressure_and_out_of_order_release(self):
+        with SharedRing(slots=2, slot_size=16) as ring:
+            ring.write(b"first")
+            ring.write(b"second")
+            with self.assertRaises(TimeoutError):
+                ring.write(b"third", timeout=0.05)
+
+            first = ring.read()
+            second = ring.read()
+            self.assertEqual(bytes(first.data), b"first")
+            self.assertEqual(bytes(second.data), b"second")
+
+            # The next write goes to the first slot, which is still being read
+            second.release()
+            with self.assertRaises(TimeoutError):
+                ring.write(b"third", timeout=0.05)
+            first.release()
+            ring.write(b"third", timeout=0.05)
+
+            with ring.read() as data:
+                self.assertEqual(bytes(data), b"third")
+            with self.assertRaises(TimeoutError):
+                ring.read(timeout=0.05)
+
+    def test_oversized_payload(self):
+        with SharedRing(slots=1, slot_size=8) as ring:
+            with self.assertRaises(ValueError):
+                ring.write(b"12345")
+
+
+if __name__ == "__main__":
+    unittest.main()
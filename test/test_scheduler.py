@@ -0,0 +1,82 @@
+import unittest
+from jsonfuzzer.core.scheduler import Scheduler
+
+PATHS = [["a"], ["b", 0], ["c", "d"]]
+PAYLOADS = {
+    "sqli": ["' or 1=1", "1;--", '" or ""'],
+    "xss": ["<svg>", "<img>"],
+    "empty": [],
+}
+
+
+class TestScheduler(unittest.TestCase):
+    def test_scheduler_covers_everything_once(self):
+        items = list(Scheduler(PATHS, PAYLOADS, seed=1))
+
+        self.assertEqual(len(items), len(PATHS) * 5)
+        self.assertEqual(
+            len({(tuple(item.path), item.payload_class, item.index) for item in items}),
+            len(items),
+        )
+        for item in items:
+            self.assertEqual(
+                item.value_to_inject, PAYLOADS[item.payload_class][item.index]
+            )
+
+    def test_scheduler_is_deterministic(self):
+        def run(seed):
+            scheduler = Scheduler(PATHS, PAYLOADS, seed=seed)
+            order = []
+            for item in scheduler:
+                order.append((item.path, item.payload_class, item.index))
+                scheduler.reward(item.path, item.payload_class, item.path == ["c", "d"])
+            return order
+
+        self.assertEqual(run(7), run(7))
+        self.assertNotEqual(run(7), run(8))
+
+    def test_scheduler_favours_rewarded_arms(self):
+        paths = [[index] for index in range(20)]
+        payloads = {
+            "numeric": list(range(50)),
+            "string": [str(index) for index in range(50)],
+        }
+        scheduler = Scheduler(paths, payloads, seed=1)
+
+        first_hundred = []
+        for item in scheduler:
+            first_hundred.append(item)
+            scheduler.reward(
+                item.path,
+                item.payload_class,
+                item.path == [7] and item.payload_class == "string",
+            )
+            if len(first_hundred) == 100:
+                break
+
+        hot = [item for item in first_hundred if item.path == [7]]
+        self.assertGreater(len(hot), 20)  # Uniform scheduling would give ~5
+        path_means, class_means = scheduler.posterior_means()
+        self.assertEqual(max(path_means, key=path_means.get), (7,))
+        self.assertGreater(class_means["string"], class_means["numeric"])
+
+    def test_scheduler_tracks_active_paths(self):
+        paths = [[index] for index in range(50)]
+        payloads = {"numeric": list(range(3)), "string": ["a"]}
+        scheduler = Scheduler(paths, payloads, seed=5)
+
+        items = []
+        for item in scheduler:
+            items.append(item)
+            scheduler.reward(item.path, item.payload_class, item.index % 2)
+
+        self.assertEqual(len(items), len(paths) * 4)
+        self.assertEqual(scheduler._groups, {})
+        self.assertEqual(scheduler._positions, {})
+        # Rewarding a path with nothing left doesn't bring it back
+        scheduler.reward([0], "string", 1)
+        self.assertEqual(list(scheduler), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from jsonfuzzer.parser.leaf_index import LEAF_INTEGER, LEAF_NULL, LEAF_STRING
+from jsonfuzzer.parser.schema_merger import TYPE_OBJECT, SchemaMerger
+
+
+class TestSchemaMerger(unittest.TestCase):
+    def test_union_template(self):
+        merger = SchemaMerger()
+        merger.add_all(
+            [
+                {"name": "Jane", "age": 30},
+                {"name": "John", "email": "john@example.com"},
+                {"name": None, "hobbies": [{"name": "climbing"}, {"level": 2}]},
+            ]
+        )
+
+        self.assertEqual(
+            merger.template(),
+            {
+                "name": "Jane",
+                "age": 30,
+                "email": "john@example.com",
+                "hobbies": [{"name": "climbing"}, {"level": 2}],
+            },
+        )
+        self.assertEqual(
+            merger.paramater_paths(),
+            [
+                ["name"],
+                ["age"],
+                ["email"],
+                ["hobbies", 0, "name"],
+                ["hobbies", 1, "level"],
+            ],
+        )
+
+    def test_stats(self):
+        merger = SchemaMerger()
+        for document in [{"id": 1, "tag": "a"}, {"id": "2"}, {"id": 3}, {"id": None}]:
+            merger.add(document)
+
+        stats = {tuple(stat.path): stat for stat in merger.stats()}
+
+        self.assertEqual(merger.documents, 4)
+        self.assertEqual(stats[("id",)].presence, 1.0)
+        self.assertEqual(
+            stats[("id",)].types, {LEAF_INTEGER: 2, LEAF_STRING: 1, LEAF_NULL: 1}
+        )
+        self.assertEqual(stats[("tag",)].presence, 0.25)
+        self.assertEqual(merger.template(), {"id": 1, "tag": "a"})
+
+    def test_container_wins_over_primitive(self):
+        merger = SchemaMerger()
+        merger.add_all([{"meta": None}, {"meta": {"trace": "x"}}])
+
+        stats = {tuple(stat.path): stat for stat in merger.stats()}
+
+        self.assertEqual(merger.template(), {"meta": {"trace": "x"}})
+        self.assertEqual(stats[("meta",)].types, {LEAF_NULL: 1, TYPE_OBJECT: 1})
+        self.assertEqual(stats[("meta", "trace")].presence, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from jsonfuzzer.triage.simhash import AnomalyDetector, hamming_distance, simhash
+
+NORMAL = '{"status": "ok", "user": {"name": "jane", "created": "2024-01-01T10:00:00Z", "request_id": "abc123"}, "message": "user updated successfully"}'
+NORMAL_LATER = '{"status": "ok", "user": {"name": "jane", "created": "2024-03-09T17:41:07Z", "request_id": "zzz999"}, "message": "user updated successfully"}'
+ERROR = '{"error": "Internal server error", "trace": "NullPointerException at com.example.Users"}'
+
+
+class TestSimHash(unittest.TestCase):
+    def test_simhash_similarity(self):
+        self.assertEqual(simhash(NORMAL), simhash(NORMAL.encode()))
+        self.assertLessEqual(
+            hamming_distance(simhash(NORMAL), simhash(NORMAL_LATER)), 3
+        )
+        self.assertGreater(hamming_distance(simhash(NORMAL), simhash(ERROR)), 10)
+
+    def test_anomaly_detector_baseline(self):
+        detector = AnomalyDetector()
+        detector.add_baseline(NORMAL)
+
+        self.assertFalse(detector.is_anomalous(["user", "name"], NORMAL_LATER))
+        self.assertTrue(detector.is_anomalous(["user", "name"], ERROR))
+
+    def test_anomaly_detector_per_path(self):
+        detector = AnomalyDetector()
+        detector.add_baseline(NORMAL)
+        detector.add_normal(["user", "name"], ERROR)
+
+        self.assertFalse(detector.is_anomalous(["user", "name"], ERROR))
+        self.assertTrue(detector.is_anomalous(["user", "email"], ERROR))
+
+    def test_anomaly_detector_learn(self):
+        detector = AnomalyDetector()
+
+        self.assertTrue(detector.is_anomalous(["a"], NORMAL, learn=True))
+        detector.add_normal(["a"], NORMAL)
+        self.assertFalse(detector.is_anomalous(["a"], NORMAL_LATER, learn=True))
+
+    def test_anomaly_detector_capacity(self):
+        detector = AnomalyDetector(max_fingerprints_per_path=1)
+        detector.add_normal(["a"], NORMAL)
+        detector.add_normal(["a"], ERROR)
+
+        self.assertTrue(detector.is_anomalous(["a"], ERROR))
+
+
+if __name__ == "__main__":
+    unittest.main()
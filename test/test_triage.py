@@ -0,0 +1,69 @@
+import unittest
+from jsonfuzzer.core.fuzzer import MODE_PARAMETER, MODE_STRUCTURE, FuzzCase
+from jsonfuzzer.harness.harness import OUTCOME_EXCEPTION, OUTCOME_OK, HarnessResult
+from jsonfuzzer.triage.triage import Triage, normalise_text
+
+
+class TestTriage(unittest.TestCase):
+    def setUp(self) -> None:
+        self.triage = Triage()
+        return super().setUp()
+
+    def test_normalise_text(self):
+        self.assertEqual(
+            normalise_text(
+                "Error   at 0x7ffe12 in 'name': 42 (id 123e4567-e89b-12d3-a456-426614174000)"
+            ),
+            "Error at <hex> in <str>: <n> (id <uuid>)",
+        )
+
+    def test_add_response_buckets_similar_errors(self):
+        big = FuzzCase(MODE_STRUCTURE, ["a"], 0, {"a": "x" * 100, "b": 1})
+        small = FuzzCase(MODE_PARAMETER, ["b"], 0, {"a": "x", "b": 1})
+
+        first = self.triage.add_response(big, 500, b"Invalid value 'abc' at line 12")
+        second = self.triage.add_response(small, 500, b"Invalid value 'defg' at line 7")
+        other = self.triage.add_response(small, 400, b"Invalid value 'abc' at line 12")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(len(self.triage), 2)
+        self.assertEqual(first.count, 2)
+        self.assertEqual(first.payload, small.payload)
+        self.assertEqual((first.mode, first.path), (MODE_PARAMETER, ["b"]))
+
+    def test_add_result(self):
+        case = FuzzCase(MODE_PARAMETER, ["a"], 0, {"a": 1})
+        frames = ("a.py:1:outer", "b.py:2:inner")
+
+        self.assertIsNone(
+            self.triage.add_result(HarnessResult(case, OUTCOME_OK, None, None, (), 0.1))
+        )
+
+        first = self.triage.add_result(
+            HarnessResult(case, OUTCOME_EXCEPTION, "KeyError", "'x'", frames, 0.1)
+        )
+        second = self.triage.add_result(
+            HarnessResult(case, OUTCOME_EXCEPTION, "KeyError", "'y'", frames, 0.2)
+        )
+        other = self.triage.add_result(
+            HarnessResult(case, OUTCOME_EXCEPTION, "KeyError", "'x'", frames[:1], 0.1)
+        )
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+    def test_summary(self):
+        case = FuzzCase(MODE_PARAMETER, ["a"], 0, {"a": 1})
+        self.triage.add_response(case, 200, b"ok")
+        self.triage.add_response(case, 500, b"boom")
+        self.triage.add_response(case, 500, b"boom")
+
+        summary = self.triage.summary()
+
+        self.assertEqual(len(summary), 2)
+        self.assertIn("x2 mode=parameter path=['a']", summary[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import time
+import unittest
+from jsonfuzzer.harness.watchdog import Watchdog
+
+
+class TestWatchdog(unittest.TestCase):
+    def test_watchdog_expired(self):
+        watchdog = Watchdog(timeout=0.05)
+        watchdog.start("slow")
+        watchdog.start("fast")
+        watchdog.stop("fast")
+
+        self.assertEqual(watchdog.expired(), [])
+        time.sleep(0.06)
+
+        self.assertEqual(watchdog.expired(), ["slow"])
+        self.assertEqual(len(watchdog), 0)
+
+    def test_watchdog_time_until_next(self):
+        watchdog = Watchdog(timeout=10)
+        self.assertIsNone(watchdog.time_until_next())
+
+        watchdog.start("case")
+        self.assertTrue(0 < watchdog.time_until_next() <= 10)
+
+    def test_watchdog_invalid_timeout(self):
+        with self.assertRaises(ValueError):
+            Watchdog(timeout=0)
+
+
+if __name__ == "__main__":
+    unittest.main()